@@ -0,0 +1,154 @@
+"""
+Deterministic synthetic logs for every format logan-iq parses.
+
+The same format, size and seed always produce the same bytes, so benchmark
+runs on different commits read identical input. Usage:
+
+    python benchmarks/generate.py nginx 100MB -o /tmp/nginx.log
+"""
+import argparse
+import json
+import os
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+FORMATS = ("simple", "apache", "nginx", "json", "custom")
+
+# Regex used with `--format custom`; the generated custom lines match it
+CUSTOM_REGEX = (
+    r"^(?P<datetime>\S+) (?P<host>\S+) (?P<service>[\w-]+)\[(?P<pid>\d+)\]: "
+    r"(?P<level>[A-Z]+) (?P<message>.*)$"
+)
+
+START = datetime(2025, 8, 28, tzinfo=timezone.utc)
+LINES_PER_WRITE = 10_000
+
+LEVELS = ("INFO",) * 14 + ("DEBUG",) * 3 + ("WARNING",) * 2 + ("ERROR",)
+METHODS = ("GET",) * 8 + ("POST", "PUT", "DELETE")
+STATUSES = (200,) * 16 + (201, 204, 301, 304, 400, 401, 403, 404, 404, 500, 502, 503)
+PATHS = ("/", "/login", "/logout", "/api/v1/items", "/api/v1/items/{id}", "/api/v1/users/{id}",
+         "/static/app.{id}.js", "/search?q=term{id}", "/health")
+AGENTS = ("Mozilla/5.0 (X11; Linux x86_64)", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+          "curl/8.4.0", "python-requests/2.32.3", "Googlebot/2.1 (+http://www.google.com/bot.html)")
+REFERERS = ("-", "-", "-", "https://example.com/", "https://example.com/search")
+SERVICES = ("api", "worker", "scheduler", "auth-svc")
+MESSAGES = ("Request handled in {n} ms", "User {id} logged in", "Cache miss for key item:{id}",
+            "Retrying job {id} (attempt {n})", "Connection reset by peer", "Timeout after {n} ms",
+            "Payment {id} failed: card declined", "Loaded {n} records from upstream")
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(text: str) -> int:
+    """'1MB', '512k', '10GB' or a plain byte count -> bytes."""
+    match = _SIZE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size '{text}'")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def _ip(rng: random.Random) -> str:
+    # A few thousand clients, some far busier than others
+    n = int(rng.paretovariate(1.2)) % 4096
+    return f"10.{n >> 8}.{n & 255}.{rng.randrange(1, 4)}"
+
+
+def _path(rng: random.Random) -> str:
+    return rng.choice(PATHS).format(id=rng.randrange(100_000))
+
+
+def _message(rng: random.Random) -> str:
+    return rng.choice(MESSAGES).format(id=rng.randrange(100_000), n=rng.randrange(2000))
+
+
+def _clf(ts: datetime) -> str:
+    return ts.strftime("%d/%b/%Y:%H:%M:%S +0000")
+
+
+def _simple(rng: random.Random, ts: datetime) -> str:
+    return f"{ts:%Y-%m-%d %H:%M:%S},{ts.microsecond // 1000:03d} [{rng.choice(LEVELS)}] app.{rng.choice(SERVICES)}: {_message(rng)}"
+
+
+def _apache(rng: random.Random, ts: datetime) -> str:
+    return (f'{_ip(rng)} - - [{_clf(ts)}] "{rng.choice(METHODS)} {_path(rng)} HTTP/1.1" '
+            f"{rng.choice(STATUSES)} {rng.randrange(20, 60_000)}")
+
+
+def _nginx(rng: random.Random, ts: datetime) -> str:
+    return (f'{_ip(rng)} - - [{_clf(ts)}] "{rng.choice(METHODS)} {_path(rng)} HTTP/1.1" '
+            f'{rng.choice(STATUSES)} {rng.randrange(20, 60_000)} "{rng.choice(REFERERS)}" "{rng.choice(AGENTS)}"')
+
+
+def _json(rng: random.Random, ts: datetime) -> str:
+    entry = {
+        "datetime": f"{ts:%Y-%m-%dT%H:%M:%S}.{ts.microsecond // 1000:03d}Z",
+        "level": rng.choice(LEVELS),
+        "message": _message(rng),
+        "service": rng.choice(SERVICES),
+        "method": rng.choice(METHODS),
+        "path": _path(rng),
+        "status": rng.choice(STATUSES),
+    }
+    return json.dumps(entry, separators=(",", ":"))
+
+
+def _custom(rng: random.Random, ts: datetime) -> str:
+    return (f"{ts:%Y-%m-%dT%H:%M:%S}.{ts.microsecond // 1000:03d} host{rng.randrange(8)} "
+            f"{rng.choice(SERVICES)}[{rng.randrange(100, 32768)}]: {rng.choice(LEVELS)} {_message(rng)}")
+
+
+LINE_MAKERS: Dict[str, Callable[[random.Random, datetime], str]] = {
+    "simple": _simple,
+    "apache": _apache,
+    "nginx": _nginx,
+    "json": _json,
+    "custom": _custom,
+}
+
+
+def generate(format_name: str, path: str, size: int, seed: int = 0) -> int:
+    """
+    Write `size` bytes (rounded up to a whole line) of `format_name` logs to
+    `path`, in time order at roughly 200 lines per second. Returns the
+    number of lines written.
+    """
+    make = LINE_MAKERS[format_name]
+    rng = random.Random(f"{format_name}:{seed}")
+    ts = START
+    written = lines = 0
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        while written < size:
+            batch: List[str] = []
+            for _ in range(LINES_PER_WRITE):
+                ts += timedelta(microseconds=rng.randrange(10_000))
+                batch.append(make(rng, ts))
+            data = ("\n".join(batch) + "\n").encode()
+            if written + len(data) > size:
+                # Stop at the first line boundary past `size`
+                cut = data.find(b"\n", size - written - 1) + 1
+                data = data[:cut]
+            f.write(data)
+            written += len(data)
+            lines += data.count(b"\n")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic logs.")
+    parser.add_argument("format", choices=FORMATS)
+    parser.add_argument("size", help="Target size, e.g. 1MB, 250MB, 10GB")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    lines = generate(args.format, args.output, parse_size(args.size), args.seed)
+    print(f"Wrote {lines} {args.format} lines to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
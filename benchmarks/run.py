@@ -0,0 +1,359 @@
+"""
+Throughput and memory benchmarks for the parser, filters, summarizer and exporters.
+
+Each benchmark runs in a fresh process on a generated log of every format
+(see generate.py), so its peak RSS is its own. Results are written as JSON
+and can be compared with a stored baseline:
+
+    python benchmarks/run.py --size 50MB --output results.json
+    python benchmarks/run.py --size 50MB --baseline benchmarks/baseline.json
+
+The run fails (exit code 1) when a benchmark's lines/sec drops, or its peak
+RSS grows, by more than the thresholds relative to the baseline.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from generate import CUSTOM_REGEX, FORMATS, generate, parse_size  # noqa: E402
+from logan_iq.core.exporter import Exporter  # noqa: E402
+from logan_iq.core.filter import LogFilter  # noqa: E402
+from logan_iq.core.parser import LogParser  # noqa: E402
+from logan_iq.core.sqlite_export import SqliteExporter  # noqa: E402
+from logan_iq.core.stats import peak_rss_kb  # noqa: E402
+from logan_iq.core.summarizer import LogSummarizer  # noqa: E402
+from logan_iq.core.utils.date import EPOCH_FIELD  # noqa: E402
+
+DEFAULT_SIZE = "10MB"
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_RSS_THRESHOLD = 0.25
+RESULTS_VERSION = 1
+
+
+class Context:
+    """What a benchmark gets to set up with: the generated file and, on demand, its parsed entries."""
+
+    def __init__(self, format_name: str, path: str, workdir: str) -> None:
+        self.format_name = format_name
+        self.path = path
+        self.workdir = workdir
+        self.parser = LogParser(format_name, CUSTOM_REGEX if format_name == "custom" else None)
+        self._entries: Optional[List[dict]] = None
+
+    def entries(self) -> List[dict]:
+        if self._entries is None:
+            self._entries = self.parser.parse_file(self.path)
+        return self._entries
+
+    def time_range(self):
+        """Start/end strings covering the middle half of the file's time span."""
+        stamps = [e[EPOCH_FIELD] for e in self.entries() if e[EPOCH_FIELD] is not None]
+        first, last = min(stamps), max(stamps)
+        quarter = (last - first) // 4
+
+        def fmt(ms: int) -> str:
+            dt = datetime.fromtimestamp(ms / 1000, timezone.utc)
+            return dt.strftime("%Y-%m-%d %H:%M:%S,") + f"{dt.microsecond // 1000:03d}"
+
+        return fmt(first + quarter), fmt(last - quarter)
+
+    def output(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+# Each benchmark does its setup and returns the call to time
+BENCHMARKS: Dict[str, Callable[[Context], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def drain(iterable) -> None:
+    for _ in iterable:
+        pass
+
+
+@benchmark("parser.parse_file")
+def _parse_file(ctx: Context):
+    return lambda: ctx.parser.parse_file(ctx.path)
+
+
+@benchmark("parser.iter_file")
+def _iter_file(ctx: Context):
+    return lambda: drain(ctx.parser.iter_file(ctx.path))
+
+
+@benchmark("parser.parse_columns")
+def _parse_columns(ctx: Context):
+    return lambda: ctx.parser.parse_columns(ctx.path)
+
+
+@benchmark("filter.filter_by_level")
+def _filter_by_level(ctx: Context):
+    logs = ctx.entries()
+    return lambda: LogFilter().filter_by_level(logs, "ERROR")
+
+
+@benchmark("filter.filter_by_date_range")
+def _filter_by_date_range(ctx: Context):
+    logs, (start, end) = ctx.entries(), ctx.time_range()
+    return lambda: LogFilter().filter_by_date_range(logs, start, end)
+
+
+@benchmark("filter.filter_by_keyword")
+def _filter_by_keyword(ctx: Context):
+    logs = ctx.entries()
+    return lambda: LogFilter().filter_by_keyword(logs, ["failed", "timeout"], ctx.format_name)
+
+
+@benchmark("filter.filter")
+def _filter(ctx: Context):
+    logs, (start, end) = ctx.entries(), ctx.time_range()
+    return lambda: LogFilter().filter(logs, level="ERROR", start=start, end=end, search="failed", parse_fmt=ctx.format_name)
+
+
+@benchmark("filter.iter_filter")
+def _iter_filter(ctx: Context):
+    logs, (start, end) = ctx.entries(), ctx.time_range()
+    return lambda: drain(LogFilter().iter_filter(logs, start=start, end=end, parse_fmt=ctx.format_name))
+
+
+@benchmark("summarizer.count_levels")
+def _count_levels(ctx: Context):
+    logs = ctx.entries()
+    return lambda: LogSummarizer().count_levels(logs)
+
+
+@benchmark("summarizer.count_logs_in_a_day")
+def _count_logs_in_a_day(ctx: Context):
+    logs = ctx.entries()
+    day = ctx.time_range()[0][:10]
+    return lambda: LogSummarizer().count_logs_in_a_day(logs, day)
+
+
+@benchmark("summarizer.summarize_all")
+def _summarize_all(ctx: Context):
+    logs = ctx.entries()
+    return lambda: LogSummarizer().summarize_all(logs)
+
+
+@benchmark("summarizer.sketch")
+def _sketch(ctx: Context):
+    logs = ctx.entries()
+    return lambda: LogSummarizer().sketch(logs, distinct=("ip", "path"), top=("path", "ip"), quantiles=("size",))
+
+
+@benchmark("exporter.table")
+def _table(ctx: Context):
+    logs = ctx.entries()
+    return lambda: drain(Exporter().iter_table(logs))
+
+
+@benchmark("exporter.csv")
+def _csv(ctx: Context):
+    logs = ctx.entries()
+    return lambda: Exporter().to_csv(logs, ctx.output("out.csv"), ctx.parser.fields)
+
+
+@benchmark("exporter.json")
+def _json(ctx: Context):
+    logs = ctx.entries()
+    return lambda: Exporter().to_json(logs, ctx.output("out.json"))
+
+
+@benchmark("exporter.ndjson")
+def _ndjson(ctx: Context):
+    logs = ctx.entries()
+    return lambda: Exporter().to_ndjson(logs, ctx.output("out.ndjson"))
+
+
+@benchmark("exporter.sqlite")
+def _sqlite(ctx: Context):
+    logs = ctx.entries()
+
+    def export():
+        with SqliteExporter(ctx.output("out.db"), "logs", ctx.parser.fields) as db:
+            db.prepare()
+            db.insert(logs)
+            db.finish()
+
+    return export
+
+
+def count_lines(path: str) -> int:
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            lines += block.count(b"\n")
+    return lines
+
+
+def run_one(name: str, format_name: str, path: str, repeat: int) -> dict:
+    """Run one benchmark in this process; the fastest of `repeat` calls counts."""
+    workdir = tempfile.mkdtemp(prefix="logan-iq-bench-")
+    try:
+        ctx = Context(format_name, path, workdir)
+        call = BENCHMARKS[name](ctx)
+        setup_rss = peak_rss_kb()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    lines = count_lines(path)
+    return {
+        "lines": lines,
+        "seconds": round(best, 6),
+        "lines_per_sec": round(lines / best, 1) if best else None,
+        "setup_rss_kb": setup_rss,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def data_file(data_dir: str, format_name: str, size: int, seed: int) -> str:
+    """Path of the generated input, generating it unless an earlier run already did."""
+    path = os.path.join(data_dir, f"{format_name}-{size}-s{seed}.log")
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        generate(format_name, partial, size, seed)
+        os.replace(partial, path)
+    return path
+
+
+def run_all(names: List[str], formats: List[str], size: int, seed: int, repeat: int, data_dir: str) -> dict:
+    results = {}
+    for format_name in formats:
+        path = data_file(data_dir, format_name, size, seed)
+        for name in names:
+            key = f"{name}/{format_name}"
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", name, format_name, path, "--repeat", str(repeat)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                results[key] = {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+            else:
+                results[key] = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(format_row(key, results[key]), flush=True)
+    return results
+
+
+def format_row(key: str, result: dict) -> str:
+    if "error" in result:
+        return f"{key:<44} ERROR {result['error']}"
+    rss = result["peak_rss_kb"]
+    rss_text = f"{rss / 1024:8.1f} MB" if rss is not None else "       n/a"
+    return f"{key:<44} {result['lines_per_sec']:>14,.0f} lines/s {rss_text} peak RSS"
+
+
+def compare(results: dict, baseline: dict, threshold: float, rss_threshold: float) -> List[str]:
+    """Regressions of `results` against `baseline`, one message each."""
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        new = results.get(key)
+        if new is None or "error" in base:
+            continue
+        if "error" in new:
+            regressions.append(f"{key}: failed ({new['error']})")
+            continue
+        if base.get("lines_per_sec") and new["lines_per_sec"] < base["lines_per_sec"] * (1 - threshold):
+            change = new["lines_per_sec"] / base["lines_per_sec"] - 1
+            regressions.append(
+                f"{key}: {new['lines_per_sec']:,.0f} lines/s vs {base['lines_per_sec']:,.0f} baseline ({change:+.1%})"
+            )
+        if base.get("peak_rss_kb") and new.get("peak_rss_kb") and new["peak_rss_kb"] > base["peak_rss_kb"] * (1 + rss_threshold):
+            change = new["peak_rss_kb"] / base["peak_rss_kb"] - 1
+            regressions.append(
+                f"{key}: peak RSS {new['peak_rss_kb'] / 1024:.1f} MB vs {base['peak_rss_kb'] / 1024:.1f} MB baseline ({change:+.1%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark logan-iq on generated logs.")
+    parser.add_argument("--size", default=DEFAULT_SIZE, help=f"Input size per format, e.g. 1MB to 10GB (default: {DEFAULT_SIZE})")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated formats (default: all)")
+    parser.add_argument("--only", action="append", help="Run benchmarks matching this glob, e.g. 'filter.*' (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per benchmark; the fastest counts (default: 3)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "logan-iq-bench-data"),
+                        help="Where generated inputs are kept between runs")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with results saved by an earlier --output")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed lines/sec drop vs the baseline (default: {DEFAULT_THRESHOLD:.0%}%)")
+    parser.add_argument("--rss-threshold", type=float, default=DEFAULT_RSS_THRESHOLD,
+                        help=f"Allowed peak RSS growth vs the baseline (default: {DEFAULT_RSS_THRESHOLD:.0%}%)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--child", nargs=3, metavar=("NAME", "FORMAT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_one(*args.child, repeat=args.repeat)))
+        return 0
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    names = [n for n in BENCHMARKS if not args.only or any(fnmatch.fnmatch(n, p) for p in args.only)]
+    size = parse_size(args.size)
+
+    results = run_all(names, formats, size, args.seed, args.repeat, args.data_dir)
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    failed = any("error" in r for r in results.values())
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("size") != size:
+            print(f"Note: the baseline was measured on {baseline['meta']['size']} byte inputs, this run on {size}")
+        regressions = compare(results, baseline, args.threshold, args.rss_threshold)
+        if regressions:
+            print("\nRegressions against " + args.baseline + ":")
+            print("\n".join("  " + r for r in regressions))
+            failed = True
+        else:
+            print("\nNo regressions against " + args.baseline)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
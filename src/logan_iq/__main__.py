@@ -1,11 +1,10 @@
 import sys
 
-from .cli.commands import app
-from .cli.interactive import interactive_mode
+from .cli.commands import app, interactive
 
 
 if __name__ == "__main__":
     if len(sys.argv) == 1:
-        interactive_mode(app)
+        interactive()
     else:
         app()
@@ -1,29 +1,69 @@
 import os
+import re
+import sys
+import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from colorama import init, Fore, Style
 
-from .interactive import interactive_mode
+# Only what option defaults and helpers need at import time; the analyzer and
+# everything behind it are imported by the commands that use them
 from ..core.config import ConfigManager
-from ..core.analyzer import LogAnalyzer
+from ..core.sketches import DEFAULT_ERROR, DEFAULT_TOP_ERROR
+from ..core.follow import DEFAULT_WINDOWS
+from ..core.session import DEFAULT_SESSION_BYTES, get_session
+
+if TYPE_CHECKING:
+    from ..core.analyzer import LogAnalyzer
+    from ..core.cache import ParseCache
+    from ..core.sketches import SketchSummary
+    from ..core.stats import RunStats
+    from ..core.summarizer import SummaryAccumulator
 
 init(autoreset=True)
 
 app = typer.Typer(help="Logan-IQ: Analyze, parse, filter & summarize logs.")
-app.command(name="interactive")(lambda: interactive_mode(app))
+
+
+@app.command(name="interactive")
+def interactive():
+    """Start the interactive shell."""
+    from .interactive import interactive_mode
+
+    interactive_mode(app, session_bytes())
+
+
 config_app = typer.Typer(help="Manage user configurations.")
 app.add_typer(config_app, name="config")
+cache_app = typer.Typer(help="Inspect or clear the parsed-log cache.")
+config_app.add_typer(cache_app, name="cache")
+index_app = typer.Typer(help="Build keyword indexes that speed up repeated --search queries.")
+app.add_typer(index_app, name="index")
 
-cm = ConfigManager()
+_config: Optional[ConfigManager] = None
+
+# Fields sketched by `summarize --approx`
+SKETCH_FIELDS = {"distinct": ("ip", "path"), "top": ("path", "ip"), "quantiles": ("size",)}
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
 
 
 # ---------------------------
 # Helper
 # ---------------------------
+def get_config() -> ConfigManager:
+    """The user configuration, read on first use (and written only by the config commands)."""
+    global _config
+    if _config is None:
+        _config = ConfigManager()
+    return _config
+
+
 def resolve_file_and_format(file: str, parse_format: str):
-    file = file or cm.get("default_file")
-    parse_format = parse_format or cm.get("format", "simple")
+    file = file or get_config().get("default_file")
+    parse_format = parse_format or get_config().get("format", "simple")
 
     if not file:
         typer.echo(Fore.RED + "No log file specified. Set a default via 'config set' or pass --file.")
@@ -31,67 +71,277 @@ def resolve_file_and_format(file: str, parse_format: str):
     return file, parse_format
 
 
+def get_cache() -> "ParseCache":
+    from ..core.cache import ParseCache, DEFAULT_MAX_BYTES
+
+    max_mb = get_config().get("cache_max_mb")
+    max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+    return ParseCache(max_bytes=max_bytes)
+
+
+def session_bytes() -> int:
+    max_mb = get_config().get("session_max_mb")
+    return int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_SESSION_BYTES
+
+
+def make_analyzer(
+        parse_format: str, regex: str, workers: int, no_cache: bool, stats: Optional["RunStats"] = None
+) -> "LogAnalyzer":
+    from ..core.analyzer import LogAnalyzer
+
+    if no_cache:
+        return LogAnalyzer(parse_format, regex, workers=workers, stats=stats)
+    return LogAnalyzer(parse_format, regex, workers=workers, cache=get_cache(), session=get_session(), stats=stats)
+
+
+@contextmanager
+def instrumented(stats: bool, trace_memory: bool, profile: Optional[str]):
+    """Collect --stats and write the --profile dump around a command; yields the RunStats (or None)."""
+    from ..core.stats import RunStats, profiled
+
+    run_stats = RunStats(trace_memory) if stats or trace_memory else None
+    with ExitStack() as stack:
+        if profile:
+            stack.enter_context(profiled(profile))
+        if run_stats is not None:
+            stack.enter_context(run_stats.run())
+        yield run_stats
+    if run_stats is not None:
+        print_stats(run_stats)
+    if profile:
+        typer.echo(Fore.GREEN + f"Profile written to {profile} (inspect with: python -m pstats {profile})")
+
+
+def make_search(keywords: List[str], match_all: bool, search_regex: bool, case_sensitive: bool):
+    if not keywords:
+        return None
+    from ..core.search import KeywordMatcher
+
+    try:
+        return KeywordMatcher(keywords, match_all=match_all, regex=search_regex, case_sensitive=case_sensitive)
+    except ValueError as e:
+        typer.echo(Fore.RED + str(e))
+        raise typer.Exit(code=1)
+
+
+def show_rows(analyzer: "LogAnalyzer", entries, max_rows: int, tail: int, pager: bool):
+    """Print entries as a table; in a terminal without --pager/--tail, one screen unless --max-rows says otherwise."""
+    if max_rows is None and tail is None and not pager and sys.stdout.isatty():
+        from ..core.utils.terminal import terminal_rows
+
+        max_rows = terminal_rows()
+    analyzer.print_rows(entries, max_rows, tail, pager)
+
+
+def print_full_summary(analyzer: "LogAnalyzer", summary: "SummaryAccumulator", top: int, histogram: str):
+    def section(title: str, rows: List[dict]):
+        if rows:
+            typer.echo("\n" + Fore.CYAN + title + Style.RESET_ALL)
+            analyzer.print_table(rows)
+
+    typer.echo(f"Entries: {summary.total}")
+    section("Levels", [
+        {"level": level, "count": count, "first seen": first, "last seen": last}
+        for level, count in summary.levels.items()
+        for first, last in [summary.first_last_seen().get(level, ("-", "-"))]
+    ])
+    section(f"Entries per {histogram}", [{histogram: k, "count": v} for k, v in summary.histogram(histogram).items()])
+    section("Status codes", [{"status": k, "count": v} for k, v in summary.status_counts().items()])
+    section("Top methods", [{"method": k, "count": v} for k, v in summary.top_methods(top)])
+    section("Top paths", [{"path": k, "count": v} for k, v in summary.top_paths(top)])
+    section("Top client IPs", [{"ip": k, "count": v} for k, v in summary.top_ips(top)])
+    if summary.bytes:
+        typer.echo(f"\nBytes transferred: {summary.bytes}")
+
+
+def print_sketch_summary(analyzer: "LogAnalyzer", sketches: "SketchSummary", top: int):
+    typer.echo(f"Entries: {sketches.total} (approximate, ±{sketches.error:.1%})")
+    distinct = [{"field": f, "distinct (approx)": s.count()} for f, s in sketches.distinct.items()]
+    if any(row["distinct (approx)"] for row in distinct):
+        typer.echo("\n" + Fore.CYAN + "Distinct values" + Style.RESET_ALL)
+        analyzer.print_table(distinct)
+    for field, sketch in sketches.top.items():
+        rows = [{field: k, "count (approx)": v} for k, v in sketch.items(top)]
+        if rows:
+            typer.echo("\n" + Fore.CYAN + f"Top {field}s" + Style.RESET_ALL)
+            analyzer.print_table(rows)
+    for field, sketch in sketches.quantiles.items():
+        if sketch.count:
+            typer.echo("\n" + Fore.CYAN + f"{field} percentiles" + Style.RESET_ALL)
+            analyzer.print_table([{f"p{round(q * 100)}": round(sketch.quantile(q), 2) for q in QUANTILES}])
+
+
+def print_stats(stats: "RunStats"):
+    from ..core.exporter import Exporter
+
+    data = stats.to_dict()
+    typer.echo("\n" + Fore.CYAN + "Run statistics" + Style.RESET_ALL)
+    typer.echo(Exporter().to_table(stats.rows()))
+    if data["lines_read"]:
+        skipped = f"{data['lines_prefiltered']} skipped by raw-line checks, " if data["lines_prefiltered"] else ""
+        typer.echo(
+            f"Lines read: {data['lines_read']} ({data['lines_parsed']} parsed, {skipped}"
+            f"{data['lines_rejected']} not matching the {data['format']} format)"
+        )
+        typer.echo(
+            f"Read {data['bytes_read'] / 1024 / 1024:.1f} MB: {data['bytes_per_sec'] / 1024 / 1024:.1f} MB/s, "
+            f"{data['lines_per_sec']:,.0f} lines/s"
+        )
+    else:
+        typer.echo("Lines read: not counted (entries came from a cache or worker processes)")
+    filtered = data["stages"].get("filter")
+    if filtered:
+        typer.echo(f"Entries passing the filters: {filtered['items']}")
+    if data["peak_rss_kb"] is not None:
+        typer.echo(f"Peak RSS: {data['peak_rss_kb'] / 1024:.1f} MB")
+    if data["peak_memory"] is not None:
+        typer.echo(f"Peak traced Python memory: {data['peak_memory'] / 1024 / 1024:.1f} MB (tracemalloc slows the run; timings above are inflated)")
+
+
 # ---------------------------
 # CLI Commands
 # ---------------------------
 @app.command()
 def analyze(
-        file: str = typer.Option(None, "--file", "-f", help="Path to log file"),
+        file: str = typer.Option(None, "--file", "-f", help="Log file, directory or quoted glob"),
         parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
-        regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)")
+        regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
+        workers: int = typer.Option(1, "--workers", "-w", help="Parse with N processes (default: 1)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Always re-parse; don't read or fill the parse cache"),
+        max_rows: int = typer.Option(None, "--max-rows", "-n", help="Show at most N rows (default: one screen in a terminal, all when piped)"),
+        tail: int = typer.Option(None, "--tail", help="Show only the last N rows"),
+        pager: bool = typer.Option(False, "--pager", help="Page the table through $PAGER (default: less -RS)"),
+        stats: bool = typer.Option(False, "--stats", help="Report per-stage wall/CPU time, lines read and rejected, throughput and peak memory"),
+        trace_memory: bool = typer.Option(False, "--trace-memory", help="With --stats, also trace peak Python memory with tracemalloc (slows the run)"),
+        profile: str = typer.Option(None, "--profile", help="Write a cProfile/pstats dump of the run to this file"),
 ):
     """Parse and display all log entries."""
     file, parse_format = resolve_file_and_format(file, parse_format)
-    analyzer = LogAnalyzer(parse_format, regex)
-    entries = analyzer.analyze(file)
-    analyzer.print_table(entries)
-    typer.echo("\n" + Fore.GREEN + f"Analyzed '{file}' with {parse_format} format\n")
+    with instrumented(stats, trace_memory, profile) as run_stats:
+        analyzer = make_analyzer(parse_format, regex, workers, no_cache, run_stats)
+        show_rows(analyzer, analyzer.iter_logs(file), max_rows, tail, pager)
+        typer.echo("\n" + Fore.GREEN + f"Analyzed '{file}' with {parse_format} format\n")
 
 
 @app.command()
 def summarize(
-        file: str = typer.Option(None, "--file", "-f", help="Path to log file"),
+        file: str = typer.Option(None, "--file", "-f", help="Log file, directory or quoted glob"),
         parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
         regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
-        day: str = typer.Option(None, "--day", "-d", help="Summarize number of log entries for a specific day YYYY-MM-DD")
+        workers: int = typer.Option(1, "--workers", "-w", help="Parse with N processes (default: 1)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Always re-parse; don't read or fill the parse cache"),
+        day: str = typer.Option(None, "--day", "-d", help="Summarize number of log entries for a specific day YYYY-MM-DD"),
+        incremental: bool = typer.Option(False, "--incremental", "-i", help="Only parse lines appended since the last incremental run"),
+        all_stats: bool = typer.Option(False, "--all", "-a", help="Every summary (levels, histogram, status, top methods/paths/IPs, bytes, first/last seen) in one pass"),
+        top: int = typer.Option(10, "--top", min=1, help="Rows shown per top-N table with --all"),
+        histogram: str = typer.Option("day", "--histogram", help="Histogram resolution with --all: day, hour or minute"),
+        approx: bool = typer.Option(False, "--approx", help="Bounded-memory distinct IPs/paths, top paths/IPs and size percentiles"),
+        error: float = typer.Option(DEFAULT_ERROR, "--error", help="Relative error of --approx distinct counts and percentiles"),
+        top_error: float = typer.Option(DEFAULT_TOP_ERROR, "--top-error", help="Max overcount of --approx top-N counts, as a fraction of all entries"),
+        save_sketch: str = typer.Option(None, "--save-sketch", help="Write the --approx sketches to a JSON file for merge-sketches"),
+        stats: bool = typer.Option(False, "--stats", help="Report per-stage wall/CPU time, lines read and rejected, throughput and peak memory"),
+        trace_memory: bool = typer.Option(False, "--trace-memory", help="With --stats, also trace peak Python memory with tracemalloc (slows the run)"),
+        profile: str = typer.Option(None, "--profile", help="Write a cProfile/pstats dump of the run to this file"),
 ):
     """Generate a summary of log levels. (Optional) Can be summarized by a specific day."""
     file, parse_format = resolve_file_and_format(file, parse_format)
-    analyzer = LogAnalyzer(parse_format=parse_format, custom_regex=regex)
+    with instrumented(stats, trace_memory, profile) as run_stats:
+        analyzer = make_analyzer(parse_format, regex, workers, no_cache, run_stats)
 
-    if day:
-        counts = analyzer.summarize_by_day(file, day)
-    else:
-        counts = analyzer.summarize(file)
+        if approx:
+            try:
+                sketches = analyzer.sketch_summary(file, **SKETCH_FIELDS, error=error, k=top, top_error=top_error)
+            except ValueError as e:
+                typer.echo(Fore.RED + str(e))
+                raise typer.Exit(code=1)
+            print_sketch_summary(analyzer, sketches, top)
+            if save_sketch:
+                sketches.save(save_sketch)
+                typer.echo(Fore.GREEN + f"Sketches saved to {save_sketch}")
+            typer.echo("\n" + Fore.GREEN + f"Summarized '{file}' with format={parse_format}\n")
+            return
+
+        if all_stats:
+            from ..core.summarizer import HISTOGRAM_BUCKETS
 
-    summary_data = [{"level": k, "count": v} for k, v in counts.items()]
-    analyzer.print_table(summary_data)
-    typer.echo("\n" + Fore.GREEN + f"Summarized '{file}' with format={parse_format}, day={day}\n")
+            if histogram not in HISTOGRAM_BUCKETS:
+                typer.echo(Fore.RED + f"Unknown histogram resolution '{histogram}'. Use: {', '.join(HISTOGRAM_BUCKETS)}")
+                raise typer.Exit(code=1)
+            print_full_summary(analyzer, analyzer.summarize_all(file), top, histogram)
+            typer.echo("\n" + Fore.GREEN + f"Summarized '{file}' with format={parse_format}\n")
+            return
+
+        if day:
+            counts = analyzer.summarize_by_day(file, day)
+        elif incremental:
+            from ..core.checkpoint import CheckpointStore
+
+            counts = analyzer.summarize_incremental(file, CheckpointStore())
+        else:
+            counts = analyzer.summarize(file)
+
+        summary_data = [{"level": k, "count": v} for k, v in counts.items()]
+        analyzer.print_table(summary_data)
+        typer.echo("\n" + Fore.GREEN + f"Summarized '{file}' with format={parse_format}, day={day}\n")
+
+
+@app.command()
+def merge_sketches(
+        sketch_files: List[str] = typer.Argument(..., help="Sketch files written by summarize --approx --save-sketch"),
+        top: int = typer.Option(10, "--top", min=1, help="Rows shown per top-N table"),
+        save: str = typer.Option(None, "--save", help="Write the merged sketches to this file"),
+):
+    """Merge saved --approx sketches (e.g. from other files or machines) without rescanning any log."""
+    from ..core.analyzer import LogAnalyzer
+    from ..core.sketches import SketchSummary
+
+    try:
+        merged = SketchSummary.merge_all(SketchSummary.load(path) for path in sketch_files)
+    except (OSError, ValueError, KeyError) as e:
+        typer.echo(Fore.RED + f"Could not merge sketches: {e}")
+        raise typer.Exit(code=1)
+    print_sketch_summary(LogAnalyzer("simple"), merged, top)
+    if save:
+        merged.save(save)
+        typer.echo(Fore.GREEN + f"Merged sketches saved to {save}")
 
 
 @app.command()
 def filter_logs(
-        file: str = typer.Option(None, "--file", "-f", help="Path to log file"),
+        file: str = typer.Option(None, "--file", "-f", help="Log file, directory or quoted glob"),
         parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
         regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
         level: str = typer.Option(None, "--level", "-l", help="Log level i.e., INFO, ERROR, WARNING"),
         limit: int = typer.Option(None, "--limit", "-lm", help="Result set limit (optional)"),
         start: str = typer.Option(None, "--start", "-st", help="Start date (log timestamp)"),
         end: str = typer.Option(None, "--end", "-e", help="End date (log timestamp"),
-        keyword_search: str = typer.Option(None, "--search", "-s", help="Filter logs by keyword in the message field.")
+        keyword_search: List[str] = typer.Option(None, "--search", "-s", help="Filter logs by keyword (repeatable; any keyword matches)."),
+        match_all: bool = typer.Option(False, "--match-all", help="Require every --search keyword to match"),
+        search_regex: bool = typer.Option(False, "--search-regex", help="Treat --search keywords as regular expressions"),
+        case_sensitive: bool = typer.Option(False, "--case-sensitive", help="Match --search keywords case-sensitively"),
+        ip: str = typer.Option(None, "--ip", help="Only entries from this client IP (apache/nginx)"),
+        workers: int = typer.Option(1, "--workers", "-w", help="Parse with N processes (default: 1)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Always re-parse; don't read or fill the parse cache"),
+        max_rows: int = typer.Option(None, "--max-rows", "-n", help="Show at most N rows (default: one screen in a terminal, all when piped)"),
+        tail: int = typer.Option(None, "--tail", help="Show only the last N matching rows"),
+        pager: bool = typer.Option(False, "--pager", help="Page the table through $PAGER (default: less -RS)"),
+        stats: bool = typer.Option(False, "--stats", help="Report per-stage wall/CPU time, lines read and rejected, throughput and peak memory"),
+        trace_memory: bool = typer.Option(False, "--trace-memory", help="With --stats, also trace peak Python memory with tracemalloc (slows the run)"),
+        profile: str = typer.Option(None, "--profile", help="Write a cProfile/pstats dump of the run to this file"),
 ):
     """Filter logs by level and/or date range."""
     file, parse_format = resolve_file_and_format(file, parse_format)
-    analyzer = LogAnalyzer(parse_format, regex)
-    entries = analyzer.filter_logs(file, level, limit, start, end, keyword_search)
-    analyzer.print_table(entries)
-    typer.echo("\n" + Fore.GREEN + f"Filtered '{file}' with format={parse_format}, level={level}, date_range={start} to {end}, limit={limit}\n")
+    search = make_search(keyword_search, match_all, search_regex, case_sensitive)
+    with instrumented(stats, trace_memory, profile) as run_stats:
+        analyzer = make_analyzer(parse_format, regex, workers, no_cache, run_stats)
+        show_rows(analyzer, analyzer.iter_filtered(file, level, limit, start, end, search, ip), max_rows, tail, pager)
+        typer.echo("\n" + Fore.GREEN + f"Filtered '{file}' with format={parse_format}, level={level}, date_range={start} to {end}, limit={limit}\n")
 
 
 @app.command()
 def export_logs(
         file_type: str = typer.Argument(...),
-        file: str = typer.Option(None, "--file", "-f", help="Path to log file"),
+        file: str = typer.Option(None, "--file", "-f", help="Log file, directory or quoted glob"),
         parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
         regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
         output: str = typer.Option(None, "--output", "-o", help="CSV/JSON output file (optional)"),
@@ -99,34 +349,117 @@ def export_logs(
         limit: int = typer.Option(None, "--limit", "-lm", help="Result set limit (optional)"),
         start: str = typer.Option(None, "--start", "-st", help="Start date (log timestamp)"),
         end: str = typer.Option(None, "--end", "-e", help="End date (log timestamp"),
-        keyword_search: str = typer.Option(None, "--search", "-s", help="Filter logs by keyword in the message field.")
+        keyword_search: List[str] = typer.Option(None, "--search", "-s", help="Filter logs by keyword (repeatable; any keyword matches)."),
+        match_all: bool = typer.Option(False, "--match-all", help="Require every --search keyword to match"),
+        search_regex: bool = typer.Option(False, "--search-regex", help="Treat --search keywords as regular expressions"),
+        case_sensitive: bool = typer.Option(False, "--case-sensitive", help="Match --search keywords case-sensitively"),
+        ip: str = typer.Option(None, "--ip", help="Only entries from this client IP (apache/nginx)"),
+        workers: int = typer.Option(1, "--workers", "-w", help="Parse with N processes (default: 1)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Always re-parse; don't read or fill the parse cache"),
+        compact: bool = typer.Option(False, "--compact", help="JSON: write the array without indentation"),
+        fields: str = typer.Option(None, "--fields", help="CSV: comma-separated columns (default: the format's fields, or every key for JSON logs)"),
+        table: str = typer.Option(None, "--table", help="SQLite: table name (default: the format name)"),
+        append: bool = typer.Option(False, "--append", help="SQLite: keep the table and only load lines added since the last export"),
+        stats: bool = typer.Option(False, "--stats", help="Report per-stage wall/CPU time, lines read and rejected, throughput and peak memory"),
+        trace_memory: bool = typer.Option(False, "--trace-memory", help="With --stats, also trace peak Python memory with tracemalloc (slows the run)"),
+        profile: str = typer.Option(None, "--profile", help="Write a cProfile/pstats dump of the run to this file"),
 ):
-    """Parse, filter and export logs to CSV or JSON."""
+    """Parse, filter and stream logs to CSV, JSON, NDJSON (one JSON object per line) or a SQLite database."""
     file, parse_format = resolve_file_and_format(file, parse_format)
-    analyzer = LogAnalyzer(parse_format, regex)
-    entries = analyzer.filter_logs(file, level, limit, start, end, keyword_search)
+    with instrumented(stats, trace_memory, profile) as run_stats:
+        analyzer = make_analyzer(parse_format, regex, workers, no_cache, run_stats)
+        search = make_search(keyword_search, match_all, search_regex, case_sensitive)
 
-    export_type = file_type.lower()
-    if output is None:
-        base_name = os.path.splitext(os.path.basename(file))[0]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output = f"logan-iq-logs/{base_name}_by_logan-iq_{timestamp}.{export_type}"
+        export_type = file_type.lower()
+        if output is None:
+            # A directory or glob input has no single file name to reuse
+            base_name = re.sub(r"[*?\[\]]", "", os.path.splitext(os.path.basename(file.rstrip(os.sep)))[0]) or "logs"
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output = f"logan-iq-logs/{base_name}_by_logan-iq_{timestamp}.{export_type}"
 
-    # dot_index = output.rfind(".")
-    # file_extension = output[dot_index + 1:].lower()
+        def entries():
+            return analyzer.iter_filtered(file, level, limit, start, end, search, ip)
 
-    if export_type == "csv":
-        analyzer.export_csv(entries, output)
-    elif export_type == "json":
-        analyzer.export_json(entries, output)
-    else:
-        # print(Fore.RED + "Invalid file type or combination")
-        # print(Fore.RED + f"{export_type=}, {file_extension=}")
-        typer.echo(Fore.RED + f"Unsupported export type: {type}")
-        raise typer.Exit()
+        # dot_index = output.rfind(".")
+        # file_extension = output[dot_index + 1:].lower()
+
+        if export_type == "sqlite":
+            import sqlite3
+
+            try:
+                count = analyzer.export_sqlite(file, output, table, append, level, limit, start, end, search, ip)
+            except (ValueError, sqlite3.Error) as e:
+                typer.echo(Fore.RED + f"SQLite export failed: {e}")
+                raise typer.Exit(code=1)
+        elif export_type == "csv":
+            columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+            count = analyzer.export_csv(entries(), output, columns)
+        elif export_type == "json":
+            count = analyzer.export_json(entries(), output, compact)
+        elif export_type in ("ndjson", "jsonl"):
+            count = analyzer.export_ndjson(entries(), output)
+        else:
+            # print(Fore.RED + "Invalid file type or combination")
+            # print(Fore.RED + f"{export_type=}, {file_extension=}")
+            typer.echo(Fore.RED + f"Unsupported export type: {export_type}")
+            raise typer.Exit()
 
 
-    typer.echo("\n" + Fore.GREEN + f"Exported {len(entries)} entries to [{output}]\n")
+        typer.echo("\n" + Fore.GREEN + f"Exported {count} entries to [{output}]\n")
+
+
+@app.command()
+def tail(
+        file: str = typer.Option(None, "--file", "-f", help="Path to log file"),
+        parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
+        regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
+        level: str = typer.Option(None, "--level", "-l", help="Only show entries with this log level"),
+        keyword_search: List[str] = typer.Option(None, "--search", "-s", help="Only show entries containing this keyword (repeatable; any keyword matches)"),
+        match_all: bool = typer.Option(False, "--match-all", help="Require every --search keyword to match"),
+        search_regex: bool = typer.Option(False, "--search-regex", help="Treat --search keywords as regular expressions"),
+        case_sensitive: bool = typer.Option(False, "--case-sensitive", help="Match --search keywords case-sensitively"),
+        from_start: bool = typer.Option(False, "--from-start", help="Read existing lines before following"),
+        windows: List[int] = typer.Option(list(DEFAULT_WINDOWS), "--window", help="Rolling count window in seconds (repeatable)"),
+        summary_every: int = typer.Option(10, "--summary-every", help="Print rolling counts every N seconds (0 = only on exit)"),
+        interval: float = typer.Option(0.25, "--interval", help="Polling interval in seconds"),
+):
+    """Follow a log file, streaming matching entries and rolling per-level counts."""
+    from ..core.analyzer import LogAnalyzer
+    from ..core.follow import LogFollower, RollingLevelCounts
+
+    file, parse_format = resolve_file_and_format(file, parse_format)
+    analyzer = LogAnalyzer(parse_format, regex)
+    search = make_search(keyword_search, match_all, search_regex, case_sensitive)
+    follower = LogFollower(file, analyzer.parser, from_start=from_start)
+    rolling = RollingLevelCounts(windows)
+
+    def print_rolling():
+        parts = []
+        for window, counts in rolling.counts().items():
+            levels = ", ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "-"
+            parts.append(f"last {window}s: {levels}")
+        typer.echo(Fore.CYAN + "[rolling] " + " | ".join(parts) + Style.RESET_ALL)
+
+    typer.echo(Fore.GREEN + f"Following '{file}' with {parse_format} format (Ctrl+C to stop)\n")
+    next_summary = time.monotonic() + summary_every
+    try:
+        while True:
+            entries = follower.poll()
+            rolling.update(entries)
+            matching = analyzer.filter.iter_filter(entries, level=level, search=search, parse_fmt=parse_format)
+            for entry in matching:
+                typer.echo(analyzer.exporter.to_line(entry))
+
+            if summary_every and time.monotonic() >= next_summary:
+                print_rolling()
+                next_summary = time.monotonic() + summary_every
+            if follower.caught_up:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        typer.echo("")
+        print_rolling()
+    finally:
+        follower.close()
 
 
 # ---------------------------
@@ -136,22 +469,27 @@ def export_logs(
 def set_config(
         default_file: str = typer.Option(None, "--default-file", "-df"),
         parse_format: str = typer.Option(None, "--format"),
-        custom_regex: str = typer.Option(None, "--custom-regex", "-cr")
+        custom_regex: str = typer.Option(None, "--custom-regex", "-cr"),
+        cache_max_mb: int = typer.Option(None, "--cache-max-mb", min=1, help="Size limit of the parse cache in MB"),
+        session_max_mb: int = typer.Option(None, "--session-max-mb", min=1, help="Memory budget of files kept by interactive mode in MB"),
 ):
     """Save user configurations."""
     if default_file:
-        cm.set("default_file", default_file)
+        get_config().set("default_file", default_file)
     if parse_format:
-        cm.set("format", parse_format)
+        get_config().set("format", parse_format)
     if custom_regex:
-        cm.set("custom_regex", custom_regex)
-    cm.save()
+        get_config().set("custom_regex", custom_regex)
+    if cache_max_mb:
+        get_config().set("cache_max_mb", cache_max_mb)
+    if session_max_mb:
+        get_config().set("session_max_mb", session_max_mb)
     typer.echo("\n"+ Fore.GREEN + "Configuration updated.")
 
 @config_app.command("show")
 def show_config():
     """Display current configurations."""
-    config = cm.all()
+    config = get_config().all()
     if not config:
         typer.echo("\n" + Fore.YELLOW + "No configuration set yet.\n")
     else:
@@ -171,17 +509,75 @@ def delete_config(
         if not confirm:
             typer.echo("\n" + Fore.CYAN + "Operation cancelled.\n")
             raise typer.Exit()
-        cm.delete()
+        get_config().delete()
         typer.echo("\n" + Fore.GREEN + "All configuration deleted.\n")
         return
 
     if key:
-        if cm.get(key) is None:
+        if get_config().get(key) is None:
             typer.echo("\n" + Fore.YELLOW + f"No configuration found for key: {key}\n")
             raise typer.Exit()
-        cm.delete(key)
+        get_config().delete(key)
         typer.echo("\n" + Fore.GREEN + f"Deleted configuration key: {key}\n")
         return
 
     typer.echo("\n" + Fore.YELLOW + "Specify --key <name> to delete a specific config or --all to delete all configurations.")
 
+
+@cache_app.command("show")
+def show_cache():
+    """Display the parse cache location, size and entries."""
+    cache = get_cache()
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    typer.echo("Cache directory:" + Fore.CYAN + f" {cache.cache_dir}" + Style.RESET_ALL)
+    typer.echo(f"Entries: {len(entries)}, size: {total / 1024 / 1024:.2f} MB of {cache.max_bytes / 1024 / 1024:.0f} MB\n")
+    for name, size, last_used in reversed(entries):
+        used = datetime.fromtimestamp(last_used).strftime("%Y-%m-%d %H:%M:%S")
+        typer.echo(f"- {name}:" + Fore.CYAN + f" {size / 1024:.1f} KB, last used {used}" + Style.RESET_ALL)
+
+
+@cache_app.command("clear")
+def clear_cache():
+    """Delete all cached parse results."""
+    removed = get_cache().clear()
+    typer.echo("\n" + Fore.GREEN + f"Removed {removed} cache entries.\n")
+
+
+@index_app.command("build")
+def build_index(
+        files: List[str] = typer.Argument(None, help="Log files, directories or globs to index (default: the configured file)"),
+        parse_format: str = typer.Option(None, "--format", "-p", help="Parsing format/profile"),
+        regex: str = typer.Option(None, "--regex", "-r", help="Custom regex (use with --format custom)"),
+        bloom: bool = typer.Option(False, "--bloom", help="Build compact per-block Bloom filters instead of a full inverted index"),
+):
+    """Create or extend keyword indexes; only lines added since the last build are read."""
+    from ..core.analyzer import LogAnalyzer
+    from ..core.compression import is_compressed
+    from ..core.multifile import expand_inputs
+
+    if not files:
+        file, parse_format = resolve_file_and_format(None, parse_format)
+        files = [file]
+    parse_format = parse_format or get_config().get("format", "simple")
+    analyzer = LogAnalyzer(parse_format, regex, cache=get_cache())
+    files = [path for spec in files for path in expand_inputs(spec)]
+    for file in files:
+        if is_compressed(file):
+            typer.echo(Fore.YELLOW + f"Skipping compressed file '{file}'; indexes need plain text.")
+            continue
+        if bloom:
+            added = analyzer.build_bloom_index(file)
+            index = analyzer.bloom_index(file)
+            typer.echo(
+                Fore.GREEN + f"Indexed {added} new blocks of '{file}'" + Style.RESET_ALL
+                + f" ({len(index.blocks)} blocks, {index.size() / 1024:.1f} KB)"
+            )
+            continue
+        added = analyzer.build_keyword_index(file)
+        index = analyzer.keyword_index(file)
+        typer.echo(
+            Fore.GREEN + f"Indexed {added} new lines of '{file}'" + Style.RESET_ALL
+            + f" ({index.lines} lines, {len(index.terms)} terms, {index.size() / 1024:.1f} KB)"
+        )
+
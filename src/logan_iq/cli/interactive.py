@@ -3,19 +3,30 @@ import typer
 from colorama import Fore, Style
 
 from ..__version__ import __version__
+from ..core.session import SessionCache, set_session
 from ..core.utils.terminal import hyperlink
 
 
 # ---------------------------
 # Interactive Mode
 # ---------------------------
-def interactive_mode(app: typer.Typer):
+def interactive_mode(app: typer.Typer, session_bytes: int):
 
     ascii_art = pyfiglet.figlet_format("Logan-IQ", font="slant")
     print(Fore.CYAN + ascii_art + f"v{__version__}")
     print(Fore.CYAN + "By " + hyperlink("heisdanielade", "https://github.com/heisdanielade"))
     print(Fore.CYAN + "Type '--help' to see commands or 'exit' to quit.\n")
 
+    # Parsed files stay in memory between commands; 'session' shows them, 'session clear' drops them
+    session = SessionCache(session_bytes)
+    set_session(session)
+    try:
+        _repl(app, session)
+    finally:
+        set_session(None)
+
+
+def _repl(app: typer.Typer, session: SessionCache):
     while True:
         try:
             command = input(f"{Fore.BLUE}\033[1mlogan-iq>> \033[0m{Style.RESET_ALL}").strip()
@@ -23,6 +34,16 @@ def interactive_mode(app: typer.Typer):
                 print("\nGoodbye..\n")
                 break
 
+            if command in ("session", "session clear"):
+                if command == "session clear":
+                    session.clear()
+                print(
+                    Fore.CYAN + f"Session: {len(session)} file(s) in memory, "
+                    f"{session.nbytes / 1024 / 1024:.1f} of {session.max_bytes / 1024 / 1024:.0f} MB, "
+                    f"{session.hits} hit(s), {session.misses} miss(es)\n"
+                )
+                continue
+
             if command:
                 import shlex
                 import sys
@@ -1,11 +1,32 @@
 import os
-from typing import List, Dict, Optional
+from contextlib import nullcontext
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional
 from colorama import init, Fore
 
 from .parser import LogParser
-from .filter import LogFilter
-from .summarizer import LogSummarizer
+from .prefilter import RawPrefilter
+from .filter import LogFilter, SearchSpec
+from .summarizer import LogSummarizer, SummaryAccumulator
+from .sketches import SketchSummary
 from .exporter import Exporter
+from .parallel import (
+    aggregate_files, aggregate_parallel, iter_file_chunks, iter_file_parallel, iter_with_pool, sum_counts,
+)
+from .cache import ParseCache
+from .compression import is_compressed
+from .columns import LogColumns
+from .checkpoint import CheckpointStore, complete_lines_end, line_end
+from .time_index import TimeIndex
+from .keyword_index import KeywordIndex
+from .bloom_index import BloomIndex
+from .search import KeywordMatcher
+from .multifile import expand_inputs, merge_by_time
+from .session import SessionCache
+from .utils.terminal import write_lines
+
+if TYPE_CHECKING:
+    from .stats import RunStats
 
 init(autoreset=True)
 
@@ -13,21 +34,354 @@ init(autoreset=True)
 class LogAnalyzer:
     """High-level API for CLI commands to analyze, filter, summarize, export logs."""
 
-    def __init__(self, parse_format: str, custom_regex: Optional[str] = None):
+    def __init__(
+        self,
+        parse_format: str,
+        custom_regex: Optional[str] = None,
+        workers: int = 1,
+        cache: Optional[ParseCache] = None,
+        session: Optional[SessionCache] = None,
+        stats: Optional["RunStats"] = None,
+    ):
+        """
+        Args:
+            parse_format: predefined format or "custom"
+            custom_regex: raw regex if using custom format
+            workers: number of processes used to parse a file (1 = serial)
+            cache: on-disk parse cache to read from and fill (None = always parse)
+            session: in-memory cache of parsed files shared by the commands of an interactive session
+            stats: collects per-stage timings, line counts and memory of the calls made (None = no instrumentation)
+        """
         self.parse_format = parse_format
+        self.custom_regex = custom_regex
+        self.workers = max(1, workers or 1)
+        self.cache = cache
+        self.session = session
         self.parser = LogParser(parse_format, custom_regex=custom_regex)
         self.filter = LogFilter()
-        self.summarize = LogSummarizer()
+        self.summarizer = LogSummarizer()
         self.exporter = Exporter()
+        self.stats = stats
+        if stats is not None and self.workers <= 1:
+            # Worker processes get a pickled parser, which can't carry the hooks
+            stats.instrument_parser(self.parser)
+
+    def _timed(self, stage: str, logs: Iterable[dict]) -> Iterable[dict]:
+        return logs if self.stats is None else self.stats.timed(stage, logs)
+
+    def _stage(self, name: str):
+        return nullcontext() if self.stats is None else self.stats.stage(name)
+
+    def _workers_stage(self):
+        """Time spent waiting on worker processes, which parse (and aggregate) out of the stats' sight."""
+        return self._stage("parse (workers)") if self.workers > 1 else nullcontext()
+
+    def _instrumented(self, aggregate: Callable) -> Callable:
+        """`aggregate`, timing the parse of its input and its own work when stats are collected in-process."""
+        stats = self.stats
+        if stats is None or self.workers > 1:
+            return aggregate
+
+        def timed_aggregate(logs):
+            with stats.stage("aggregate"):
+                return aggregate(stats.timed("parse", logs))
+
+        return timed_aggregate
 
     def _validate_file(self, file_path: str):
         if file_path and not os.path.exists(file_path):
             print(Fore.RED + f"No such file or directory: {file_path}")
             exit(1)
 
+    @staticmethod
+    def _require_plain(file_path: str):
+        if is_compressed(file_path):
+            raise ValueError(f"Cannot index compressed file '{file_path}'; decompress it first.")
+
+    def _cached_logs(self, file_path: str, load_session: bool = True) -> Optional[Iterable[dict]]:
+        """Return cached entries for `file_path`, or None when there is no usable cache entry."""
+        if self.session is not None:
+            columns = self._session_columns(file_path, load_session)
+            if columns is not None:
+                return columns
+        return self._disk_cached_logs(file_path)
+
+    def _disk_cached_logs(self, file_path: str) -> Optional[Iterator[dict]]:
+        if self.cache is None:
+            return None
+        logs = self.cache.load(self._cache_key(file_path))
+        return logs if logs is None else self._timed("cache read", logs)
+
+    def _session_columns(self, file_path: str, load: bool = True) -> Optional[LogColumns]:
+        """
+        The file's entries from the session cache. On a miss (unless not
+        `load`) the whole file is parsed (or read from the disk cache) into
+        columns and kept for the next command; None for files too large for
+        the session, which are given up on as soon as the columns outgrow it.
+        """
+        key = SessionCache.key(file_path, self.parser.format_name, self.custom_regex)
+        columns = self.session.get(key)
+        if columns is None and load and self.session.admits(key):
+            logs = self._disk_cached_logs(file_path)
+            if logs is None:
+                logs = self._parse_logs(file_path)
+            columns = LogColumns()
+            if columns.extend(logs, self.session.max_bytes):
+                self.session.put(key, columns)
+            else:
+                if hasattr(logs, "close"):
+                    logs.close()  # drops a half-written disk cache file
+                self.session.reject(key)
+                columns = None
+        return columns
+
+    def _cache_key(self, file_path: str) -> str:
+        return ParseCache.key(file_path, self.parser.format_name, self.custom_regex)
+
+    def _paths(self, file_path: str) -> List[str]:
+        """The log files behind `file_path`: itself, or the files of a directory or glob pattern."""
+        if not file_path:
+            return [file_path]
+        paths = expand_inputs(file_path)
+        if not paths:
+            print(Fore.RED + f"No log files match: {file_path}")
+            exit(1)
+        return paths
+
+    def _iter_merged(self, paths: List[str], open_stream: Callable) -> Iterator[dict]:
+        """
+        Merge per-file streams in timestamp order. `open_stream(path, pool)`
+        returns one file's entries; with several workers the files share one
+        process pool, each keeping only a couple of chunks in flight.
+        """
+        if self.workers <= 1:
+            return merge_by_time([open_stream(path, None) for path in paths])
+        return iter_with_pool(
+            self.workers, lambda pool: merge_by_time([open_stream(path, pool) for path in paths])
+        )
+
+    def _open_logs(self, file_path: str, pool=None, parser: Optional[LogParser] = None) -> Iterator[dict]:
+        """One file's entries, from the cache or parsed (in `pool`'s workers if given)."""
+        cached = self._cached_logs(file_path)
+        if cached is not None:
+            return cached
+        return self._parse_logs(file_path, pool, parser)
+
+    def _prefiltered_parser(
+        self,
+        level: Optional[str],
+        start: Optional[str],
+        end: Optional[str],
+        search: SearchSpec,
+        ip: Optional[str],
+    ) -> LogParser:
+        """
+        A parser that skips raw lines which can't pass the filters before
+        decoding them, or `self.parser` when nothing can be checked on raw
+        lines. Only for reads that don't fill the cache or an index.
+        """
+        try:
+            date_range = self.filter.parse_range(start, end) if start and end else None
+        except ValueError:
+            date_range = None  # reported by the filter itself
+        prefilter = RawPrefilter(self.parser.format_name, level, date_range, KeywordMatcher.coerce(search), ip)
+        if not prefilter:
+            return self.parser
+        parser = LogParser(self.parse_format, custom_regex=self.custom_regex, prefilter=prefilter)
+        if self.stats is not None and self.workers <= 1:
+            self.stats.instrument_parser(parser)
+        return parser
+
+    def _parse_logs(self, file_path: str, pool=None, parser: Optional[LogParser] = None) -> Iterator[dict]:
+        """Parse `file_path`, with `parser` (a prefiltering one) only when there is no cache to fill."""
+        if parser is None or self.cache is not None:
+            parser = self.parser
+        if pool is not None:
+            logs = iter_file_chunks(pool, parser, file_path)
+        else:
+            logs = iter_file_parallel(parser, file_path, self.workers)
+        if self.cache is not None:
+            logs = self.cache.iter_through(self._cache_key(file_path), logs)
+        return self._timed("parse", logs)
+
+    def iter_logs(self, file_path: str) -> Iterator[dict]:
+        """
+        Lazily parse `file_path`; nothing is held in memory beyond the current
+        entry. For a directory or glob, the files are merged in timestamp order.
+        """
+        paths = self._paths(file_path)
+        if len(paths) > 1:
+            return self._iter_merged(paths, self._open_logs)
+        self._validate_file(paths[0])
+        return self._open_logs(paths[0])
+
+    def _aggregate(
+        self,
+        file_path: str,
+        aggregate: Callable[[Iterable[dict]], Dict[str, int]],
+        combine: Callable[[Iterable[Dict[str, int]]], Dict[str, int]] = sum_counts,
+    ) -> Dict[str, int]:
+        """
+        Run `aggregate` over all entries of `file_path`. Cached entries are used
+        when available; otherwise parallel parsing aggregates inside the workers.
+        Several files (directory or glob) are aggregated separately, one per
+        worker, and their partial results merged with `combine`.
+        """
+        aggregate = self._instrumented(aggregate)
+        paths = self._paths(file_path)
+        if len(paths) > 1:
+            partials, uncached = [], []
+            for path in paths:
+                cached = self._cached_logs(path)
+                if cached is not None:
+                    partials.append(aggregate(cached))
+                elif self.cache is not None and self.workers <= 1:
+                    partials.append(aggregate(self._open_logs(path)))
+                else:
+                    uncached.append(path)
+            with self._workers_stage():
+                partials.extend(aggregate_files(self.parser, uncached, self.workers, aggregate))
+            return combine(partials)
+
+        file_path = paths[0]
+        self._validate_file(file_path)
+        cached = self._cached_logs(file_path)
+        if cached is not None:
+            return aggregate(cached)
+        if self.cache is not None and self.workers <= 1:
+            return aggregate(self.iter_logs(file_path))
+        with self._workers_stage():
+            return aggregate_parallel(self.parser, file_path, self.workers, aggregate, combine)
+
     def analyze(self, file_path: str) -> List[dict]:
+        return list(self.iter_logs(file_path))
+
+    def load_columns(self, file_path: str) -> LogColumns:
+        """Parse `file_path` into a `LogColumns` container that filter and summarize operate on directly."""
+        return LogColumns.from_entries(self.iter_logs(file_path))
+
+    def iter_filtered(
+        self,
+        file_path: str,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        search: SearchSpec = None,
+        ip: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """
+        Streaming variant of `filter_logs`. All filters run as one fused
+        predicate with the limit applied last, so reading stops as soon as
+        `limit` matching entries have been found.
+        """
+        paths = self._paths(file_path)
+        parser = self._prefiltered_parser(level, start, end, search, ip)
+        if len(paths) > 1:
+            logs = self._iter_merged(
+                paths, lambda path, pool: self._iter_candidates(path, limit, start, end, search, ip, pool, parser)
+            )
+        else:
+            logs = self._iter_candidates(paths[0], limit, start, end, search, ip, parser=parser)
+            if isinstance(logs, LogColumns):
+                # Warm session data: filter the columns directly
+                with self._stage("filter"):
+                    return iter(self.filter.filter(logs, level, limit, start, end, search, self.parse_format, ip))
+        return self._timed("filter", self.filter.iter_filter(logs, level, limit, start, end, search, self.parse_format, ip))
+
+    def _iter_candidates(
+        self,
+        file_path: str,
+        limit: Optional[int],
+        start: Optional[str],
+        end: Optional[str],
+        search: SearchSpec,
+        ip: Optional[str] = None,
+        pool=None,
+        parser: Optional[LogParser] = None,
+    ) -> Iterator[dict]:
+        """
+        Pick the cheapest source of entries of one file that may pass the
+        filters. `parser` prefilters raw lines on reads that fill nothing.
+        """
+        if self.session is not None:
+            # A limited query reads only the head of the file; don't load it all
+            columns = self._session_columns(file_path, load=not limit)
+            if columns is not None:
+                return columns
+        if is_compressed(file_path):
+            # Sidecar indexes address byte offsets of plain-text files
+            return self._iter_head(file_path, parser) if limit else self._open_logs(file_path, pool, parser)
+        if search and self.cache is not None:
+            logs = self._iter_keyword_candidates(file_path, search)
+            if logs is not None:
+                return logs
+        if (search or ip) and self.cache is not None:
+            logs = self._iter_bloom_candidates(file_path, search, ip)
+            if logs is not None:
+                return logs
+        if start and end and self.cache is not None:
+            return self._iter_time_window(file_path, start, end)
+        if limit:
+            return self._iter_head(file_path, parser)
+        self._validate_file(file_path)
+        return self._open_logs(file_path, pool, parser)
+
+    def _iter_head(self, file_path: str, parser: Optional[LogParser] = None) -> Iterator[dict]:
+        """
+        Entries for a query that will likely stop early: cached entries if
+        available, otherwise a serial parse that yields from the first line
+        (a pool would parse whole chunks first) and skips filling the cache.
+        """
+        self._validate_file(file_path)
+        cached = self._cached_logs(file_path, load_session=False)
+        if cached is not None:
+            return cached
+        return self._timed("parse", (parser or self.parser).iter_file(file_path))
+
+    def keyword_index(self, file_path: str) -> KeywordIndex:
+        return KeywordIndex.for_file(self.cache.cache_dir, file_path, self.parser.format_name, self.custom_regex)
+
+    def build_keyword_index(self, file_path: str) -> int:
+        """Create or extend the inverted keyword index of `file_path`. Returns the number of newly indexed lines."""
+        self._validate_file(file_path)
+        self._require_plain(file_path)
+        return self.keyword_index(file_path).build(self.parser, file_path)
+
+    def _iter_keyword_candidates(self, file_path: str, search: SearchSpec) -> Optional[Iterator[dict]]:
+        """Candidate entries for a keyword search from the file's index, or None without a usable index."""
+        matcher = KeywordMatcher.coerce(search)
+        if not matcher:
+            return None
+        self._validate_file(file_path)
+        logs = self.keyword_index(file_path).iter_candidates(self.parser, file_path, matcher)
+        return logs if logs is None else self._timed("parse", logs)
+
+    def bloom_index(self, file_path: str) -> BloomIndex:
+        return BloomIndex.for_file(self.cache.cache_dir, file_path, self.parser.format_name, self.custom_regex)
+
+    def build_bloom_index(self, file_path: str) -> int:
+        """Create or extend the per-block Bloom filters of `file_path`. Returns the number of new blocks."""
+        self._validate_file(file_path)
+        self._require_plain(file_path)
+        return self.bloom_index(file_path).build(self.parser, file_path)
+
+    def _iter_bloom_candidates(self, file_path: str, search: SearchSpec, ip: Optional[str]) -> Optional[Iterator[dict]]:
+        """Entries from blocks whose Bloom filters may match, or None without a usable index."""
+        self._validate_file(file_path)
+        matcher = KeywordMatcher.coerce(search)
+        logs = self.bloom_index(file_path).iter_candidates(self.parser, file_path, matcher, ip)
+        return logs if logs is None else self._timed("parse", logs)
+
+    def _iter_time_window(self, file_path: str, start: str, end: str) -> Iterator[dict]:
+        """
+        Candidate entries for a date range, read through the file's timestamp
+        sidecar index (built on the first scan, extended as the file grows).
+        """
         self._validate_file(file_path)
-        return self.parser.parse_file(file_path)
+        start_ms, end_ms = self.filter.parse_epoch_range(start, end)
+        index = TimeIndex.for_file(self.cache.cache_dir, file_path, self.parser.format_name, self.custom_regex)
+        return self._timed("parse", index.iter_between(self.parser, file_path, start_ms, end_ms))
 
     def filter_logs(
         self,
@@ -36,19 +390,51 @@ class LogAnalyzer:
         limit: Optional[int] = None,
         start: Optional[str] = None,
         end: Optional[str] = None,
-        search: Optional[str] = None
+        search: SearchSpec = None,
+        ip: Optional[str] = None,
     ) -> List[dict]:
-        logs = self.analyze(file_path)
-        filtered = self.filter.filter(logs, level, limit, start, end)
+        return list(self.iter_filtered(file_path, level, limit, start, end, search, ip))
 
-        if search:
-            filtered = self.filter.filter_by_keyword(logs=filtered, keyword=search, parse_fmt=self.parse_format)
+    def summarize(self, file_path: str) -> Dict[str, int]:
+        return self._aggregate(file_path, self.summarizer.count_levels)
 
-        return filtered
+    def summarize_all(self, file_path: str) -> SummaryAccumulator:
+        """Level, time, status, method/path/IP, bytes and first/last-seen summaries from one read of the file."""
+        return self._aggregate(file_path, self.summarizer.summarize_all, SummaryAccumulator.merge_all)
 
-    def summarize(self, file_path: str) -> Dict[str, int]:
-        logs = self.analyze(file_path)
-        return self.summarize.count_levels(logs)
+    def sketch_summary(self, file_path: str, **options) -> SketchSummary:
+        """Approximate distinct/top-k/quantile summaries in bounded memory; options go to `LogSummarizer.sketch`."""
+        return self._aggregate(file_path, partial(self.summarizer.sketch, **options), SketchSummary.merge_all)
+
+    def summarize_incremental(self, file_path: str, store: CheckpointStore) -> Dict[str, int]:
+        """
+        Count log levels, parsing only complete lines appended since the last
+        run and merging them into the counts saved in `store`. Rotated or
+        truncated files are recounted from the start.
+        """
+        paths = self._paths(file_path)
+        if len(paths) > 1:
+            return sum_counts(self.summarize_incremental(path, store) for path in paths)
+        file_path = paths[0]
+        self._validate_file(file_path)
+        if is_compressed(file_path):
+            # Archives don't grow and offsets into them can't be resumed; count them whole
+            return self.summarize(file_path)
+        key = store.key(file_path, self.parser.format_name, self.custom_regex)
+        checkpoint = store.resume(key, file_path)
+        start, counts = (checkpoint["offset"], checkpoint["counts"]) if checkpoint else (0, {})
+
+        end = complete_lines_end(file_path, start, os.path.getsize(file_path))
+        if end > start:
+            with self._workers_stage():
+                new_counts = aggregate_parallel(
+                    self.parser, file_path, self.workers, self._instrumented(self.summarizer.count_levels),
+                    start=start, end=end,
+                )
+            counts = sum_counts([counts, new_counts])
+
+        store.update(key, file_path, end, counts)
+        return counts
 
     def summarize_by_day(
             self,
@@ -58,14 +444,101 @@ class LogAnalyzer:
             log_fmt: str = "%Y-%m-%d %H:%M:%S,%f",
     ) -> Dict[str, int]:
         """Return counts per log level for a specific day."""
-        logs = self.analyze(file_path)
-        return self.summarize.count_logs_in_a_day(logs, day, day_fmt=day_fmt, log_fmt=log_fmt)
+        count_day = partial(self.summarizer.count_logs_in_a_day, day=day, day_fmt=day_fmt, log_fmt=log_fmt)
+        return self._aggregate(file_path, count_day)
 
     def print_table(self, data: List[dict]):
-        print(self.exporter.to_table(data))
+        with self._stage("render"):
+            print(self.exporter.to_table(data))
+
+    def print_rows(
+        self, entries: Iterable[dict], max_rows: Optional[int] = None, tail: Optional[int] = None, pager: bool = False
+    ):
+        """Stream `entries` as a table, reading only the rows that are shown (see `Exporter.iter_table`)."""
+        with self._stage("render"):
+            write_lines(self.exporter.iter_table(entries, max_rows, tail), pager)
+
+    def export_csv(self, data: Iterable[dict], path: str, fields: Optional[List[str]] = None) -> int:
+        """Stream entries to CSV; columns are `fields`, else the format's fields, else the union of all keys."""
+        with self._stage("write"):
+            return self.exporter.to_csv(data, path, fields or self.parser.fields)
+
+    def export_json(self, data: Iterable[dict], path: str, compact: bool = False) -> int:
+        with self._stage("write"):
+            return self.exporter.to_json(data, path, compact)
 
-    def export_csv(self, data: List[dict], path: str):
-        self.exporter.to_csv(data, path)
+    def export_ndjson(self, data: Iterable[dict], path: str) -> int:
+        with self._stage("write"):
+            return self.exporter.to_ndjson(data, path)
+
+    @staticmethod
+    def _track_offsets(logs: Iterator, reached: List[Optional[int]]) -> Iterator[dict]:
+        """Entries of (offset, entry) pairs, keeping the offset of the last one pulled in `reached[0]`."""
+        for offset, entry in logs:
+            reached[0] = offset
+            yield entry
+
+    def export_sqlite(
+        self,
+        file_path: str,
+        db_path: str,
+        table: Optional[str] = None,
+        append: bool = False,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        search: SearchSpec = None,
+        ip: Optional[str] = None,
+    ) -> int:
+        """
+        Load the (filtered) entries of each file into a SQLite table named
+        after the format. With `append` the table is kept and each file is
+        read from the offset the previous export reached; archives already
+        loaded are skipped. Returns the number of rows inserted.
+        """
+        if append and limit:
+            raise ValueError("--limit can't be combined with --append")
+        from .sqlite_export import SqliteExporter
 
-    def export_json(self, data: List[dict], path: str):
-        self.exporter.to_json(data, path)
+        paths = self._paths(file_path)
+        parser = self._prefiltered_parser(level, start, end, search, ip)
+        count = 0
+        with SqliteExporter(db_path, table or self.parser.format_name, self.parser.fields) as db:
+            db.prepare(append)
+            for path in paths:
+                self._validate_file(path)
+                size = os.path.getsize(path)
+                offset = db.resume_offset(path)
+                reached = [None]  # start offset of the last line read, when tracked
+                if is_compressed(path):
+                    if offset == size:
+                        continue
+                    done = size
+                    logs = self._timed("parse", iter_file_parallel(parser, path, self.workers))
+                else:
+                    done = complete_lines_end(path, offset, size)
+                    if limit:
+                        # Serial, to know where the limit stopped the load. The
+                        # offsets are taken as the filter pulls each entry, not
+                        # as the timed parse reads ahead
+                        logs = self._timed("parse", parser.iter_offsets(path, offset, done))
+                        logs = self._track_offsets(logs, reached)
+                    else:
+                        logs = self._timed("parse", iter_file_parallel(parser, path, self.workers, offset, done))
+                remaining = limit - count if limit else None
+                logs = self.filter.iter_filter(logs, level, remaining, start, end, search, self.parse_format, ip)
+                with self._stage("write"):
+                    count += db.insert(self._timed("filter", logs))
+                if limit and count >= limit:
+                    # The filter stops right after the last inserted line, so
+                    # a later --append resumes just past it
+                    if reached[0] is not None:
+                        db.mark(path, line_end(path, reached[0]))
+                    elif is_compressed(path):
+                        db.mark_partial(path)
+                    break
+                db.mark(path, done)
+            with self._stage("write"):
+                db.finish()
+        return count
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import marshal
+import math
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .checkpoint import complete_lines_end, head_fingerprint
+from .filter import search_text
+from .parser import LogParser
+from .search import KeywordMatcher
+from .utils.hashing import stable_hash64
+
+INDEX_DIRNAME = "bloom_index"
+INDEX_VERSION = 1
+
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+# Filter bits per block, as a fraction of the block's size in bits (~1% of the log on disk)
+BITS_RATIO = 0.01
+MAX_HASHES = 8
+
+NGRAM = 3
+
+
+def ngrams(text: str) -> Set[str]:
+    """Distinct lower-cased character trigrams of `text`."""
+    text = text.lower()
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def ip_token(ip: str) -> str:
+    return "ip:" + ip
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one 64-bit stable hash."""
+
+    def __init__(self, bits: bytearray, hashes: int) -> None:
+        self.bits = bits
+        self.size = len(bits) * 8
+        self.hashes = hashes
+
+    @classmethod
+    def for_items(cls, items: Iterable[str], size_bits: int, hash_cache: Optional[Dict[str, int]] = None) -> "BloomFilter":
+        items = list(items)
+        size_bits = max(64, (size_bits + 7) // 8 * 8)
+        # Optimal hash count for this fill, k = m/n * ln 2
+        hashes = max(1, min(MAX_HASHES, round(size_bits / max(1, len(items)) * math.log(2))))
+        bloom = cls(bytearray(size_bits // 8), hashes)
+        for item in items:
+            bloom.add(item, hash_cache)
+        return bloom
+
+    def _positions(self, item: str, hash_cache: Optional[Dict[str, int]]) -> Iterator[int]:
+        if hash_cache is None:
+            h = stable_hash64(item)
+        else:
+            h = hash_cache.get(item)
+            if h is None:
+                h = hash_cache[item] = stable_hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str, hash_cache: Optional[Dict[str, int]] = None) -> None:
+        bits = self.bits
+        for pos in self._positions(item, hash_cache):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, item: str, hash_cache: Optional[Dict[str, int]] = None) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item, hash_cache))
+
+
+class BloomIndex:
+    """
+    Per-block Bloom filters over a log file, a lighter alternative to
+    `KeywordIndex`.
+
+    The file is cut into line-aligned blocks of about `block_bytes`. For each
+    block a Bloom filter records the character trigrams of the text `--search`
+    looks at, plus an `ip:<address>` token per entry. A keyword can only occur
+    in a block whose filter has all of its trigrams, so other blocks are
+    skipped without being parsed. Lookups return candidates; callers still
+    apply the exact filters.
+    """
+
+    def __init__(self, index_file: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> None:
+        self.index_file = index_file
+        self.block_bytes = block_bytes
+        self.reset()
+        self.load()
+
+    @classmethod
+    def for_file(
+        cls, cache_dir: str, path: str, format_name: str, custom_regex: Optional[str] = None,
+        block_bytes: int = DEFAULT_BLOCK_BYTES,
+    ) -> "BloomIndex":
+        """Return the index stored in `cache_dir` for `path` parsed with the given profile."""
+        profile = json.dumps([os.path.abspath(path), format_name, custom_regex])
+        name = hashlib.sha1(profile.encode("utf-8")).hexdigest() + ".blm"
+        return cls(os.path.join(cache_dir, INDEX_DIRNAME, name), block_bytes=block_bytes)
+
+    def reset(self) -> None:
+        self.inode = None
+        self.head = None
+        self.covered = 0
+        # [start offset, hash count, filter bits]; a block ends where the next starts (or at `covered`)
+        self.blocks: List[list] = []
+
+    @property
+    def exists(self) -> bool:
+        return self.inode is not None
+
+    def load(self) -> None:
+        try:
+            with open(self.index_file, "rb") as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or data.get("block_bytes") != self.block_bytes:
+            return
+        self.inode = data["inode"]
+        self.head = data["head"]
+        self.covered = data["covered"]
+        self.blocks = data["blocks"]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        self.inode = os.stat(path).st_ino
+        self.head = head_fingerprint(path, self.covered)
+        data = {
+            "version": INDEX_VERSION,
+            "block_bytes": self.block_bytes,
+            "inode": self.inode,
+            "head": self.head,
+            "covered": self.covered,
+            "blocks": self.blocks,
+        }
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps(data))
+        os.replace(tmp_path, self.index_file)
+
+    def validate(self, path: str) -> bool:
+        """Drop the index if `path` was rotated or truncated since it was built. Returns True if kept."""
+        st = os.stat(path)
+        if (
+            self.inode != st.st_ino
+            or st.st_size < self.covered
+            or head_fingerprint(path, self.covered) != self.head
+        ):
+            self.reset()
+            return False
+        return True
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.index_file)
+        except OSError:
+            return 0
+
+    def build(self, parser: LogParser, path: str) -> int:
+        """Add filters for complete blocks of lines appended since the last build. Returns the number of new blocks."""
+        if self.exists:
+            self.validate(path)
+        end = complete_lines_end(path, self.covered, os.path.getsize(path))
+        parse_fmt = parser.format_name
+        hash_cache: Dict[str, int] = {}
+        added = 0
+
+        block_start, items = self.covered, set()
+
+        def close_block(block_end: int) -> None:
+            nonlocal added
+            size_bits = int((block_end - block_start) * 8 * BITS_RATIO)
+            bloom = BloomFilter.for_items(items, size_bits, hash_cache)
+            self.blocks.append([block_start, bloom.hashes, bytes(bloom.bits)])
+            added += 1
+
+        for offset, entry in parser.iter_offsets(path, self.covered, end):
+            if offset - block_start >= self.block_bytes:
+                close_block(offset)
+                block_start, items = offset, set()
+            text = search_text(entry, parse_fmt)
+            if text:
+                items.update(ngrams(text))
+            ip = entry.get("ip")
+            if ip is not None:
+                items.add(ip_token(str(ip)))
+        if end > block_start:
+            close_block(end)
+        self.covered = end
+        self.save(path)
+        return added
+
+    @staticmethod
+    def _keyword_probes(matcher: KeywordMatcher) -> Optional[List[Set[str]]]:
+        """Trigrams each keyword needs, or None when the filters can't narrow the search."""
+        if matcher.regex:
+            return None
+        probes = []
+        for keyword in matcher.keywords:
+            grams = ngrams(keyword)
+            if not grams:  # shorter than a trigram: any block may hold it
+                if matcher.match_all:
+                    continue
+                return None
+            probes.append(grams)
+        return probes
+
+    def ranges(self, matcher: Optional[KeywordMatcher] = None, ip: Optional[str] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Merged byte ranges (within `covered`) of blocks that may hold matching
+        entries, or None when neither the keywords nor the IP narrow anything.
+        """
+        probes = self._keyword_probes(matcher) if matcher else None
+        if not probes and ip is None:
+            return None
+        hash_cache: Dict[str, int] = {}
+        result: List[Tuple[int, int]] = []
+        for i, (offset, hashes, bits) in enumerate(self.blocks):
+            bloom = BloomFilter(bits, hashes)
+            if ip is not None and not bloom.might_contain(ip_token(ip), hash_cache):
+                continue
+            if probes:
+                found = (all(bloom.might_contain(g, hash_cache) for g in grams) for grams in probes)
+                if not (all(found) if matcher.match_all else any(found)):
+                    continue
+            block_end = self.blocks[i + 1][0] if i + 1 < len(self.blocks) else self.covered
+            if result and result[-1][1] == offset:
+                result[-1] = (result[-1][0], block_end)
+            else:
+                result.append((offset, block_end))
+        return result
+
+    def iter_candidates(
+        self, parser: LogParser, path: str, matcher: Optional[KeywordMatcher] = None, ip: Optional[str] = None
+    ) -> Optional[Iterator[dict]]:
+        """
+        Candidate entries from blocks that may match, then every line appended
+        after the index was built. None when the index is missing, stale or
+        can't narrow the lookup.
+        """
+        if not self.exists or not self.validate(path):
+            return None
+        ranges = self.ranges(matcher, ip)
+        if ranges is None:
+            return None
+        return self._iter_candidates(parser, path, ranges)
+
+    def _iter_candidates(self, parser: LogParser, path: str, ranges: List[Tuple[int, int]]) -> Iterator[dict]:
+        for start, end in ranges:
+            yield from parser.iter_range(path, start, end)
+        yield from parser.iter_range(path, self.covered)
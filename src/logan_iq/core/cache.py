@@ -0,0 +1,162 @@
+import hashlib
+import marshal
+import os
+import struct
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".logan-iq_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_SUFFIX = ".lqc"
+
+# Bump when the shape of parsed entries changes so stale cache files miss.
+ENTRY_VERSION = 3
+
+# Entries are marshalled in length-prefixed batches so reads and writes never
+# hold the whole file (and each batch is read with one call, not byte by byte).
+BATCH_SIZE = 10_000
+FRAME_HEADER = struct.Struct("<Q")
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed log entries.
+
+    Entries are keyed by the source file's identity (path, inode, size, mtime)
+    and the parser profile (format, custom regex), so any change to the file
+    or to the way it is parsed results in a miss. Cache files are evicted
+    least-recently-used first once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(path: str, format_name: str, custom_regex: Optional[str] = None) -> str:
+        """Build the cache key for a file parsed with the given profile."""
+        st = os.stat(path)
+        identity = (
+            os.path.abspath(path), st.st_ino, st.st_size, st.st_mtime_ns,
+            format_name, custom_regex, marshal.version, ENTRY_VERSION,
+        )
+        return hashlib.sha1(repr(identity).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def load(self, key: str) -> Optional[Iterator[dict]]:
+        """Return an iterator over cached entries, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            f = open(entry_path, "rb")
+        except OSError:
+            return None
+        os.utime(entry_path)  # mark as recently used
+        return self._read_batches(f)
+
+    @staticmethod
+    def _read_batches(f) -> Iterator[dict]:
+        with f:
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                (length,) = FRAME_HEADER.unpack(header)
+                try:
+                    batch = marshal.loads(f.read(length))
+                except (EOFError, ValueError, TypeError):
+                    return
+                yield from batch
+
+    @staticmethod
+    def _write_batch(f, batch: List[dict]) -> int:
+        data = marshal.dumps(batch)
+        f.write(FRAME_HEADER.pack(len(data)))
+        f.write(data)
+        return FRAME_HEADER.size + len(data)
+
+    def iter_through(self, key: str, entries: Iterable[dict]) -> Iterator[dict]:
+        """
+        Yield `entries` unchanged while writing them to the cache.
+
+        The cache file is only committed once `entries` is exhausted; if the
+        consumer stops early (e.g. a result limit) the partial file is dropped.
+        Once the file grows past `max_bytes` it could never fit, so writing
+        stops and the rest of `entries` passes through uncached.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        committed = False
+        try:
+            it = iter(entries)
+            written = 0
+            with os.fdopen(fd, "wb") as f:
+                batch = []
+                for entry in it:
+                    batch.append(entry)
+                    if len(batch) >= BATCH_SIZE:
+                        written += self._write_batch(f, batch)
+                        batch = []
+                    yield entry
+                    if written > self.max_bytes:
+                        break
+                else:
+                    if batch:
+                        written += self._write_batch(f, batch)
+            if written > self.max_bytes:
+                os.remove(tmp_path)
+                yield from it
+                return
+            os.replace(tmp_path, self._entry_path(key))
+            committed = True
+        finally:
+            if not committed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """Return (file name, size in bytes, last use time) for each cache file, oldest first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            found.append((name, st.st_size, st.st_mtime))
+        return sorted(found, key=lambda item: item[2])
+
+    def size(self) -> int:
+        """Total size of the cache in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Remove least-recently-used files until the cache fits `max_bytes`. Returns files removed."""
+        cached = self.entries()
+        total = sum(size for _, size, _ in cached)
+        removed = 0
+        for name, size, _ in cached:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cache file. Returns files removed."""
+        removed = 0
+        for name, _, _ in self.entries():
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
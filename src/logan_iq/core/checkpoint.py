@@ -0,0 +1,105 @@
+import json
+import mmap
+import os
+import zlib
+from typing import Optional
+
+CHECKPOINT_PATH = os.path.join(os.path.expanduser("~"), ".logan-iq_checkpoints.json")
+
+# Bytes at the head of a file hashed to notice copy-truncate rotation
+# even when the file has already grown past the old offset again.
+HEAD_BYTES = 1024
+
+
+def head_fingerprint(path: str, length: int) -> int:
+    """CRC32 of the first `length` bytes of a file."""
+    with open(path, "rb") as f:
+        return zlib.crc32(f.read(min(length, HEAD_BYTES)))
+
+
+def line_end(path: str, offset: int) -> int:
+    """Offset just after the line starting at `offset`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return offset + len(f.readline())
+
+
+def complete_lines_end(path: str, start: int, size: int) -> int:
+    """
+    Return the offset just after the last newline in [start, size), or `start`
+    if there is none. A trailing line still being written is left for later.
+    """
+    if size <= start:
+        return start
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        last_newline = mm.rfind(b"\n", start, min(size, len(mm)))
+    return last_newline + 1 if last_newline != -1 else start
+
+
+class CheckpointStore:
+    """
+    Persist per-file byte offsets and running level counts so append-only logs
+    can be summarized incrementally.
+
+    A checkpoint is only resumed when the file still has the same inode, has
+    not shrunk below the saved offset and starts with the same bytes;
+    otherwise the file is treated as rotated/truncated and read from byte 0.
+    """
+
+    def __init__(self, checkpoint_file: str = CHECKPOINT_PATH) -> None:
+        self.checkpoint_file = checkpoint_file
+        self.checkpoints = {}
+        self.load()
+
+    def load(self) -> dict:
+        """Load checkpoints from disk; a missing or corrupted file yields no checkpoints."""
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                self.checkpoints = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.checkpoints = {}
+        return self.checkpoints
+
+    def save(self) -> None:
+        tmp_path = self.checkpoint_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoints, f, indent=4)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    @staticmethod
+    def key(path: str, format_name: str, custom_regex: Optional[str] = None) -> str:
+        return json.dumps([os.path.abspath(path), format_name, custom_regex])
+
+    def resume(self, key: str, path: str) -> Optional[dict]:
+        """Return the checkpoint for `key` if it is still valid for `path`, else None."""
+        checkpoint = self.checkpoints.get(key)
+        if not checkpoint:
+            return None
+
+        st = os.stat(path)
+        offset = checkpoint.get("offset", 0)
+        if checkpoint.get("inode") != st.st_ino or st.st_size < offset:
+            return None
+        if head_fingerprint(path, offset) != checkpoint.get("head"):
+            return None
+        return checkpoint
+
+    def update(self, key: str, path: str, offset: int, counts: dict) -> dict:
+        """Record that `path` has been consumed up to `offset` with running `counts`."""
+        checkpoint = {
+            "inode": os.stat(path).st_ino,
+            "offset": offset,
+            "head": head_fingerprint(path, offset),
+            "counts": counts,
+        }
+        self.checkpoints[key] = checkpoint
+        self.save()
+        return checkpoint
+
+    def delete(self, key: Optional[str] = None) -> None:
+        """Forget one checkpoint, or all of them if `key` is None."""
+        if key is None:
+            self.checkpoints.clear()
+        else:
+            self.checkpoints.pop(key, None)
+        self.save()
@@ -0,0 +1,343 @@
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .utils.date import EPOCH_FIELD, decode_any
+
+# Fields with few distinct values relative to the row count; stored dictionary-encoded
+CATEGORICAL_FIELDS = frozenset({
+    "level", "method", "status", "status_code", "ip", "user", "protocol",
+    "path", "size", "referer", "agent", "datetime",
+})
+
+
+class _Missing:
+    """Marker for a field absent from a row (distinct from a present None)."""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+_EPOCH_MISSING = -(2 ** 63)
+_EPOCH_NONE = _EPOCH_MISSING + 1
+# Values of the raw `epochs()` array at or below this mark a missing timestamp
+EPOCH_SENTINEL_MAX = _EPOCH_NONE
+# Rows appended between two size checks of a bounded `extend`
+SIZE_CHECK_ROWS = 4096
+
+
+class _DictColumn:
+    """Dictionary-encoded column: each distinct value is stored once, rows hold 4-byte codes."""
+
+    # `nbytes_since` mark of an empty column: (rows, distinct values)
+    START = (0, 0)
+
+    def __init__(self, values: Optional[list] = None, lookup: Optional[dict] = None) -> None:
+        # Code 0 is reserved for MISSING
+        self.values = values if values is not None else [MISSING]
+        self.lookup = lookup if lookup is not None else {}
+        self.codes = array("I")
+
+    def append(self, value) -> None:
+        if value is MISSING:
+            self.codes.append(0)
+            return
+        try:
+            code = self.lookup.get(value)
+        except TypeError:  # unhashable (e.g. a nested JSON object): store without deduplication
+            code = None
+            self.values.append(value)
+            self.codes.append(len(self.values) - 1)
+            return
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = code
+        self.codes.append(code)
+
+    def get(self, index: int):
+        return self.values[self.codes[index]]
+
+    def empty_like(self) -> "_DictColumn":
+        return _DictColumn(self.values, self.lookup)
+
+    def take(self, indices: Iterable[int]) -> "_DictColumn":
+        column = self.empty_like()
+        codes = self.codes
+        column.codes = array("I", (codes[i] for i in indices))
+        return column
+
+    def value_counts(self, indices: Optional[Iterable[int]] = None) -> Dict[Any, int]:
+        codes = self.codes if indices is None else (self.codes[i] for i in indices)
+        values = self.values
+        return {values[code]: n for code, n in Counter(codes).items()}
+
+    def nbytes(self) -> int:
+        return (
+            self.codes.buffer_info()[1] * self.codes.itemsize
+            + sys.getsizeof(self.values) + sys.getsizeof(self.lookup)
+            + sum(sys.getsizeof(v) for v in self.values)
+        )
+
+    def nbytes_since(self, mark: Tuple[int, int]) -> Tuple[int, Tuple[int, int]]:
+        """Approximate bytes added since `mark` (rows, distinct values), and the new mark."""
+        rows, distinct = mark
+        added = (len(self.codes) - rows) * self.codes.itemsize
+        added += sum(sys.getsizeof(v) + 40 for v in self.values[distinct:])  # plus list slot and lookup entry
+        return added, (len(self.codes), len(self.values))
+
+
+class _EpochColumn:
+    """Epoch milliseconds packed into a signed 64-bit array."""
+
+    START = 0
+
+    def __init__(self) -> None:
+        self.data = array("q")
+
+    def append(self, value) -> None:
+        if value is MISSING:
+            self.data.append(_EPOCH_MISSING)
+        elif value is None:
+            self.data.append(_EPOCH_NONE)
+        else:
+            self.data.append(value)
+
+    def get(self, index: int):
+        value = self.data[index]
+        if value == _EPOCH_MISSING:
+            return MISSING
+        return None if value == _EPOCH_NONE else value
+
+    def empty_like(self) -> "_EpochColumn":
+        return _EpochColumn()
+
+    def take(self, indices: Iterable[int]) -> "_EpochColumn":
+        column = _EpochColumn()
+        data = self.data
+        column.data = array("q", (data[i] for i in indices))
+        return column
+
+    def nbytes(self) -> int:
+        return self.data.buffer_info()[1] * self.data.itemsize
+
+    def nbytes_since(self, mark: int) -> Tuple[int, int]:
+        return (len(self.data) - mark) * self.data.itemsize, len(self.data)
+
+
+class _PlainColumn:
+    """Column of mostly-unique values (e.g. messages) kept as a plain list."""
+
+    START = 0
+
+    def __init__(self) -> None:
+        self.data: list = []
+
+    def append(self, value) -> None:
+        self.data.append(value)
+
+    def get(self, index: int):
+        return self.data[index]
+
+    def empty_like(self) -> "_PlainColumn":
+        return _PlainColumn()
+
+    def take(self, indices: Iterable[int]) -> "_PlainColumn":
+        column = _PlainColumn()
+        data = self.data
+        column.data = [data[i] for i in indices]
+        return column
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data) + sum(sys.getsizeof(v) for v in self.data if v is not MISSING)
+
+    def nbytes_since(self, mark: int) -> Tuple[int, int]:
+        new = self.data[mark:]
+        return 8 * len(new) + sum(sys.getsizeof(v) for v in new if v is not MISSING), len(self.data)
+
+
+def _new_column(name: str):
+    if name == EPOCH_FIELD:
+        return _EpochColumn()
+    if name in CATEGORICAL_FIELDS:
+        return _DictColumn()
+    return _PlainColumn()
+
+
+class LogColumns:
+    """
+    Column-store container for parsed log entries.
+
+    Repetitive fields (level, method, status, ip, ...) are dictionary-encoded
+    into arrays of 4-byte codes, the parser's epoch timestamps are packed into
+    a 64-bit array and everything else is kept in plain lists. Compared with
+    one dict per entry this removes the per-row key/value overhead and the
+    duplicated strings. Iterating yields ordinary dict rows again (fields a
+    row never had are left out), so it can be passed anywhere a list of
+    entries is accepted, e.g. `Exporter.to_table`.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, Any] = {}
+        self._length = 0
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[dict]) -> "LogColumns":
+        columns = cls()
+        columns.extend(entries)
+        return columns
+
+    def append(self, entry: dict) -> None:
+        columns = self._columns
+        for key, value in entry.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = _new_column(key)
+                for _ in range(self._length):
+                    column.append(MISSING)
+            column.append(value)
+        self._length += 1
+
+        if len(entry) != len(columns):
+            # Pad columns this entry doesn't have
+            for key, column in columns.items():
+                if key not in entry:
+                    column.append(MISSING)
+
+    def extend(self, entries: Iterable[dict], max_bytes: Optional[int] = None) -> bool:
+        """
+        Append `entries`. With `max_bytes`, stop and return False as soon as
+        the columns hold more than that (checked every `SIZE_CHECK_ROWS`
+        rows from the values added since, so the check stays linear).
+        """
+        if max_bytes is None:
+            for entry in entries:
+                self.append(entry)
+            return True
+        size = self.nbytes()
+        marks = {key: column.nbytes_since(column.START)[1] for key, column in self._columns.items()}
+        pending = 0
+        for entry in entries:
+            self.append(entry)
+            pending += 1
+            if pending == SIZE_CHECK_ROWS:
+                pending = 0
+                size += self._nbytes_since(marks)
+                if size > max_bytes:
+                    return False
+        return self._nbytes_since(marks) + size <= max_bytes
+
+    def _nbytes_since(self, marks: Dict[str, Any]) -> int:
+        """Bytes added to the columns since `marks`, which are moved forward."""
+        added = 0
+        for key, column in self._columns.items():
+            # A field first seen since the last check counts from its start
+            grown, marks[key] = column.nbytes_since(marks.get(key, column.START))
+            added += grown
+        return added
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._columns)
+
+    def row(self, index: int) -> dict:
+        result = {}
+        for key, column in self._columns.items():
+            value = column.get(index)
+            if value is not MISSING:
+                result[key] = value
+        return result
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self._length):
+            yield self.row(i)
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LogColumns index out of range")
+        return self.row(index)
+
+    def values(self, name: str) -> List[Any]:
+        """All values of one field (None where a row lacks it)."""
+        column = self._columns.get(name)
+        if column is None:
+            return [None] * self._length
+        return [None if v is MISSING else v for v in map(column.get, range(self._length))]
+
+    def epochs(self) -> Optional[array]:
+        """The raw epoch array (see `EPOCH_SENTINEL_MAX`), or None if entries carry no parser timestamps."""
+        column = self._columns.get(EPOCH_FIELD)
+        return column.data if column is not None else None
+
+    def value_counts(self, name: str, indices: Optional[Iterable[int]] = None) -> Dict[Any, int]:
+        """
+        Count rows (all, or only `indices`) per value of `name`; rows without
+        the field count under None.
+        """
+        column = self._columns.get(name)
+        if column is None:
+            total = self._length if indices is None else len(list(indices))
+            return {None: total} if total else {}
+        if isinstance(column, _DictColumn):
+            counts = column.value_counts(indices)
+        else:
+            rows = range(self._length) if indices is None else indices
+            counts = Counter(column.get(i) for i in rows)
+        if MISSING in counts:
+            counts[None] = counts.get(None, 0) + counts.pop(MISSING)
+        return dict(counts)
+
+    def where(self, name: str, predicate: Callable[[Any], bool]) -> List[int]:
+        """
+        Row indices whose `name` value satisfies `predicate` (absent fields are
+        passed as None). For dictionary-encoded columns the predicate runs once
+        per distinct value instead of once per row.
+        """
+        column = self._columns.get(name)
+        if column is None:
+            return list(range(self._length)) if predicate(None) else []
+        if isinstance(column, _DictColumn):
+            accepted = {
+                code for code, value in enumerate(column.values)
+                if predicate(None if value is MISSING else value)
+            }
+            return [i for i, code in enumerate(column.codes) if code in accepted]
+        return [i for i in range(self._length) if predicate(None if (v := column.get(i)) is MISSING else v)]
+
+    def between(self, start_ms: int, end_ms: int, upper_inclusive: bool = True) -> List[int]:
+        """
+        Row indices whose epoch timestamp lies in [start_ms, end_ms] (or
+        [start_ms, end_ms) when `upper_inclusive` is False); rows without a
+        timestamp never match.
+        """
+        epochs = self.epochs()
+        if epochs is None:
+            # Entries not built by LogParser: decode the datetime strings instead
+            epochs = [decode_any(v) for v in self.values("datetime")]
+            if upper_inclusive:
+                return [i for i, ts in enumerate(epochs) if ts is not None and start_ms <= ts <= end_ms]
+            return [i for i, ts in enumerate(epochs) if ts is not None and start_ms <= ts < end_ms]
+        # The MISSING/None sentinels sit far below any real timestamp
+        if upper_inclusive:
+            return [i for i, ts in enumerate(epochs) if start_ms <= ts <= end_ms]
+        return [i for i, ts in enumerate(epochs) if start_ms <= ts < end_ms]
+
+    def take(self, indices: Iterable[int]) -> "LogColumns":
+        """New container holding only the given rows (dictionaries are shared)."""
+        indices = list(indices)
+        result = LogColumns()
+        result._columns = {key: column.take(indices) for key, column in self._columns.items()}
+        result._length = len(indices)
+        return result
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, in bytes."""
+        return sum(column.nbytes() for column in self._columns.values())
@@ -0,0 +1,167 @@
+import bz2
+import gzip
+import lzma
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+# Magic bytes at the start of each supported archive type
+MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+OPENERS = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+# Decompressed bytes per read, and how many reads may wait for the parser
+READ_CHUNK = 1024 * 1024
+QUEUE_CHUNKS = 8
+
+_BGZF_HEADER = struct.Struct("<4BI2BH")
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Return "gzip", "bz2" or "xz" from the file's magic bytes, or None for plain text."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(6)
+    except OSError:
+        return None
+    for magic, kind in MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def is_compressed(path: str) -> bool:
+    return detect_compression(path) is not None
+
+
+def _produce(fileobj, chunks: "queue.Queue", stop: threading.Event, chunk_size: int) -> None:
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        with fileobj:
+            while True:
+                data = fileobj.read(chunk_size)
+                if not put(data) or not data:
+                    return
+    except BaseException as e:  # handed to the consumer and re-raised there
+        put(e)
+
+
+def iter_decompressed_chunks(path: str, chunk_size: int = READ_CHUNK, max_chunks: int = QUEUE_CHUNKS) -> Iterator[bytes]:
+    """
+    Yield the decompressed content of `path` in chunks.
+
+    Decompression runs on a background thread (zlib, bz2 and lzma release the
+    GIL while they work) and hands chunks over through a bounded queue, so it
+    overlaps with parsing while never running more than `max_chunks` ahead.
+    """
+    kind = detect_compression(path)
+    fileobj = OPENERS[kind](path, "rb") if kind else open(path, "rb")
+    chunks: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+    stop = threading.Event()
+    producer = threading.Thread(target=_produce, args=(fileobj, chunks, stop, chunk_size), daemon=True)
+    producer.start()
+    try:
+        while True:
+            data = chunks.get()
+            if isinstance(data, BaseException):
+                raise data
+            if not data:
+                return
+            yield data
+    finally:
+        stop.set()
+        producer.join()
+
+
+def iter_decompressed_lines(path: str) -> Iterator[bytes]:
+    """Yield raw lines (without the newline) of a possibly compressed file."""
+    carry = b""
+    for data in iter_decompressed_chunks(path):
+        lines = (carry + data).split(b"\n")
+        carry = lines.pop()
+        yield from lines
+    if carry:
+        yield carry
+
+
+def bgzf_blocks(path: str) -> Optional[List[int]]:
+    """
+    Start offsets of the members of a BGZF-style gzip file (each member
+    records its own compressed size, as written by `bgzip`), followed by the
+    file size. None for ordinary gzip files, whose member boundaries can only
+    be found by decompressing.
+    """
+    offsets = []
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = 0
+        while pos < size:
+            f.seek(pos)
+            header = f.read(_BGZF_HEADER.size)
+            if len(header) < _BGZF_HEADER.size:
+                return None
+            id1, id2, method, flags, _, _, _, extra_len = _BGZF_HEADER.unpack(header)
+            if (id1, id2, method) != (0x1F, 0x8B, 8) or not flags & 4:
+                return None
+            extra = f.read(extra_len)
+            block_size = None
+            i = 0
+            while i + 4 <= len(extra):
+                sub_id, sub_len = extra[i:i + 2], struct.unpack("<H", extra[i + 2:i + 4])[0]
+                if sub_id == b"BC" and sub_len == 2:
+                    block_size = struct.unpack("<H", extra[i + 4:i + 6])[0] + 1
+                i += 4 + sub_len
+            if block_size is None:
+                return None
+            offsets.append(pos)
+            pos += block_size
+    if pos != size:
+        return None
+    offsets.append(size)
+    return offsets
+
+
+def split_members(path: str, chunks: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Split a BGZF file into at most `chunks` byte ranges on member boundaries,
+    each decompressible on its own. None when the file isn't BGZF.
+    """
+    offsets = bgzf_blocks(path)
+    if offsets is None or len(offsets) < 3:
+        return None
+    members = len(offsets) - 1
+    chunks = max(1, min(chunks, members))
+    bounds = [offsets[members * i // chunks] for i in range(chunks)] + [offsets[-1]]
+    return [(s, e) for s, e in zip(bounds, bounds[1:]) if e > s]
+
+
+def decompress_range(path: str, start: int, end: int) -> bytes:
+    """Decompress the gzip members stored in bytes [start, end) of `path`."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    out = []
+    while data:
+        d = zlib.decompressobj(wbits=31)
+        out.append(d.decompress(data))
+        data = d.unused_data
+    return b"".join(out)
@@ -19,10 +19,9 @@ class ConfigManager:
         self.load()
 
     def load(self) -> dict:
-        """Load configuration from the config JSON file. Creates an empty file if it doesn't exist."""
+        """Load configuration from the config JSON file. A missing file is an empty config; it's only written by `set`/`delete`."""
         if not os.path.exists(self.config_file):
             self.config_data = {}
-            self.save()
         else:
             with open(self.config_file, "r", encoding="utf-8") as f:
                 try:
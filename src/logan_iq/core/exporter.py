@@ -1,14 +1,57 @@
-from typing import List
+from collections import deque
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 import csv
 import json
+import os
+import pickle
+import tempfile
 
 from colorama import Fore, Style
-from tabulate import tabulate
 
 from .utils.string import truncate
+from .utils.date import EPOCH_FIELD
+
+# Entries rendered per write, and the size of the output buffer
+BATCH_ROWS = 1000
+WRITE_BUFFER = 1024 * 1024
+# Rows `iter_table` sizes its columns from
+SAMPLE_ROWS = 200
+
+
+def public_fields(entry: dict) -> dict:
+    """Return `entry` without fields the parser adds for internal use (e.g. the epoch timestamp)."""
+    if EPOCH_FIELD not in entry:
+        return entry
+    return {k: v for k, v in entry.items() if k != EPOCH_FIELD}
 
 
 class Exporter:
+    @staticmethod
+    def colorize(level: str, text: str) -> str:
+        """Return color-coded text for log levels."""
+        level = str(level).upper()
+        if level == "ERROR":
+            return Fore.RED + text + Style.RESET_ALL
+        elif level == "WARNING" or level == "WARN":
+            return Fore.YELLOW + text + Style.RESET_ALL
+        elif level == "DEBUG":
+            return Fore.CYAN + text + Style.RESET_ALL
+        elif level == "INFO":
+            return Fore.GREEN + text + Style.RESET_ALL
+        else:
+            return text
+
+    def to_line(self, entry: dict) -> str:
+        """Render one entry as a single space-separated line with a colorized level."""
+        parts = []
+        for key, value in public_fields(entry).items():
+            text = "" if value is None else str(value)
+            if key.lower() == "level":
+                text = self.colorize(text, text)
+            parts.append(text)
+        return " ".join(parts)
+
     def to_table(self, data: list[dict]) -> str:
         """Convert the list of dicts to a pretty table string with colorized levels."""
         if not data:
@@ -18,23 +61,9 @@ class Exporter:
         headers = []
         for item in data:
             for k in item.keys():
-                if k not in headers:
+                if k not in headers and k != EPOCH_FIELD:
                     headers.append(k)
 
-        def colorize(level: str, text: str) -> str:
-            """Return color-coded text for log levels."""
-            level = str(level).upper()
-            if level == "ERROR":
-                return Fore.RED + text + Style.RESET_ALL
-            elif level == "WARNING" or level == "WARN":
-                return Fore.YELLOW + text + Style.RESET_ALL
-            elif level == "DEBUG":
-                return Fore.CYAN + text + Style.RESET_ALL
-            elif level == "INFO":
-                return Fore.GREEN + text + Style.RESET_ALL
-            else:
-                return text
-
         # Build table rows
         rows = []
         for item in data:
@@ -42,25 +71,224 @@ class Exporter:
             for h in headers:
                 val = truncate(str(item.get(h, "")))
                 if h.lower() == "level":
-                    val = colorize(val, val)
+                    val = self.colorize(val, val)
                 row.append(val)
             rows.append(row)
 
+        from tabulate import tabulate
+
         return tabulate(rows, headers=headers, tablefmt="grid")
 
-    def to_csv(self, data: List[dict], path: str) -> None:
-        """Write a list of dicts to a CSV file."""
-        if not data:
-            print("No data to export.")
+    def iter_table(
+        self,
+        data: Iterable[dict],
+        max_rows: Optional[int] = None,
+        tail: Optional[int] = None,
+        sample_rows: int = SAMPLE_ROWS,
+    ) -> Iterator[str]:
+        """
+        Render dicts as grid table lines lazily, for tables too large for `to_table`.
+
+        Headers, column widths and alignment come from the first `sample_rows`
+        rows; later cells are cut to fit and keys first seen later are left
+        out. Only the first `max_rows` rows are read and formatted, or with
+        `tail` only the last `tail` rows are kept (in a bounded buffer). A
+        note line follows when rows were left out.
+        """
+        rows = iter(data)
+        skipped = 0
+        if tail is not None:
+            counted = _Counted(rows)
+            kept = deque(counted, maxlen=max(tail, 0))
+            skipped = counted.count - len(kept)
+            rows = iter(kept)
+        elif max_rows is not None:
+            sample_rows = min(sample_rows, max_rows + 1)
+
+        sample = list(islice(rows, sample_rows))
+        if not sample:
+            yield "No data to display."
             return
 
-        headers = data[0].keys()
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
+        headers: Dict[str, None] = {}
+        for item in sample:
+            headers.update(dict.fromkeys(item))
+        headers.pop(EPOCH_FIELD, None)
+        columns = list(headers)
+        widths = [len(h) for h in columns]
+        numeric = [True] * len(columns)
+        for item in sample:
+            for i, h in enumerate(columns):
+                value = item.get(h)
+                if value is None:
+                    continue
+                widths[i] = max(widths[i], len(_cell(value)))
+                if numeric[i] and not _is_number(value):
+                    numeric[i] = False
+
+        border = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+        level_column = next((i for i, h in enumerate(columns) if h.lower() == "level"), None)
+
+        def render(item: dict) -> str:
+            cells = []
+            for i, h in enumerate(columns):
+                value = item.get(h)
+                text = "" if value is None else _cell(value)
+                width = widths[i]
+                if len(text) > width:
+                    text = text[:width - 3] + "..." if width > 3 else text[:width]
+                text = text.rjust(width) if numeric[i] else text.ljust(width)
+                if i == level_column:
+                    text = self.colorize(text.strip(), text)
+                cells.append(text)
+            return "| " + " | ".join(cells) + " |"
+
+        yield border
+        yield "| " + " | ".join(h.ljust(w) for h, w in zip(columns, widths)) + " |"
+        yield border.replace("-", "=")
+        shown = 0
+        for item in chain(sample, rows):
+            if max_rows is not None and shown >= max_rows:
+                yield "... more rows not shown"
+                return
+            yield render(item)
+            yield border
+            shown += 1
+        if skipped:
+            yield f"... {skipped} earlier rows not shown"
+
+    def to_csv(self, data: Iterable[dict], path: str, fields: Optional[Sequence[str]] = None) -> int:
+        """
+        Stream dicts to a CSV file. Returns the number of rows written.
+
+        With `fields` (e.g. the named groups of a regex format) rows are
+        written straight through and other keys are dropped. Without it the
+        columns are the union of every row's keys: rows are first spooled to a
+        temporary file while the keys are collected, then written out.
+        """
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            print("No data to export.")
+            return 0
+        rows = chain([first], rows)
+
+        if fields is not None:
+            return self._write_csv(path, [f for f in fields if f != EPOCH_FIELD], rows)
+
+        headers: Dict[str, None] = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, spool_path = tempfile.mkstemp(prefix=".logan-iq-", suffix=".spool", dir=directory)
+        try:
+            with os.fdopen(fd, "wb", buffering=WRITE_BUFFER) as spool:
+                for batch in _batches(rows):
+                    for row in batch:
+                        headers.update(dict.fromkeys(row))
+                    spool.write(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+            headers.pop(EPOCH_FIELD, None)
+            return self._write_csv(path, list(headers), _read_spool(spool_path))
+        finally:
+            os.remove(spool_path)
+
+    @staticmethod
+    def _write_csv(path: str, headers: Sequence[str], rows: Iterable[dict]) -> int:
+        counted = _Counted(rows)
+        with _open_output(path, newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
             writer.writeheader()
-            writer.writerows(data)
+            writer.writerows(counted)
+        return counted.count
+
+    def to_json(self, data: Iterable[dict], file_path: str, compact: bool = False) -> int:
+        """
+        Stream dicts to a JSON array file, one element at a time. Returns the
+        number of entries written. The output is that of `json.dump(data,
+        indent=4)`; `compact` drops the indentation and spaces.
+        """
+        if compact:
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+            first_sep, sep, close, empty = "", ",", "]\n", "]\n"
+        else:
+            encode = json.JSONEncoder(indent=4, ensure_ascii=False).encode
+            first_sep, sep, close, empty = "\n    ", ",\n    ", "\n]", "]"
+
+        count = 0
+        with _open_output(file_path) as f:
+            f.write("[")
+            for batch in _batches(data):
+                parts = [encode(public_fields(item)) for item in batch]
+                if not compact:
+                    # One level deeper, as inside the array; JSON strings escape
+                    # newlines, so each one is between tokens
+                    parts = [part.replace("\n", "\n    ") for part in parts]
+                f.write((sep if count else first_sep) + sep.join(parts))
+                count += len(parts)
+            f.write(close if count else empty)
+        return count
+
+    def to_ndjson(self, data: Iterable[dict], file_path: str) -> int:
+        """Stream dicts to a newline-delimited JSON file (one object per line). Returns the number written."""
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        count = 0
+        with _open_output(file_path) as f:
+            for batch in _batches(data):
+                f.write("".join([encode(public_fields(item)) + "\n" for item in batch]))
+                count += len(batch)
+        return count
+
+
+def _cell(value) -> str:
+    return truncate(str(value).replace("\n", " "))
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, (int, float)):
+        return True
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _open_output(path: str, newline: Optional[str] = None):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, "w", encoding="utf-8", newline=newline, buffering=WRITE_BUFFER)
+
+
+def _batches(data: Iterable[dict]) -> Iterator[List[dict]]:
+    rows = iter(data)
+    while True:
+        batch = list(islice(rows, BATCH_ROWS))
+        if not batch:
+            return
+        yield batch
+
+
+def _read_spool(path: str) -> Iterator[dict]:
+    with open(path, "rb") as spool:
+        while True:
+            try:
+                batch = pickle.load(spool)
+            except EOFError:
+                return
+            yield from batch
+
+
+class _Counted:
+    """Iterate `rows` while counting them."""
+
+    def __init__(self, rows: Iterable[dict]) -> None:
+        self.rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self) -> "_Counted":
+        return self
 
-    def to_json(self, data: List[dict], file_path: str) -> None:
-        """Write JSON data to a file."""
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+    def __next__(self) -> dict:
+        row = next(self.rows)
+        self.count += 1
+        return row
@@ -1,90 +1,234 @@
-from typing import List, Optional
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from .utils.date import parse_date, DEFAULT_DATETIME_FORMAT
+from .columns import LogColumns
+from .search import KeywordMatcher
+from .utils.date import parse_date, entry_epoch, to_epoch_ms, DEFAULT_DATETIME_FORMAT
+
+# A keyword, a list of keywords, or a configured KeywordMatcher
+SearchSpec = Union[None, str, Sequence[str], KeywordMatcher]
+
+# Fields `--search` looks at in JSON logs; other formats only search the message
+JSON_SEARCH_FIELDS = ("message", "path", "method", "status", "status_code")
+
+
+def search_text(log: dict, parse_fmt: str) -> Optional[str]:
+    """
+    The text keyword searches run against: the message, or for JSON logs all
+    searchable fields joined into one haystack (so each field is converted
+    and case-folded once). None if there is nothing to search.
+    """
+    if parse_fmt == "json":
+        return "\n".join([str(v) for v in map(log.get, JSON_SEARCH_FIELDS) if v is not None])
+    v = log.get("message")
+    if v is None:
+        return None
+    return v if isinstance(v, str) else str(v)
 
 
 class LogFilter:
     """
-    Filter parsed log entries by level, date range, and limit.
+    Filter parsed log entries by level, date range, IP, keyword, and limit.
     """
 
     def __init__(self, datetime_format: str = DEFAULT_DATETIME_FORMAT):
         self.datetime_format = datetime_format
 
-    def filter_by_level(self, logs: List[dict], level: str) -> List[dict]:
+    def filter_by_level(self, logs: Iterable[dict], level: str) -> List[dict]:
         """Return logs matching a given level (case-insensitive)."""
+        if isinstance(logs, LogColumns):
+            return logs.take(self._level_indices(logs, level))
         return [log for log in logs if log.get("level", "").lower() == level.lower()]
 
-    def filter_by_date_range(self, logs: List[dict], start: str, end: str) -> List[dict]:
-        """
-        Return logs whose datetime is within [start, end].
-        Accepts full datetime or date-only strings.
-        """
+    @staticmethod
+    def _level_indices(logs: LogColumns, level: str) -> List[int]:
+        # Compared once per distinct level rather than once per row
+        level = level.lower()
+        return logs.where("level", lambda value: (value or "").lower() == level)
+
+    def parse_range(self, start: str, end: str) -> Tuple[datetime, datetime]:
+        """Parse start/end strings, expanding date-only values to cover full days."""
         # Parse start
         start_dt = parse_date(start, DEFAULT_DATETIME_FORMAT)
         if not start_dt and len(start) == 10:  # date-only
             start_dt = parse_date(start, "%Y-%m-%d")
-            start_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+            if start_dt:
+                start_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
 
         # Parse end
         end_dt = parse_date(end, DEFAULT_DATETIME_FORMAT)
         if not end_dt and len(end) == 10:  # date-only
             end_dt = parse_date(end, "%Y-%m-%d")
-            end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
+            if end_dt:
+                end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
 
         if not start_dt or not end_dt:
             raise ValueError(f"Invalid start or end date: {start} to {end}")
 
-        filtered = []
-        for log in logs:
-            dt_str = log.get("datetime")
-            if not dt_str:
-                continue
-            log_dt = parse_date(dt_str, DEFAULT_DATETIME_FORMAT)
-            if log_dt and start_dt <= log_dt <= end_dt:
-                filtered.append(log)
-
-        return filtered
-
-    def filter_by_keyword(self, logs: List[dict], keyword: str, parse_fmt: str) -> List[dict]:
-        """Return logs where the message and/or (method, path, status_code) contains the keyword (case-insensitive)."""
-        if not keyword:
-            return logs
-
-        keyword = keyword.lower()
-        keys_to_check =  ("message", "path", "method", "status", "status_code")
-
-        normalize = lambda v: str(v).lower() if v is not None else ""
-
-        if parse_fmt == "json":
-            return [
-                log for log in logs
-                if any(keyword in normalize(log.get(k)) for k in keys_to_check)
-            ]
-        else:
-            return [
-                log for log in logs
-                if keyword in normalize(log.get("message"))
-            ]
+        return start_dt, end_dt
 
-    def filter(
+    def parse_epoch_range(self, start: str, end: str) -> Tuple[int, int]:
+        """Like `parse_range`, but as epoch milliseconds comparable with `entry_epoch`."""
+        start_dt, end_dt = self.parse_range(start, end)
+        return to_epoch_ms(start_dt), to_epoch_ms(end_dt)
+
+    @staticmethod
+    def _in_range(log: dict, start_ms: int, end_ms: int) -> bool:
+        ts = entry_epoch(log)
+        return ts is not None and start_ms <= ts <= end_ms
+
+    def filter_by_date_range(self, logs: Iterable[dict], start: str, end: str) -> List[dict]:
+        """
+        Return logs whose datetime is within [start, end].
+        Accepts full datetime or date-only strings; entries are compared by
+        the epoch timestamp the parser normalized, so every format is covered.
+        """
+        start_ms, end_ms = self.parse_epoch_range(start, end)
+        if isinstance(logs, LogColumns):
+            return logs.take(logs.between(start_ms, end_ms))
+        return [log for log in logs if self._in_range(log, start_ms, end_ms)]
+
+    @staticmethod
+    def _keyword_predicate(search: SearchSpec, parse_fmt: str) -> Callable[[dict], bool]:
+        matches = KeywordMatcher.coerce(search).matches
+
+        def predicate(log: dict) -> bool:
+            text = search_text(log, parse_fmt)
+            return text is not None and matches(text)
+
+        return predicate
+
+    def iter_by_keyword(self, logs: Iterable[dict], keyword: SearchSpec, parse_fmt: str) -> Iterator[dict]:
+        """Lazy variant of `filter_by_keyword`."""
+        matcher = KeywordMatcher.coerce(keyword)
+        if not matcher:
+            return iter(logs)
+        return filter(self._keyword_predicate(matcher, parse_fmt), logs)
+
+    def filter_by_keyword(self, logs: Iterable[dict], keyword: SearchSpec, parse_fmt: str) -> List[dict]:
+        """
+        Return logs where the message and/or (method, path, status_code) contains the keyword (case-insensitive).
+        `keyword` may also be a list of keywords (any of them matches) or a `KeywordMatcher`.
+        """
+        return list(self.iter_by_keyword(logs, keyword, parse_fmt))
+
+    def compile(
         self,
-        logs: List[dict],
         level: Optional[str] = None,
-        limit: Optional[int] = None,
         start: Optional[str] = None,
         end: Optional[str] = None,
-    ) -> List[dict]:
-        """Apply level and/or date filters, then limit the results."""
-        result = logs
+        search: SearchSpec = None,
+        parse_fmt: str = "simple",
+        ip: Optional[str] = None,
+    ) -> Optional[Callable[[dict], bool]]:
+        """
+        Fuse the date range, IP, level and keyword filters into one predicate,
+        checking the cheapest condition first (integer epoch comparison, then
+        exact IP and level comparisons, then the substring search). Returns
+        None when nothing is filtered.
+        """
+        checks: List[Callable[[dict], bool]] = []
+
+        if start and end:
+            start_ms, end_ms = self.parse_epoch_range(start, end)
+            checks.append(lambda log: self._in_range(log, start_ms, end_ms))
+
+        if ip:
+            checks.append(lambda log: log.get("ip") == ip)
 
         if level:
-            result = self.filter_by_level(result, level)
+            level = level.lower()
+            checks.append(lambda log: log.get("level", "").lower() == level)
 
-        if start and end:
-            result = self.filter_by_date_range(result, start, end)
+        matcher = KeywordMatcher.coerce(search)
+        if matcher:
+            checks.append(self._keyword_predicate(matcher, parse_fmt))
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+
+        def predicate(log: dict) -> bool:
+            for check in checks:
+                if not check(log):
+                    return False
+            return True
+
+        return predicate
+
+    def iter_filter(
+        self,
+        logs: Iterable[dict],
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        search: SearchSpec = None,
+        parse_fmt: str = "simple",
+        ip: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """
+        Lazy variant of `filter`: entries are pulled from `logs` one at a time
+        and tested against a single fused predicate. The limit is applied to
+        the matches, so once `limit` entries are found `logs` is not read any
+        further.
+        """
+        predicate = self.compile(level, start, end, search, parse_fmt, ip)
+        result = iter(logs) if predicate is None else filter(predicate, logs)
 
         if limit is not None and limit > 0:
-            result = result[:limit]
+            result = islice(result, limit)
 
         return result
+
+    def filter(
+        self,
+        logs: Iterable[dict],
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        search: SearchSpec = None,
+        parse_fmt: str = "simple",
+        ip: Optional[str] = None,
+    ) -> Union[List[dict], LogColumns]:
+        """
+        Apply level, date, IP and keyword filters, then limit the results.
+        `LogColumns` input is filtered column-wise and returned as `LogColumns`.
+        """
+        if isinstance(logs, LogColumns):
+            return self._filter_columns(logs, level, limit, start, end, search, parse_fmt, ip)
+        return list(self.iter_filter(logs, level, limit, start, end, search, parse_fmt, ip))
+
+    def _filter_columns(
+        self,
+        logs: LogColumns,
+        level: Optional[str],
+        limit: Optional[int],
+        start: Optional[str],
+        end: Optional[str],
+        search: SearchSpec = None,
+        parse_fmt: str = "simple",
+        ip: Optional[str] = None,
+    ) -> LogColumns:
+        indices = None
+        if level:
+            indices = self._level_indices(logs, level)
+        if ip:
+            with_ip = logs.where("ip", lambda value: value == ip)
+            indices = with_ip if indices is None else sorted(set(indices).intersection(with_ip))
+        if start and end:
+            start_ms, end_ms = self.parse_epoch_range(start, end)
+            in_range = logs.between(start_ms, end_ms)
+            indices = in_range if indices is None else sorted(set(indices).intersection(in_range))
+        if indices is None:
+            indices = range(len(logs))
+        matcher = KeywordMatcher.coerce(search)
+        if matcher:
+            matches = self._keyword_predicate(matcher, parse_fmt)
+            indices = [i for i in indices if matches(logs.row(i))]
+        if limit is not None and limit > 0:
+            indices = indices[:limit]
+        return logs.take(indices)
@@ -0,0 +1,151 @@
+import os
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .parser import LogParser
+
+DEFAULT_WINDOWS = (60, 300, 3600)
+
+# Upper bound on bytes read per poll, so catching up on a large backlog
+# never loads it into memory at once.
+READ_CHUNK = 4 * 1024 * 1024
+
+
+class LogFollower:
+    """
+    Watch a log file for appended lines, like `tail -F`.
+
+    Each `poll` reads only the bytes written since the previous call and
+    parses the complete lines among them; a trailing partial line is kept
+    until its newline arrives. Rotation (the path now points to a new inode)
+    and truncation (the file shrank) are detected and the file is reopened
+    or re-read from the start.
+    """
+
+    def __init__(self, path: str, parser: "LogParser", from_start: bool = False) -> None:
+        self.path = path
+        self.parser = parser
+        self._file = None
+        self._inode = None
+        self._buffer = b""
+        self.caught_up = True  # False while unread bytes remain after a poll
+        self._open(seek_end=not from_start)
+
+    def _open(self, seek_end: bool) -> bool:
+        try:
+            self._file = open(self.path, "rb")
+        except OSError:
+            self._file = None
+            return False
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._buffer = b""
+        if seek_end:
+            self._file.seek(0, os.SEEK_END)
+        return True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_lines(self) -> List[bytes]:
+        data = self._file.read(READ_CHUNK)
+        self.caught_up = len(data) < READ_CHUNK
+        if not data:
+            return []
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        return lines
+
+    def poll_lines(self) -> List[bytes]:
+        """Return complete raw lines appended since the last poll."""
+        if self._file is None:
+            # The file was missing (e.g. between rotate and create); new files are read from the start
+            if not self._open(seek_end=False):
+                return []
+
+        try:
+            current = os.stat(self.path)
+        except OSError:
+            return self._read_lines()  # rotated away and not recreated yet; keep reading the old file
+
+        if current.st_ino != self._inode:
+            # Rotated: drain what is left in the old file, then switch to the new one
+            lines = self._read_lines()
+            while not self.caught_up:
+                lines.extend(self._read_lines())
+            if self._buffer:
+                lines.append(self._buffer)
+            self.close()
+            if self._open(seek_end=False):
+                lines.extend(self._read_lines())
+            return lines
+
+        if current.st_size < self._file.tell():
+            # Truncated in place (copytruncate): start over
+            self._file.seek(0)
+            self._buffer = b""
+        return self._read_lines()
+
+    def poll(self) -> List[dict]:
+        """Return parsed entries for complete lines appended since the last poll."""
+        parse_bytes = self.parser.parse_bytes
+        return [entry for entry in map(parse_bytes, self.poll_lines()) if entry]
+
+    def follow(
+        self, poll_interval: float = 0.25, stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[dict]:
+        """Yield entries as they are appended until `stop()` returns True."""
+        while not (stop and stop()):
+            yield from self.poll()
+            if self.caught_up:
+                time.sleep(poll_interval)
+
+
+class RollingLevelCounts:
+    """
+    Per-level counts over sliding time windows (e.g. the last 1, 5 and 60 minutes).
+
+    Counts are kept in one bucket per second, and buckets older than the
+    largest window are dropped, so memory is bounded by that window's length
+    no matter how many lines arrive.
+    """
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS, clock: Callable[[], float] = time.time) -> None:
+        self.windows = tuple(sorted(set(int(w) for w in windows if int(w) > 0))) or DEFAULT_WINDOWS
+        self.clock = clock
+        self._buckets: Deque[Tuple[int, Dict[str, int]]] = deque()
+
+    def _expire(self, now: int) -> None:
+        horizon = now - self.windows[-1]
+        while self._buckets and self._buckets[0][0] <= horizon:
+            self._buckets.popleft()
+
+    def add(self, level: Optional[str], count: int = 1) -> None:
+        now = int(self.clock())
+        self._expire(now)
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append((now, {}))
+        bucket = self._buckets[-1][1]
+        level = (level or "").upper() or "UNKNOWN"
+        bucket[level] = bucket.get(level, 0) + count
+
+    def update(self, entries: Iterable[dict]) -> None:
+        for entry in entries:
+            self.add(entry.get("level"))
+
+    def counts(self) -> Dict[int, Dict[str, int]]:
+        """Return {window seconds: {level: count}} for every configured window."""
+        now = int(self.clock())
+        self._expire(now)
+        result: Dict[int, Dict[str, int]] = {w: {} for w in self.windows}
+        for second, bucket in self._buckets:
+            age = now - second
+            for window in self.windows:
+                if age < window:
+                    totals = result[window]
+                    for level, count in bucket.items():
+                        totals[level] = totals.get(level, 0) + count
+        return result
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import marshal
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Set
+
+from .checkpoint import complete_lines_end, head_fingerprint
+from .parser import LogParser
+from .search import KeywordMatcher
+
+INDEX_DIRNAME = "keyword_index"
+INDEX_VERSION = 1
+
+# Fields tokenized into the index; a superset of what `--search` looks at for any format
+INDEXED_FIELDS = ("message", "path", "method", "status", "status_code")
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct lower-cased word tokens of `text`."""
+    return set(TOKEN.findall(text.lower()))
+
+
+def _put_varint(buf: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def decode_postings(data: bytes) -> List[int]:
+    """Decode a delta/varint posting list back into ascending byte offsets."""
+    offsets = []
+    current = value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            current += value
+            offsets.append(current)
+            value = shift = 0
+    return offsets
+
+
+class KeywordIndex:
+    """
+    On-disk inverted index of one log file: term -> byte offsets of the lines
+    containing it.
+
+    Terms are the lower-cased word tokens of the searchable fields. Each
+    posting list stores the gaps between consecutive line offsets as varints,
+    so a term that appears on most lines costs one or two bytes per line.
+    `build` only tokenizes complete lines appended since the previous build;
+    a rotated or truncated file is re-indexed from the start.
+
+    Since `--search` matches substrings, a query token is looked up in every
+    term that could contain it, which makes the candidates a superset of the
+    matches. Callers still apply the exact keyword filter.
+    """
+
+    def __init__(self, index_file: str) -> None:
+        self.index_file = index_file
+        self.reset()
+        self.load()
+
+    @classmethod
+    def for_file(cls, cache_dir: str, path: str, format_name: str, custom_regex: Optional[str] = None) -> "KeywordIndex":
+        """Return the index stored in `cache_dir` for `path` parsed with the given profile."""
+        profile = json.dumps([os.path.abspath(path), format_name, custom_regex])
+        name = hashlib.sha1(profile.encode("utf-8")).hexdigest() + ".idx"
+        return cls(os.path.join(cache_dir, INDEX_DIRNAME, name))
+
+    def reset(self) -> None:
+        self.inode = None
+        self.head = None
+        self.covered = 0
+        self.lines = 0
+        # term -> [varint gaps, last offset]
+        self.terms: Dict[str, list] = {}
+
+    @property
+    def exists(self) -> bool:
+        return self.inode is not None
+
+    def load(self) -> None:
+        try:
+            with open(self.index_file, "rb") as f:
+                data = marshal.loads(f.read())  # one read; marshal.load on a file is far slower
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return
+        self.inode = data["inode"]
+        self.head = data["head"]
+        self.covered = data["covered"]
+        self.lines = data["lines"]
+        self.terms = data["terms"]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        self.inode = os.stat(path).st_ino
+        self.head = head_fingerprint(path, self.covered)
+        data = {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "head": self.head,
+            "covered": self.covered,
+            "lines": self.lines,
+            "terms": self.terms,
+        }
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps(data))
+        os.replace(tmp_path, self.index_file)
+
+    def validate(self, path: str) -> bool:
+        """Drop the index if `path` was rotated or truncated since it was built. Returns True if kept."""
+        st = os.stat(path)
+        if (
+            self.inode != st.st_ino
+            or st.st_size < self.covered
+            or head_fingerprint(path, self.covered) != self.head
+        ):
+            self.reset()
+            return False
+        return True
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.index_file)
+        except OSError:
+            return 0
+
+    def build(self, parser: LogParser, path: str) -> int:
+        """Index complete lines appended since the last build. Returns the number of new lines."""
+        if self.exists:
+            self.validate(path)
+        end = complete_lines_end(path, self.covered, os.path.getsize(path))
+
+        new: Dict[str, list] = {}
+        count = 0
+        for offset, entry in parser.iter_offsets(path, self.covered, end):
+            text = "\n".join([str(v) for v in map(entry.get, INDEXED_FIELDS) if v is not None])
+            for term in tokenize(text):
+                posting = new.get(term)
+                if posting is None:
+                    previous = self.terms.get(term)
+                    posting = new[term] = [bytearray(), previous[1] if previous else 0]
+                _put_varint(posting[0], offset - posting[1])
+                posting[1] = offset
+            count += 1
+
+        for term, (gaps, last) in new.items():
+            previous = self.terms.get(term)
+            self.terms[term] = [(previous[0] if previous else b"") + bytes(gaps), last]
+        self.covered = end
+        self.lines += count
+        self.save(path)
+        return count
+
+    def _matching_terms(self, token: str, exact_start: bool, exact_end: bool) -> List[str]:
+        """
+        Terms a keyword token can fall inside. Tokens bounded by non-word
+        characters in the keyword must start/end where the term does.
+        """
+        if exact_start and exact_end:
+            return [token] if token in self.terms else []
+        if exact_start:
+            return [term for term in self.terms if term.startswith(token)]
+        if exact_end:
+            return [term for term in self.terms if term.endswith(token)]
+        return [term for term in self.terms if token in term]
+
+    def _keyword_offsets(self, keyword: str) -> Optional[Set[int]]:
+        """Offsets of lines that may contain `keyword`; None if it has no word characters."""
+        keyword = keyword.lower()
+        spans = [(m.group(), m.start(), m.end()) for m in TOKEN.finditer(keyword)]
+        if not spans:
+            return None
+
+        # Per token, its matching terms and the encoded size of their postings
+        lookups = []
+        for i, (token, start, end) in enumerate(spans):
+            exact_start = i > 0 or start > 0
+            exact_end = i < len(spans) - 1 or end < len(keyword)
+            terms = self._matching_terms(token, exact_start, exact_end)
+            lookups.append((sum(len(self.terms[t][0]) for t in terms), terms))
+
+        # Most selective token first; a token whose postings dwarf the current
+        # candidates is skipped, as candidates are re-checked anyway.
+        lookups.sort(key=lambda lookup: lookup[0])
+        offsets: Optional[Set[int]] = None
+        for encoded_size, terms in lookups:
+            if offsets is not None and encoded_size > 8 * len(offsets):
+                break
+            token_offsets: Set[int] = set()
+            for term in terms:
+                token_offsets.update(decode_postings(self.terms[term][0]))
+            offsets = token_offsets if offsets is None else offsets & token_offsets
+        return offsets
+
+    def candidates(self, matcher: KeywordMatcher) -> Optional[List[int]]:
+        """
+        Ascending offsets of indexed lines that may match `matcher`, or None
+        when the index can't narrow the search (regex keywords, or a keyword
+        with no word characters in any-mode).
+        """
+        if matcher.regex:
+            return None
+        per_keyword: List[Set[int]] = []
+        for keyword in matcher.keywords:
+            offsets = self._keyword_offsets(keyword)
+            if offsets is None:
+                if matcher.match_all:
+                    continue
+                return None
+            per_keyword.append(offsets)
+
+        if not per_keyword:
+            return None
+        if matcher.match_all:
+            result = set.intersection(*per_keyword)
+        else:
+            result = set().union(*per_keyword)
+        return sorted(result)
+
+    def iter_candidates(self, parser: LogParser, path: str, matcher: KeywordMatcher) -> Optional[Iterator[dict]]:
+        """
+        Candidate entries for `matcher`: indexed lines from the posting lists,
+        then every line appended after the index was built. None when the
+        index is missing, stale or can't narrow the search.
+        """
+        if not self.exists or not self.validate(path):
+            return None
+        offsets = self.candidates(matcher)
+        if offsets is None:
+            return None
+        return self._iter_candidates(parser, path, offsets)
+
+    def _iter_candidates(self, parser: LogParser, path: str, offsets: List[int]) -> Iterator[dict]:
+        yield from parser.iter_at(path, offsets)
+        yield from parser.iter_range(path, self.covered)
@@ -0,0 +1,55 @@
+import glob
+import heapq
+import os
+import re
+from operator import itemgetter
+from typing import Iterable, Iterator, List
+
+from .utils.date import entry_epoch
+
+GLOB_CHARS = "*?["
+
+
+def _natural_key(path: str):
+    """Sort key that orders 'access.log.2' before 'access.log.10'."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path)]
+
+
+def expand_inputs(spec: str) -> List[str]:
+    """
+    Resolve a `--file` value into log file paths: a directory yields the
+    (non-hidden) files inside it, a glob pattern the files it matches, and
+    anything else is returned as is.
+    """
+    if os.path.isdir(spec):
+        files = [os.path.join(spec, name) for name in os.listdir(spec) if not name.startswith(".")]
+    elif any(ch in spec for ch in GLOB_CHARS) and not os.path.exists(spec):
+        files = glob.glob(spec)
+    else:
+        return [spec]
+    return sorted((f for f in files if os.path.isfile(f)), key=_natural_key)
+
+
+def _keyed(entries: Iterable[dict]) -> Iterator[tuple]:
+    # Entries without a timestamp keep the position of the previous one
+    last = float("-inf")
+    for entry in entries:
+        ts = entry_epoch(entry)
+        if ts is None:
+            ts = last
+        else:
+            last = ts
+        yield ts, entry
+
+
+def merge_by_time(streams: List[Iterable[dict]]) -> Iterator[dict]:
+    """
+    Lazily k-way merge per-file entry streams (each in time order) by their
+    normalized timestamps. Only one pending entry per stream is held, and
+    ties keep the order of `streams`.
+    """
+    if len(streams) == 1:
+        yield from streams[0]
+        return
+    for _, entry in heapq.merge(*(_keyed(stream) for stream in streams), key=itemgetter(0)):
+        yield entry
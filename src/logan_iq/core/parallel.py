@@ -0,0 +1,219 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compression import decompress_range, is_compressed, split_members
+from .parser import LogParser
+
+# Chunks handed out per worker; more than one keeps the pool busy when
+# some byte ranges parse slower than others.
+CHUNKS_PER_WORKER = 4
+
+# Chunk size when several files share one pool; bounds the entries buffered per file
+STREAM_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def split_file(path: str, chunks: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Split the byte range [start, end) of a file (default: the whole file) into
+    at most `chunks` ranges whose boundaries sit right after a newline.
+    Empty ranges are dropped.
+    """
+    size = os.path.getsize(path)
+    end = size if end is None else min(end, size)
+    span = end - start
+    if span <= 0:
+        return []
+    chunks = max(1, min(chunks, span))
+
+    boundaries = [start]
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            f.seek(start + span * i // chunks)
+            f.readline()  # move to the start of the next line
+            boundaries.append(min(f.tell(), end))
+    boundaries.append(end)
+
+    return [(s, e) for s, e in zip(boundaries, boundaries[1:]) if e > s]
+
+
+def sum_counts(partials: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Merge per-chunk count dicts, keeping first-seen key order."""
+    total: Dict[str, int] = {}
+    for partial in partials:
+        for key, value in partial.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _parse_chunk(parser: LogParser, path: str, start: int, end: int) -> List[dict]:
+    return list(parser.iter_range(path, start, end))
+
+
+def _parse_compressed_chunk(parser: LogParser, path: str, start: int, end: int):
+    """
+    Decompress and parse a run of whole gzip members. Member boundaries don't
+    fall on line boundaries, so the text before the first and after the last
+    newline is returned raw for the parent to join with the neighbouring chunks.
+    """
+    data = decompress_range(path, start, end)
+    first = data.find(b"\n")
+    if first < 0:
+        return data, None, b""
+    last = data.rfind(b"\n")
+    body = data[first + 1:last].split(b"\n") if last > first else []
+    entries = [entry for entry in map(parser.parse_bytes, body) if entry]
+    return data[:first], entries, data[last + 1:]
+
+
+def _iter_compressed_parallel(parser: LogParser, path: str, workers: int) -> Iterator[dict]:
+    ranges = split_members(path, workers * CHUNKS_PER_WORKER) if workers > 1 else None
+    if ranges is None:
+        # Ordinary gzip/bz2/xz streams can only be decompressed front to back
+        yield from parser.iter_file(path)
+        return
+    carry = b""
+    for head, entries, tail in _ordered_results(_parse_compressed_chunk, parser, path, workers, ranges):
+        if entries is None:
+            carry += head
+            continue
+        entry = parser.parse_bytes(carry + head)
+        if entry:
+            yield entry
+        yield from entries
+        carry = tail
+    if carry:
+        entry = parser.parse_bytes(carry)
+        if entry:
+            yield entry
+
+
+def _aggregate_chunk(parser: LogParser, path: str, start: int, end: int, aggregate: Callable):
+    return aggregate(parser.iter_range(path, start, end))
+
+
+def _ordered_results(
+    fn: Callable, parser: LogParser, path: str, workers: int, ranges: List[Tuple[int, int]], *extra
+) -> Iterator:
+    """Run `fn` over every byte range in a process pool and yield results in file order.
+
+    At most `2 * workers` chunks are in flight, so finished chunks are handed
+    to the caller instead of piling up in the parent.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        try:
+            for start, end in ranges:
+                pending.append(pool.submit(fn, parser, path, start, end, *extra))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # The consumer may stop early (e.g. a filter limit was reached); don't parse the rest
+            for future in pending:
+                future.cancel()
+
+
+def iter_file_parallel(
+    parser: LogParser, path: str, workers: int, start: int = 0, end: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Parse `path` across `workers` processes, yielding entries in file order.
+    Compressed files are split on gzip member boundaries when those are
+    recorded in the file (BGZF) and parsed serially otherwise; for plain
+    files only lines starting within [start, end) are parsed.
+    """
+    if is_compressed(path):
+        yield from _iter_compressed_parallel(parser, path, workers)
+        return
+    if workers <= 1:
+        yield from parser.iter_range(path, start, end) if start or end is not None else parser.iter_file(path)
+        return
+    ranges = split_file(path, workers * CHUNKS_PER_WORKER, start, end)
+    for entries in _ordered_results(_parse_chunk, parser, path, workers, ranges):
+        yield from entries
+
+
+def aggregate_parallel(
+    parser: LogParser,
+    path: str,
+    workers: int,
+    aggregate: Callable[[Iterator[dict]], Dict[str, int]],
+    combine: Optional[Callable[[Iterable[Dict[str, int]]], Dict[str, int]]] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Run `aggregate` on each chunk inside the workers and merge the partial
+    results in the parent, so parsed entries never cross process boundaries.
+    Only lines starting within [start, end) are aggregated.
+
+    `aggregate` must be picklable (a module-level function, a bound method or
+    a `functools.partial` of either).
+    """
+    combine = combine or sum_counts
+    if is_compressed(path):
+        # No byte ranges to hand out; aggregate the (possibly parallel) decompressed stream
+        return aggregate(_iter_compressed_parallel(parser, path, workers))
+    if workers <= 1:
+        if start == 0 and end is None:
+            return aggregate(parser.iter_file(path))
+        return aggregate(parser.iter_range(path, start, end))
+    ranges = split_file(path, workers * CHUNKS_PER_WORKER, start, end)
+    return combine(_ordered_results(_aggregate_chunk, parser, path, workers, ranges, aggregate))
+
+
+def _aggregate_file(parser: LogParser, path: str, aggregate: Callable):
+    return aggregate(parser.iter_file(path))
+
+
+def aggregate_files(
+    parser: LogParser,
+    paths: List[str],
+    workers: int,
+    aggregate: Callable[[Iterator[dict]], Dict[str, int]],
+) -> List[Dict[str, int]]:
+    """Run `aggregate` over each whole file, one file per worker process. Returns the partial results."""
+    if workers <= 1 or len(paths) <= 1:
+        return [aggregate(parser.iter_file(path)) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(_aggregate_file, [parser] * len(paths), paths, [aggregate] * len(paths)))
+
+
+def iter_file_chunks(pool: ProcessPoolExecutor, parser: LogParser, path: str, window: int = 2) -> Iterator[dict]:
+    """
+    Parse `path` in fixed-size chunks submitted to a shared `pool`, yielding
+    entries in file order with at most `window` chunks in flight. Used when
+    several files are streamed at once, so each holds a bounded buffer.
+    """
+    if is_compressed(path):
+        yield from parser.iter_file(path)
+        return
+    size = os.path.getsize(path)
+    ranges = split_file(path, max(1, -(-size // STREAM_CHUNK_BYTES)))
+    pending: Deque = deque()
+    try:
+        for start, end in ranges:
+            pending.append(pool.submit(_parse_chunk, parser, path, start, end))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_with_pool(workers: int, build: Callable[[ProcessPoolExecutor], Iterator[dict]]) -> Iterator[dict]:
+    """
+    Yield from the stream `build(pool)` creates. When the stream is exhausted
+    or the consumer stops early, queued chunks are cancelled and the pool is
+    shut down.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from build(pool)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -1,6 +1,13 @@
 import json
+import mmap
+import os
 import re
-from typing import List, Optional, Set
+import stat
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .columns import LogColumns
+from .compression import is_compressed, iter_decompressed_lines
+from .utils.date import EPOCH_FIELD, decode_any, decode_clf, decode_iso
 
 class LogParser:
     """
@@ -25,13 +32,31 @@ class LogParser:
         "json": None,  # Special handling
     }
 
-    def __init__(self, format_name: str = "simple", custom_regex: Optional[str] = None):
+    # Timestamp decoder per format; each returns epoch milliseconds (or None)
+    # and is stored on every entry under EPOCH_FIELD. Custom regexes use decode_any.
+    TIMESTAMP_DECODERS = {
+        "simple": decode_iso,
+        "apache": decode_clf,
+        "nginx": decode_clf,
+        "json": decode_iso,
+    }
+
+    def __init__(
+        self,
+        format_name: str = "simple",
+        custom_regex: Optional[str] = None,
+        prefilter: Optional[Callable[[bytes], bool]] = None,
+    ):
         """
         Args:
             format_name: predefined format or "custom"
             custom_regex: raw regex if using custom format
+            prefilter: cheap check on each raw line; lines it rejects are
+                skipped without being decoded (see `RawPrefilter`)
         """
         self.format_name = format_name.lower()
+        self.prefilter = prefilter
+        self.decode_timestamp = self.TIMESTAMP_DECODERS.get(self.format_name, decode_any)
 
         if self.format_name == "custom":
             if not custom_regex:
@@ -48,6 +73,13 @@ class LogParser:
                 f"Unsupported format '{format_name}'. Supported: {list(self.AVAILABLE_FORMATS.keys()) + ['custom']}"
             )
 
+    @property
+    def fields(self) -> Optional[List[str]]:
+        """Field names every parsed entry has (the regex's named groups), or None for JSON logs."""
+        if self.format_name == "json":
+            return None
+        return list(self.pattern.groupindex)
+
     def _parse_json_line(self, line: str) -> Optional[dict]:
         """Parse a JSON log line; returns dict if valid, else None."""
         try:
@@ -67,26 +99,113 @@ class LogParser:
             return None
 
         if self.format_name == "json":
-            return self._parse_json_line(line)
+            data = self._parse_json_line(line)
+        else:
+            match = self.pattern.match(line)
+            data = match.groupdict() if match else None
 
-        match = self.pattern.match(line)
-        return match.groupdict() if match else None
+        if data is not None:
+            data[EPOCH_FIELD] = self.decode_timestamp(data.get("datetime"))
+        return data
 
-    def parse_file(self, path: str) -> List[dict]:
-        """Parse all lines in a file and return a list of dicts."""
-        parsed_entries: List[dict] = []
+    def parse_bytes(self, line: bytes) -> Optional[dict]:
+        """
+        Parse a single raw (undecoded) line. Invalid UTF-8 is replaced per line
+        instead of raising, so one bad byte cannot end a file scan early.
+        Lines the prefilter rejects are skipped like unparsable ones.
+        """
+        if self.prefilter is not None and not self.prefilter(line):
+            return None
+        return self.parse_line(line.decode("utf-8", "replace"))
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    parsed = self.parse_line(line)
+    def iter_offsets(self, path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, dict]]:
+        """
+        Parse the lines that begin within the byte range [start, end), yielding
+        (line start offset, entry) for each successfully parsed line.
+
+        `start` must sit on a line boundary; the line straddling `end` is parsed
+        by this range, so consecutive ranges never share or drop a line.
+        Regular files are memory-mapped and scanned as bytes, letting the OS
+        page cache do the buffering.
+        """
+        parse_bytes = self.parse_bytes
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if not stat.S_ISREG(st.st_mode):
+                # Pipes and other streams cannot be mapped; read them line by line
+                if start:
+                    f.seek(start)
+                pos = start
+                for raw in f:
+                    if end is not None and pos >= end:
+                        break
+                    parsed = parse_bytes(raw)
+                    if parsed:
+                        yield pos, parsed
+                    pos += len(raw)
+                return
+
+            size = st.st_size
+            end = size if end is None else min(end, size)
+            if start >= end:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(start)
+                readline = mm.readline
+                pos = start
+                while pos < end:
+                    raw = readline()
+                    parsed = parse_bytes(raw)
                     if parsed:
-                        parsed_entries.append(parsed)
+                        yield pos, parsed
+                    pos += len(raw)
+
+    def iter_at(self, path: str, offsets: Iterable[int]) -> Iterator[dict]:
+        """Parse only the lines starting at the given byte offsets (e.g. from an index)."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                parse_bytes = self.parse_bytes
+                for offset in offsets:
+                    mm.seek(offset)
+                    parsed = parse_bytes(mm.readline())
+                    if parsed:
+                        yield parsed
+
+    def iter_range(self, path: str, start: int = 0, end: Optional[int] = None) -> Iterator[dict]:
+        """Parse the lines that begin within the byte range [start, end); see `iter_offsets`."""
+        for _, parsed in self.iter_offsets(path, start, end):
+            yield parsed
+
+    def iter_compressed(self, path: str) -> Iterator[dict]:
+        """Parse a gzip/bz2/xz file, decompressed on a background thread as it is read."""
+        parse_bytes = self.parse_bytes
+        for raw in iter_decompressed_lines(path):
+            parsed = parse_bytes(raw)
+            if parsed:
+                yield parsed
+
+    def iter_file(self, path: str) -> Iterator[dict]:
+        """
+        Lazily parse a file, yielding one dict per successfully parsed line.
+        Compressed files (detected by their magic bytes) are decompressed on the fly.
+        """
+        try:
+            if is_compressed(path):
+                yield from self.iter_compressed(path)
+            else:
+                yield from self.iter_range(path)
         except FileNotFoundError:
             print(f"[ERROR] File not found: {path}")
         except IOError as e:
             print(f"[ERROR] IO error: {e}")
-        except UnicodeDecodeError as e:
-            print(f"[ERROR] File encoding error: {e}")
 
-        return parsed_entries
+    def parse_file(self, path: str) -> List[dict]:
+        """Parse all lines in a file and return a list of dicts."""
+        return list(self.iter_file(path))
+
+    def parse_columns(self, path: str) -> LogColumns:
+        """Parse all lines in a file into a compact `LogColumns` container."""
+        return LogColumns.from_entries(self.iter_file(path))
@@ -0,0 +1,140 @@
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from .search import KeywordMatcher
+
+_ISO_DATE = re.compile(rb"\d{4}-\d\d-\d\d")
+_LETTER_RUNS = re.compile(r"([a-z]+)")
+# Characters of str() of a non-string JSON value outside its strings, besides
+# the words below: brackets, separators and number characters
+_REPR_PUNCTUATION = re.compile(r"[\[\]{}:, .+\-\d]*")
+_REPR_WORDS = ("true", "false", "none", "inf", "nan", "e")
+
+
+def _in_value_repr(keyword: str) -> bool:
+    """
+    Whether `keyword` could occur in str() of a non-string JSON value (a
+    number, boolean, array or object) without occurring in the raw line,
+    e.g. "True" for `true`, "1000.0" for `1e3` or "', '" for `["a","b"]`.
+    """
+    parts = _LETTER_RUNS.split(keyword.lower())
+    if not all(_REPR_PUNCTUATION.fullmatch(part) for part in parts[::2]):
+        return False
+    words = parts[1::2]
+    for i, word in enumerate(words):
+        open_start = i == 0 and not parts[0]
+        open_end = i == len(words) - 1 and not parts[-1]
+        if open_start and open_end:
+            fits = any(word in w for w in _REPR_WORDS)
+        elif open_start:
+            fits = any(w.endswith(word) for w in _REPR_WORDS)
+        elif open_end:
+            fits = any(w.startswith(word) for w in _REPR_WORDS)
+        else:
+            fits = word in _REPR_WORDS
+        if not fits:
+            return False
+    return True
+
+
+def _checkable(keyword: str, case_sensitive: bool, json_format: bool) -> bool:
+    """Whether a line without `keyword` in its raw bytes can't match it."""
+    if "\n" in keyword:  # may span the fields joined into a JSON haystack
+        return False
+    if not case_sensitive and not keyword.isascii():
+        return False  # bytes.lower() only folds ASCII
+    if json_format:
+        # str() of JSON strings inside arrays and objects adds quotes
+        return not any(c in keyword for c in "'\"\\") and not _in_value_repr(keyword)
+    return True
+
+
+class RawPrefilter:
+    """
+    Cheap checks on a raw line that every entry passing the filters must
+    satisfy: it contains the level token, the IP and the search keywords,
+    and for the simple format its date prefix is within a day of the range.
+
+    A line failing them is skipped before the regex or `json.loads` runs.
+    Survivors are parsed and filtered as usual, so the checks only need to
+    be necessary, never sufficient: anything they can't decide on bytes
+    (JSON escapes, non-ASCII text under case folding, regex keywords)
+    passes through. Instances are picklable for worker processes.
+    """
+
+    def __init__(
+        self,
+        format_name: str,
+        level: Optional[str] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+        search: Optional[KeywordMatcher] = None,
+        ip: Optional[str] = None,
+    ) -> None:
+        self.json = format_name == "json"
+        # Tokens that must all occur, as they are and lowercased
+        self.exact: List[bytes] = []
+        self.folded: List[bytes] = []
+        # Keywords of an any-mode search, at least one of which must occur
+        self.any_of: List[bytes] = []
+        self.any_folded = False
+        self.date_bounds: Optional[Tuple[bytes, bytes]] = None
+
+        if level and level.isascii():
+            token = level.lower().encode()
+            self.folded.append(b"[" + token + b"]" if format_name == "simple" else token)
+        if ip:
+            self.exact.append(ip.encode())
+        if search and not search.regex:
+            case_sensitive = search.case_sensitive
+            checkable = [k for k in search.keywords if _checkable(k, case_sensitive, self.json)]
+            tokens = [k.encode() if case_sensitive else k.lower().encode() for k in checkable]
+            if search.match_all:
+                # Each keyword is a necessary condition on its own
+                (self.exact if case_sensitive else self.folded).extend(tokens)
+            elif len(checkable) == len(search.keywords):
+                self.any_of = tokens
+                self.any_folded = not case_sensitive
+        if date_range and format_name == "simple":
+            # A day of margin either way covers timestamps with UTC offsets
+            start, end = date_range
+            self.date_bounds = (
+                (start - timedelta(days=1)).strftime("%Y-%m-%d").encode(),
+                (end + timedelta(days=1)).strftime("%Y-%m-%d").encode(),
+            )
+        # Whether the line has to be lowercased for any check
+        self.fold = bool(self.folded or (self.any_of and self.any_folded))
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.folded or self.any_of or self.date_bounds)
+
+    def __call__(self, raw: bytes) -> bool:
+        if self.date_bounds is not None and _ISO_DATE.match(raw):
+            day = raw[:10]
+            if day < self.date_bounds[0] or day > self.date_bounds[1]:
+                return False
+        for token in self.exact:
+            if token not in raw:
+                return self._undecided(raw, False)
+        if not self.fold:
+            lowered = raw
+        else:
+            lowered = raw.lower()
+            for token in self.folded:
+                if token not in lowered:
+                    return self._undecided(raw, True)
+        if self.any_of:
+            haystack = lowered if self.any_folded else raw
+            for token in self.any_of:
+                if token in haystack:
+                    return True
+            return self._undecided(raw, self.any_folded)
+        return True
+
+    def _undecided(self, raw: bytes, folded: bool) -> bool:
+        """Whether a line that lacks a token could still match once decoded."""
+        if folded and not raw.isascii():
+            # Unicode case folding can map non-ASCII characters onto ASCII ones
+            return True
+        # Escaped JSON text only shows its real value once decoded
+        return self.json and b"\\" in raw
@@ -0,0 +1,91 @@
+import re
+from typing import Iterable, List, Optional, Sequence, Union
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex source matching any of `words`, factored by common prefix
+    ("error|errno" becomes "err(?:or|no)"), so a search only follows the
+    branches that agree with the text instead of trying every word in turn.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        if "" in node:
+            # A word ends here; longer words sharing this prefix can't change whether the text matches
+            return ""
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Match text against many keywords in one scan.
+
+    Any-mode (the default) compiles every keyword into a single regex, so the
+    cost stays roughly flat as keywords are added. All-mode with plain
+    keywords folds the text's case once and runs one substring test per
+    keyword; with `regex=True` each keyword is a pattern of its own.
+    """
+
+    def __init__(
+        self,
+        keywords: Union[str, Sequence[str]],
+        match_all: bool = False,
+        regex: bool = False,
+        case_sensitive: bool = False,
+    ) -> None:
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self.match_all = match_all
+        self.regex = regex
+        self.case_sensitive = case_sensitive
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._patterns: List[re.Pattern] = []
+        self._literals: List[str] = []
+        self._any: Optional[re.Pattern] = None
+        try:
+            if not match_all:
+                if regex:
+                    source = "|".join(f"(?:{k})" for k in self.keywords)
+                else:
+                    words = self.keywords if case_sensitive else {k.lower() for k in self.keywords}
+                    source = _trie_pattern(words)
+                self._any = re.compile(source, flags)
+            elif regex:
+                self._patterns = [re.compile(k, flags) for k in self.keywords]
+            else:
+                self._literals = self.keywords if case_sensitive else [k.lower() for k in self.keywords]
+        except re.error as e:
+            raise ValueError(f"Invalid search pattern: {e}") from e
+
+    @classmethod
+    def coerce(cls, search) -> Optional["KeywordMatcher"]:
+        """Accept a matcher, a keyword or a list of keywords; None when there is nothing to match."""
+        if not search:
+            return None
+        matcher = search if isinstance(search, cls) else cls(search)
+        return matcher if matcher.keywords else None
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def matches(self, text: str) -> bool:
+        if self._any is not None:
+            return self._any.search(text) is not None
+        if self._patterns:
+            return all(p.search(text) for p in self._patterns)
+        if not self.case_sensitive:
+            text = text.lower()
+        return all(k in text for k in self._literals)
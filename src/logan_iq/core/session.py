@@ -0,0 +1,97 @@
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .columns import LogColumns
+
+DEFAULT_SESSION_BYTES = 1024 * 1024 * 1024
+
+
+class SessionCache:
+    """
+    In-memory cache of parsed files for one interactive session.
+
+    Files are kept as `LogColumns`, keyed by the file's identity (path,
+    inode, size, mtime) and the parser profile, so an edited file or a
+    different format misses. The least recently used files are dropped once
+    the columns together exceed `max_bytes`; files larger than that on disk,
+    or whose columns turned out larger while loading, are not loaded again.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_SESSION_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._files: "OrderedDict[tuple, Tuple[LogColumns, int]]" = OrderedDict()
+        self.nbytes = 0
+        self._rejected: Set[tuple] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str, format_name: str, custom_regex: Optional[str] = None) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), st.st_ino, st.st_size, st.st_mtime_ns, format_name, custom_regex
+
+    def admits(self, key: Optional[tuple]) -> bool:
+        """Whether the file under `key` may fit and is worth loading into the session."""
+        return key is not None and key[2] <= self.max_bytes and key not in self._rejected
+
+    def reject(self, key: tuple) -> None:
+        """Remember that the file under `key` doesn't fit, so it isn't loaded again."""
+        self._rejected.add(key)
+
+    def get(self, key: Optional[tuple]) -> Optional["LogColumns"]:
+        entry = self._files.get(key) if key is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._files.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Optional[tuple], columns: "LogColumns") -> bool:
+        """Keep `columns` under `key`, evicting least recently used files. False if it doesn't fit at all."""
+        if key is None:
+            return False
+        self.discard(key)
+        size = columns.nbytes()
+        if size > self.max_bytes:
+            return False
+        # Older versions of the same file can no longer be hit
+        for stale in [k for k in self._files if k[0] == key[0] and k[4:] == key[4:]]:
+            self.discard(stale)
+        while self._files and self.nbytes + size > self.max_bytes:
+            _, (_, evicted) = self._files.popitem(last=False)
+            self.nbytes -= evicted
+        self._files[key] = (columns, size)
+        self.nbytes += size
+        return True
+
+    def discard(self, key: tuple) -> None:
+        entry = self._files.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def clear(self) -> None:
+        self._files.clear()
+        self._rejected.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+_session: Optional[SessionCache] = None
+
+
+def set_session(session: Optional[SessionCache]) -> None:
+    """Install (or with None, remove) the session cache used by analyzers created afterwards."""
+    global _session
+    _session = session
+
+
+def get_session() -> Optional[SessionCache]:
+    return _session
@@ -0,0 +1,431 @@
+import base64
+import heapq
+import json
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .utils.hashing import stable_hash64
+
+SKETCH_VERSION = 1
+
+DEFAULT_ERROR = 0.01
+DEFAULT_DELTA = 0.01
+# Count-Min overcount bound, as a fraction of all counted items
+DEFAULT_TOP_ERROR = 0.001
+DEFAULT_TOP_K = 10
+# Bins kept by a quantile sketch; the lowest bins are collapsed past this
+MAX_QUANTILE_BINS = 2048
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"))
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimate in fixed memory.
+
+    `error` is the target relative standard error (1.04 / sqrt(registers));
+    0.01 uses 16 KiB of registers whatever the number of distinct values.
+    """
+
+    def __init__(self, error: float = DEFAULT_ERROR, precision: Optional[int] = None) -> None:
+        if precision is None:
+            if not 0 < error < 1:
+                raise ValueError("error must be between 0 and 1")
+            precision = math.ceil(math.log2((1.04 / error) ** 2))
+        self.precision = max(4, min(18, precision))
+        self.registers = bytearray(1 << self.precision)
+
+    def add(self, value: str) -> None:
+        self.add_hash(stable_hash64(value))
+
+    def add_hash(self, h: int) -> None:
+        """Add a value by its `stable_hash64`, e.g. one already computed for another sketch."""
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range correction: linear counting
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "registers": _encode(bytes(self.registers))}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(precision=data["precision"])
+        sketch.registers = bytearray(_decode(data["registers"]))
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Frequency estimate in fixed memory. Estimates never undercount, and
+    overcount by at most `error` * total with probability 1 - `delta`.
+    """
+
+    def __init__(self, error: float = DEFAULT_TOP_ERROR, delta: float = DEFAULT_DELTA,
+                 width: Optional[int] = None, depth: Optional[int] = None) -> None:
+        if width is None or depth is None:
+            if not 0 < error < 1 or not 0 < delta < 1:
+                raise ValueError("error and delta must be between 0 and 1")
+            width = math.ceil(math.e / error)
+            depth = math.ceil(math.log(1 / delta))
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _positions(self, h: int) -> List[int]:
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, item: str, count: int = 1, h: Optional[int] = None) -> int:
+        """Add `count` occurrences of `item` and return its new estimate. `h` is its `stable_hash64`, if known."""
+        self.total += count
+        estimate = None
+        for row, pos in zip(self.rows, self._positions(stable_hash64(item) if h is None else h)):
+            value = row[pos] = row[pos] + count
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[pos] for row, pos in zip(self.rows, self._positions(stable_hash64(item))))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different dimensions")
+        for mine, theirs in zip(self.rows, other.rows):
+            for i, value in enumerate(theirs):
+                if value:
+                    mine[i] += value
+        self.total += other.total
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "rows": [_encode(row.tobytes()) for row in self.rows],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        sketch = cls(width=data["width"], depth=data["depth"])
+        sketch.total = data["total"]
+        for row, encoded in zip(sketch.rows, data["rows"]):
+            row[:] = array("q", _decode(encoded))
+        return sketch
+
+
+class TopK:
+    """
+    Approximate heaviest hitters: a Count-Min sketch for frequencies and a
+    min-heap of the `k` items with the largest estimates seen so far.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_K, error: float = DEFAULT_TOP_ERROR, delta: float = DEFAULT_DELTA,
+                 counts: Optional[CountMinSketch] = None) -> None:
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.counts = counts if counts is not None else CountMinSketch(error, delta)
+        self.top: Dict[str, int] = {}
+        # (estimate, item); entries whose estimate is outdated are skipped lazily
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1, h: Optional[int] = None) -> None:
+        estimate = self.counts.add(item, count, h)
+        top = self.top
+        if item in top:
+            top[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+            if len(self._heap) > 4 * self.k:
+                self._heap = [(v, i) for i, v in top.items()]
+                heapq.heapify(self._heap)
+        elif len(top) < self.k:
+            top[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+        else:
+            heap = self._heap
+            while heap[0][0] != top.get(heap[0][1]):
+                heapq.heappop(heap)
+            if estimate > heap[0][0]:
+                _, evicted = heapq.heapreplace(heap, (estimate, item))
+                del top[evicted]
+                top[item] = estimate
+
+    def _rebuild(self, candidates: Iterable[str]) -> None:
+        ranked = sorted(((self.counts.estimate(c), c) for c in set(candidates)), key=lambda e: (-e[0], e[1]))
+        self.top = {item: estimate for estimate, item in ranked[:self.k]}
+        self._heap = [(v, i) for i, v in self.top.items()]
+        heapq.heapify(self._heap)
+
+    def items(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Items by descending estimated count."""
+        ranked = sorted(self.top.items(), key=lambda item: (-item[1], item[0]))
+        return ranked if n is None else ranked[:n]
+
+    def merge(self, other: "TopK") -> "TopK":
+        self.counts.merge(other.counts)
+        self.k = max(self.k, other.k)
+        self._rebuild(list(self.top) + list(other.top))
+        return self
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "counts": self.counts.to_dict(), "top": sorted(self.top)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TopK":
+        sketch = cls(data["k"], counts=CountMinSketch.from_dict(data["counts"]))
+        sketch._rebuild(data["top"])
+        return sketch
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile estimate with relative error (DDSketch-style).
+
+    Values fall into logarithmic bins of ratio (1 + error) / (1 - error), so
+    any quantile is returned within `error` of the true value relative to it.
+    Past `max_bins`, the lowest bins are collapsed, which only affects the
+    accuracy of the smallest values.
+    """
+
+    def __init__(self, error: float = DEFAULT_ERROR, max_bins: int = MAX_QUANTILE_BINS) -> None:
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.error = error
+        self.max_bins = max_bins
+        self._log_gamma = math.log((1 + error) / (1 - error))
+        self.bins: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of the bin's range
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma ** key / (gamma + 1)
+
+    def add(self, value: float) -> None:
+        if not math.isfinite(value):
+            raise ValueError(f"can't add {value} to a quantile sketch")
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value > 0:
+            bins = self.bins
+        elif value < 0:
+            bins, value = self.negative, -value
+        else:
+            self.zeros += 1
+            return
+        key = self._key(value)
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self.max_bins:
+            self._collapse(bins)
+
+    def _collapse(self, bins: Dict[int, int]) -> None:
+        keys = sorted(bins)
+        excess = keys[:len(bins) - self.max_bins + 1]
+        bins[excess[-1]] += sum(bins.pop(k) for k in excess[:-1])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile `q` (0..1), or None when empty."""
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(self.min, -self._value(key))
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return min(self.max, self._value(key))
+        return self.max
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.error != self.error:
+            raise ValueError("Cannot merge quantile sketches of different accuracy")
+        for mine, theirs in ((self.bins, other.bins), (self.negative, other.negative)):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+            while len(mine) > self.max_bins:
+                self._collapse(mine)
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "error": self.error,
+            "max_bins": self.max_bins,
+            "bins": sorted(self.bins.items()),
+            "negative": sorted(self.negative.items()),
+            "zeros": self.zeros,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["error"], data["max_bins"])
+        sketch.bins = {key: n for key, n in data["bins"]}
+        sketch.negative = {key: n for key, n in data["negative"]}
+        sketch.zeros = data["zeros"]
+        sketch.count = data["count"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+
+class SketchSummary:
+    """
+    Approximate per-field aggregations in bounded memory: distinct counts
+    (HyperLogLog) and quantiles of numeric fields within relative `error`, and
+    heaviest values (Count-Min + heap) overcounting by at most `top_error` of
+    the entries. Summaries over different files, or made on different machines and
+    saved with `save`, merge into the summary of all of them.
+    """
+
+    def __init__(
+        self,
+        distinct: Sequence[str] = ("ip",),
+        top: Sequence[str] = ("path",),
+        quantiles: Sequence[str] = ("size",),
+        error: float = DEFAULT_ERROR,
+        k: int = DEFAULT_TOP_K,
+        top_error: float = DEFAULT_TOP_ERROR,
+    ) -> None:
+        self.error = error
+        self.top_error = top_error
+        self.total = 0
+        self.distinct = {field: HyperLogLog(error) for field in distinct}
+        self.top = {field: TopK(k, top_error) for field in top}
+        self.quantiles = {field: QuantileSketch(error) for field in quantiles}
+
+    def update(self, entries: Iterable[dict]) -> "SketchSummary":
+        # Per field, the sketches its value goes to; a value is hashed once for all of them
+        hashed = [
+            (field, self.distinct[field].add_hash if field in self.distinct else None,
+             self.top[field].add if field in self.top else None)
+            for field in dict.fromkeys([*self.distinct, *self.top])
+        ]
+        quantiles = [(field, sketch.add) for field, sketch in self.quantiles.items()]
+        total = 0
+        for entry in entries:
+            total += 1
+            get = entry.get
+            for field, add_distinct, add_top in hashed:
+                value = get(field)
+                if value is not None:
+                    value = str(value)
+                    h = stable_hash64(value)
+                    if add_distinct is not None:
+                        add_distinct(h)
+                    if add_top is not None:
+                        add_top(value, 1, h)
+            for field, add in quantiles:
+                value = get(field)
+                if value is not None:
+                    try:
+                        add(float(value))
+                    except (TypeError, ValueError, OverflowError):  # "-" for empty responses, inf, nan
+                        pass
+        self.total += total
+        return self
+
+    def merge(self, other: "SketchSummary") -> "SketchSummary":
+        self.total += other.total
+        for mine, theirs in ((self.distinct, other.distinct), (self.top, other.top), (self.quantiles, other.quantiles)):
+            for field, sketch in theirs.items():
+                if field in mine:
+                    mine[field].merge(sketch)
+                else:
+                    mine[field] = sketch
+        return self
+
+    @classmethod
+    def merge_all(cls, partials: Iterable["SketchSummary"]) -> "SketchSummary":
+        partials = iter(partials)
+        result = next(partials, None)
+        if result is None:
+            return cls()
+        for partial in partials:
+            result.merge(partial)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "version": SKETCH_VERSION,
+            "error": self.error,
+            "top_error": self.top_error,
+            "total": self.total,
+            "distinct": {field: s.to_dict() for field, s in self.distinct.items()},
+            "top": {field: s.to_dict() for field, s in self.top.items()},
+            "quantiles": {field: s.to_dict() for field, s in self.quantiles.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SketchSummary":
+        if data.get("version") != SKETCH_VERSION:
+            raise ValueError("Unsupported sketch file version")
+        summary = cls((), (), (), data["error"], top_error=data["top_error"])
+        summary.total = data["total"]
+        summary.distinct = {f: HyperLogLog.from_dict(s) for f, s in data["distinct"].items()}
+        summary.top = {f: TopK.from_dict(s) for f, s in data["top"].items()}
+        summary.quantiles = {f: QuantileSketch.from_dict(s) for f, s in data["quantiles"].items()}
+        return summary
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "SketchSummary":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
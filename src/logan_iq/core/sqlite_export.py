@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from .checkpoint import head_fingerprint
+from .utils.date import EPOCH_FIELD
+
+# Columns stored as INTEGER; SQLite's type affinity converts the parsed digit strings on insert
+INTEGER_FIELDS = {"status", "status_code", "size"}
+# Columns indexed after a load, when the table has them
+INDEXED_COLUMNS = ("datetime", "level", "status", "epoch_ms")
+# Columns of the JSON format; other keys of an entry are kept as a JSON object in `extra`
+JSON_COLUMNS = ("datetime", "level", "message")
+
+SOURCES_TABLE = "logan_iq_sources"
+# Offset recorded for a compressed source that a limit stopped part way through
+PARTIAL = -1
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteExporter:
+    """
+    Bulk-load parsed entries into a typed SQLite table.
+
+    The table has one column per field of the format (the regex's named
+    groups), plus `epoch_ms` with the normalized timestamp. A whole export is
+    one transaction: rows stream through `executemany` with synchronous
+    writes off, and the datetime/level/status/epoch indexes are built once
+    the rows are in.
+
+    For `--append`, the byte offset reached in each source file is kept in
+    the `logan_iq_sources` table, so the next export only loads lines
+    appended since. Rotated or truncated files are loaded from the start.
+    An archive that `--limit` cut short has no offset to resume from, so
+    appending to its table is refused.
+    """
+
+    def __init__(self, db_path: str, table: str, fields: Optional[List[str]]) -> None:
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid table name '{table}'")
+        self.db_path = db_path
+        self.table = table
+        self.fields = [f for f in fields if f != EPOCH_FIELD] if fields is not None else None
+        self.columns: List[Tuple[str, str]] = [
+            (f, "INTEGER" if f in INTEGER_FIELDS else "TEXT") for f in (self.fields or JSON_COLUMNS)
+        ]
+        if self.fields is None:
+            self.columns.append(("extra", "TEXT"))
+        self.columns.append(("epoch_ms", "INTEGER"))
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "SqliteExporter":
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            self.conn.close()
+            self.conn = None
+
+    def prepare(self, append: bool = False) -> None:
+        """Create the table (replacing an existing one unless `append`) and the sources table."""
+        conn = self.conn
+        self._begin()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {SOURCES_TABLE} "
+            "(tbl TEXT, path TEXT, inode INTEGER, offset INTEGER, head INTEGER, PRIMARY KEY (tbl, path))"
+        )
+        if not append:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(self.table)}")
+            conn.execute(f"DELETE FROM {SOURCES_TABLE} WHERE tbl = ?", (self.table,))
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(self.table)})")]
+        if existing:
+            if existing != [name for name, _ in self.columns]:
+                raise ValueError(f"Table '{self.table}' has different columns; export without --append to replace it")
+            return
+        columns = ", ".join(f"{_quote(name)} {kind}" for name, kind in self.columns)
+        conn.execute(f"CREATE TABLE {_quote(self.table)} ({columns})")
+
+    def resume_offset(self, path: str) -> int:
+        """Offset up to which `path` was already loaded into the table, or 0."""
+        row = self.conn.execute(
+            f"SELECT inode, offset, head FROM {SOURCES_TABLE} WHERE tbl = ? AND path = ?",
+            (self.table, os.path.abspath(path)),
+        ).fetchone()
+        if row is None:
+            return 0
+        inode, offset, head = row
+        if offset == PARTIAL:
+            raise ValueError(
+                f"'{path}' was only partly loaded into '{self.table}' (--limit); export without --append to reload it"
+            )
+        st = os.stat(path)
+        if inode != st.st_ino or st.st_size < offset or head_fingerprint(path, offset) != head:
+            return 0
+        return offset
+
+    def mark(self, path: str, offset: int) -> None:
+        """Record that `path` has been loaded up to `offset`."""
+        self._begin()
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?, ?, ?)",
+            (self.table, os.path.abspath(path), os.stat(path).st_ino, offset, head_fingerprint(path, offset)),
+        )
+
+    def mark_partial(self, path: str) -> None:
+        """Record that only part of `path` was loaded, at no offset the next export could resume from."""
+        self._begin()
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?, ?, ?)",
+            (self.table, os.path.abspath(path), os.stat(path).st_ino, PARTIAL, 0),
+        )
+
+    def _rows(self, entries: Iterable[dict]) -> Iterable[tuple]:
+        if self.fields is not None:
+            keys = self.fields + [EPOCH_FIELD]
+            for entry in entries:
+                yield tuple(map(entry.get, keys))
+            return
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+        skip = set(JSON_COLUMNS) | {EPOCH_FIELD}
+        for entry in entries:
+            get = entry.get
+            extra = {k: v for k, v in entry.items() if k not in skip}
+            yield (
+                *(v if v is None or isinstance(v, (int, float)) else str(v) for v in map(get, JSON_COLUMNS)),
+                encode(extra) if extra else None,
+                get(EPOCH_FIELD),
+            )
+
+    def _begin(self) -> None:
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+    def insert(self, entries: Iterable[dict]) -> int:
+        """Insert `entries` with one streaming `executemany`. Returns the number inserted."""
+        self._begin()
+        before = self.conn.total_changes
+        sql = f"INSERT INTO {_quote(self.table)} VALUES ({', '.join('?' * len(self.columns))})"
+        self.conn.executemany(sql, self._rows(entries))
+        return self.conn.total_changes - before
+
+    def finish(self) -> None:
+        """Build the indexes and commit the whole export."""
+        conn = self.conn
+        self._begin()
+        names = {name for name, _ in self.columns}
+        for column in INDEXED_COLUMNS:
+            if column in names:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{self.table}_{column}')} "
+                    f"ON {_quote(self.table)} ({_quote(column)})"
+                )
+        conn.execute("COMMIT")
@@ -0,0 +1,292 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Entries pulled per timed step of an instrumented iterator
+BATCH = 256
+# One in this many lines has its parsing timed; the rest are only counted
+SAMPLE_EVERY = 16
+
+_now = time.perf_counter
+_cpu = time.process_time
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB, or None where it's unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and the BSDs KiB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class _Timed:
+    """Iterator that pulls `BATCH` entries at a time from `it`, timing each pull as stage `name`."""
+
+    __slots__ = ("stats", "name", "it", "buf", "pos")
+
+    def __init__(self, stats: "RunStats", name: str, it: Iterator[dict]) -> None:
+        self.stats = stats
+        self.name = name
+        self.it = it
+        self.buf: List[dict] = []
+        self.pos = 0
+
+    def __iter__(self) -> "_Timed":
+        return self
+
+    def __next__(self) -> dict:
+        if self.pos == len(self.buf):
+            stats = self.stats
+            stats._push()
+            try:
+                self.buf = list(islice(self.it, BATCH))
+            finally:
+                stats._pop(self.name, len(self.buf))
+            self.pos = 0
+            if not self.buf:
+                raise StopIteration
+        item = self.buf[self.pos]
+        self.pos += 1
+        return item
+
+
+class RunStats:
+    """
+    Per-stage wall and CPU time, line counts and peak memory of one run.
+
+    Stages nest: time spent in a stage while another is running is taken
+    out of the outer one, so the stages of a run add up to its total.
+    Iterators are timed a batch at a time (`timed`) and blocks of work with
+    `stage`; parsing is broken down further by sampling every
+    `SAMPLE_EVERY`th line once `instrument_parser` has hooked the parser.
+    Nothing is hooked or timed unless a `RunStats` is handed to the
+    analyzer, so runs without one pay nothing.
+
+    With `trace_memory`, the peak of Python allocations is traced with
+    tracemalloc as well; that makes the run several times slower, so the
+    timings of such a run are not representative.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, List[float]] = {}  # name -> [wall, cpu, items]
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory: Optional[int] = None
+        self.peak_rss_kb: Optional[int] = None
+        self.format_name: Optional[str] = None
+        self.lines_rejected = 0
+        self.lines_prefiltered = 0
+        self.bytes_read = 0
+        # name -> [calls, sampled calls, sampled wall]
+        self.samples: Dict[str, List[float]] = {}
+        self._stack: List[List[float]] = []
+
+    # -- timing --------------------------------------------------------------
+
+    def _push(self) -> None:
+        self._stack.append([_now(), _cpu(), 0.0, 0.0])
+
+    def _pop(self, name: str, items: int = 0) -> None:
+        wall0, cpu0, child_wall, child_cpu = self._stack.pop()
+        wall, cpu = _now() - wall0, _cpu() - cpu0
+        stage = self.stages.setdefault(name, [0.0, 0.0, 0])
+        stage[0] += wall - child_wall
+        stage[1] += cpu - child_cpu
+        stage[2] += items
+        if self._stack:
+            self._stack[-1][2] += wall
+            self._stack[-1][3] += cpu
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as stage `name`."""
+        self._push()
+        try:
+            yield
+        finally:
+            self._pop(name)
+
+    def timed(self, name: str, logs: Iterable[dict]) -> Iterable[dict]:
+        """
+        Time producing the entries of `logs` as stage `name`, counting them.
+        Materialized containers (lists, `LogColumns`) and iterators that are
+        already timed are returned as they are.
+        """
+        if isinstance(logs, _Timed) or iter(logs) is not logs:
+            return logs
+        return _Timed(self, name, logs)
+
+    @contextmanager
+    def run(self):
+        """Measure a whole run: total time, peak traced memory and peak RSS."""
+        started = not tracemalloc.is_tracing() if self.trace_memory else False
+        if started:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall0, cpu0 = _now(), _cpu()
+        try:
+            yield self
+        finally:
+            self.wall += _now() - wall0
+            self.cpu += _cpu() - cpu0
+            if self.trace_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started:
+                    tracemalloc.stop()
+            self.peak_rss_kb = peak_rss_kb()
+
+    # -- parser hooks --------------------------------------------------------
+
+    def instrument_parser(self, parser) -> None:
+        """
+        Count the lines and bytes `parser` reads, the lines its prefilter
+        skips and the lines it can't parse, and
+        time every `SAMPLE_EVERY`th call of its line and timestamp decoding.
+        The hooks are instance attributes, so only this parser is affected;
+        they can't be pickled, so don't hand it to worker processes.
+        """
+        self.format_name = parser.format_name
+        parse_bytes, decode_timestamp = parser.parse_bytes, parser.decode_timestamp
+        line_sample = self.samples.setdefault("decode", [0, 0, 0.0])
+        time_sample = self.samples.setdefault("timestamps", [0, 0, 0.0])
+
+        def sampled(func: Callable, sample: List[float], phase: int) -> Callable:
+            # Wall clock only: reading the CPU clock per call would cost more than the calls
+            def call(value):
+                sample[0] += 1
+                if sample[0] % SAMPLE_EVERY != phase:
+                    return func(value)
+                started = _now()
+                result = func(value)
+                sample[1] += 1
+                sample[2] += _now() - started
+                return result
+            return call
+
+        # Different phases, so a timed line decode never contains a timed timestamp decode
+        decode_line = sampled(parse_bytes, line_sample, 0)
+
+        def counted_parse_bytes(raw: bytes) -> Optional[dict]:
+            self.bytes_read += len(raw)
+            skipped = self.lines_prefiltered
+            parsed = decode_line(raw)
+            if parsed is None and self.lines_prefiltered == skipped:
+                self.lines_rejected += 1
+            return parsed
+
+        prefilter = parser.prefilter
+        if prefilter is not None:
+            def counted_prefilter(raw: bytes) -> bool:
+                if prefilter(raw):
+                    return True
+                self.lines_prefiltered += 1
+                return False
+
+            parser.prefilter = counted_prefilter
+
+        parser.parse_bytes = counted_parse_bytes
+        parser.decode_timestamp = sampled(decode_timestamp, time_sample, SAMPLE_EVERY // 2)
+
+    def _estimate(self, name: str) -> float:
+        """Estimated total wall time of a sampled call, scaled up from the timed calls."""
+        calls, sampled, wall = self.samples.get(name, (0, 0, 0.0))
+        return wall * calls / sampled if sampled else 0.0
+
+    # -- results -------------------------------------------------------------
+
+    def breakdown(self) -> Dict[str, List[float]]:
+        """
+        Stage -> [wall, cpu, items], with the parse stage split into reading
+        (I/O and line splitting), line decoding and timestamp decoding when
+        the parser was hooked, and `other` for time outside every stage.
+        """
+        stages = {name: list(values) for name, values in self.stages.items()}
+        parse = stages.pop("parse", None)
+        if parse is not None:
+            if self.samples.get("decode", [0])[0] and parse[0] > 0:
+                wall, cpu = parse[0], parse[1]
+                decode, stamps = self._estimate("decode"), self._estimate("timestamps")
+                if decode > wall:
+                    # Sampling noise; the parts can't exceed the parse stage
+                    stamps, decode = stamps * wall / decode, wall
+                decode_name = "json decode" if self.format_name == "json" else f"regex match ({self.format_name})"
+                # CPU time is split in the same proportions as the sampled wall time
+                split = {
+                    "read": [wall - decode, cpu * (wall - decode) / wall, parse[2]],
+                    decode_name: [decode - stamps, cpu * (decode - stamps) / wall, self.lines_read],
+                    "timestamps": [stamps, cpu * stamps / wall, self.samples["timestamps"][0]],
+                }
+                stages = {**split, **stages}
+            else:
+                stages = {"parse": parse, **stages}
+        staged = [sum(v[i] for v in stages.values()) for i in (0, 1)]
+        stages["other"] = [max(0.0, self.wall - staged[0]), max(0.0, self.cpu - staged[1]), 0]
+        return stages
+
+    @property
+    def lines_read(self) -> int:
+        return int(self.samples.get("decode", [0])[0])
+
+    @property
+    def lines_parsed(self) -> int:
+        return self.lines_read - self.lines_prefiltered - self.lines_rejected
+
+    def to_dict(self) -> dict:
+        """All numbers of the run as plain data."""
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "stages": {
+                name: {"wall": wall, "cpu": cpu, "items": int(items)}
+                for name, (wall, cpu, items) in self.breakdown().items()
+            },
+            "format": self.format_name,
+            "lines_read": self.lines_read,
+            "lines_parsed": self.lines_parsed,
+            "lines_prefiltered": self.lines_prefiltered,
+            "lines_rejected": self.lines_rejected,
+            "bytes_read": self.bytes_read,
+            "bytes_per_sec": self.bytes_read / self.wall if self.wall else None,
+            "lines_per_sec": self.lines_read / self.wall if self.wall else None,
+            "peak_memory": self.peak_memory,
+            "peak_rss_kb": self.peak_rss_kb,
+        }
+
+    def rows(self) -> List[dict]:
+        """The stage breakdown as table rows."""
+        total = self.wall or 1.0
+        return [
+            {
+                "stage": name,
+                "wall (s)": f"{wall:.3f}",
+                "cpu (s)": f"{cpu:.3f}",
+                "% wall": f"{wall / total:.0%}",
+                "entries": int(items) if items else "",
+            }
+            for name, (wall, cpu, items) in self.breakdown().items()
+        ] + [{"stage": "total", "wall (s)": f"{self.wall:.3f}", "cpu (s)": f"{self.cpu:.3f}", "% wall": "100%", "entries": ""}]
+
+
+@contextmanager
+def profiled(path: str):
+    """Run the enclosed block under cProfile and write the pstats dump to `path`."""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -1,17 +1,209 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from collections import defaultdict
+from datetime import datetime, timezone
 
-from .utils.date import parse_date
+from .columns import EPOCH_SENTINEL_MAX, LogColumns
+from .sketches import DEFAULT_ERROR, DEFAULT_TOP_ERROR, DEFAULT_TOP_K, SketchSummary
+from .utils.date import parse_date, entry_epoch, to_epoch_ms, DEFAULT_DATETIME_FORMAT
+
+DAY_MS = 24 * 60 * 60 * 1000
+MINUTE_MS = 60 * 1000
+
+# Histogram resolution -> (minutes per bucket, label format)
+HISTOGRAM_BUCKETS = {
+    "minute": (1, "%Y-%m-%d %H:%M"),
+    "hour": (60, "%Y-%m-%d %H:00"),
+    "day": (1440, "%Y-%m-%d"),
+}
+
+
+def _add_counts(target: Dict, source: Dict) -> None:
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+
+
+def _top(counts: Dict[str, int], n: Optional[int]) -> List[Tuple[str, int]]:
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return ranked if n is None else ranked[:n]
+
+
+class SummaryAccumulator:
+    """
+    Every `summarize --all` aggregation, updated together in one pass.
+
+    Tracks level counts, a per-minute histogram (rolled up to hours and days
+    on demand), status codes, methods, paths, client IPs, total response
+    bytes and the first/last timestamp per level. Accumulators built over
+    different chunks or files are combined with `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.levels: Dict[str, int] = {}
+        self.minutes: Dict[int, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.methods: Dict[str, int] = {}
+        self.paths: Dict[str, int] = {}
+        self.ips: Dict[str, int] = {}
+        self.bytes = 0
+        self.seen: Dict[str, List[int]] = {}  # level -> [first epoch ms, last epoch ms]
+
+    def update(self, entries: Iterable[dict]) -> "SummaryAccumulator":
+        if isinstance(entries, LogColumns) and entries.epochs() is not None:
+            return self._update_columns(entries)
+        levels, minutes, statuses = self.levels, self.minutes, self.statuses
+        methods, paths, ips, seen = self.methods, self.paths, self.ips, self.seen
+        total = size_total = 0
+
+        for entry in entries:
+            total += 1
+            get = entry.get
+            level = (get("level") or "").upper() or "UNKNOWN"
+            levels[level] = levels.get(level, 0) + 1
+
+            ts = entry_epoch(entry)
+            if ts is not None:
+                minute = ts // MINUTE_MS
+                minutes[minute] = minutes.get(minute, 0) + 1
+                bounds = seen.get(level)
+                if bounds is None:
+                    seen[level] = [ts, ts]
+                elif ts < bounds[0]:
+                    bounds[0] = ts
+                elif ts > bounds[1]:
+                    bounds[1] = ts
+
+            status = get("status")
+            if status is None:
+                status = get("status_code")
+            if status is not None:
+                status = str(status)
+                statuses[status] = statuses.get(status, 0) + 1
+            method = get("method")
+            if method is not None:
+                methods[method] = methods.get(method, 0) + 1
+            path = get("path")
+            if path is not None:
+                paths[path] = paths.get(path, 0) + 1
+            ip = get("ip")
+            if ip is not None:
+                ips[ip] = ips.get(ip, 0) + 1
+            size = get("size")
+            if size is not None:
+                try:
+                    size_total += int(size)
+                except (TypeError, ValueError):  # "-" for empty responses
+                    pass
+
+        self.total += total
+        self.bytes += size_total
+        return self
+
+    def _update_columns(self, logs: LogColumns) -> "SummaryAccumulator":
+        """`update` from per-column value counts; only levels and epochs are walked row by row."""
+        self.total += len(logs)
+        level_names = {}
+        for level, n in logs.value_counts("level").items():
+            name = level_names[level] = (level or "").upper() or "UNKNOWN"
+            self.levels[name] = self.levels.get(name, 0) + n
+
+        minutes, seen = self.minutes, self.seen
+        for level, ts in zip(logs.values("level"), logs.epochs()):
+            if ts <= EPOCH_SENTINEL_MAX:
+                continue
+            minute = ts // MINUTE_MS
+            minutes[minute] = minutes.get(minute, 0) + 1
+            level = level_names[level]
+            bounds = seen.get(level)
+            if bounds is None:
+                seen[level] = [ts, ts]
+            elif ts < bounds[0]:
+                bounds[0] = ts
+            elif ts > bounds[1]:
+                bounds[1] = ts
+
+        # Like `update`, status_code only counts for rows without a status
+        _add_counts(self.statuses, {str(k): n for k, n in logs.value_counts("status").items() if k is not None})
+        if "status_code" in logs.fields:
+            no_status = logs.where("status", lambda value: value is None)
+            codes = logs.value_counts("status_code", no_status)
+            _add_counts(self.statuses, {str(k): n for k, n in codes.items() if k is not None})
+        for field, counts in (("method", self.methods), ("path", self.paths), ("ip", self.ips)):
+            _add_counts(counts, {k: n for k, n in logs.value_counts(field).items() if k is not None})
+        for size, n in logs.value_counts("size").items():
+            try:
+                self.bytes += int(size) * n
+            except (TypeError, ValueError):
+                pass
+        return self
+
+    def merge(self, other: "SummaryAccumulator") -> "SummaryAccumulator":
+        self.total += other.total
+        self.bytes += other.bytes
+        for mine, theirs in (
+            (self.levels, other.levels), (self.minutes, other.minutes), (self.statuses, other.statuses),
+            (self.methods, other.methods), (self.paths, other.paths), (self.ips, other.ips),
+        ):
+            _add_counts(mine, theirs)
+        for level, (first, last) in other.seen.items():
+            bounds = self.seen.get(level)
+            if bounds is None:
+                self.seen[level] = [first, last]
+            else:
+                bounds[0], bounds[1] = min(bounds[0], first), max(bounds[1], last)
+        return self
+
+    @classmethod
+    def merge_all(cls, partials: Iterable["SummaryAccumulator"]) -> "SummaryAccumulator":
+        result = cls()
+        for partial in partials:
+            result.merge(partial)
+        return result
+
+    def histogram(self, resolution: str = "day") -> Dict[str, int]:
+        """Entry counts per minute, hour or day (UTC), in time order."""
+        width, label = HISTOGRAM_BUCKETS[resolution]
+        buckets: Dict[int, int] = {}
+        for minute, count in self.minutes.items():
+            bucket = minute - minute % width
+            buckets[bucket] = buckets.get(bucket, 0) + count
+        return {
+            datetime.fromtimestamp(bucket * 60, timezone.utc).strftime(label): count
+            for bucket, count in sorted(buckets.items())
+        }
+
+    def first_last_seen(self) -> Dict[str, Tuple[str, str]]:
+        """Per level, the earliest and latest timestamp (UTC) seen."""
+        fmt = "%Y-%m-%d %H:%M:%S"
+        return {
+            level: tuple(datetime.fromtimestamp(ms / 1000, timezone.utc).strftime(fmt) for ms in bounds)
+            for level, bounds in self.seen.items()
+        }
+
+    def top_methods(self, n: Optional[int] = 10) -> List[Tuple[str, int]]:
+        return _top(self.methods, n)
+
+    def top_paths(self, n: Optional[int] = 10) -> List[Tuple[str, int]]:
+        return _top(self.paths, n)
+
+    def top_ips(self, n: Optional[int] = 10) -> List[Tuple[str, int]]:
+        return _top(self.ips, n)
+
+    def status_counts(self) -> Dict[str, int]:
+        return dict(sorted(self.statuses.items()))
 
 
 class LogSummarizer:
     """Summarize parsed logs: count levels, logs per day, etc."""
 
-    def count_levels(self, logs: List[dict]) -> Dict[str, int]:
+    def count_levels(self, logs: Iterable[dict]) -> Dict[str, int]:
         """
         Count the number of entries per log level (case-insensitive).
         Missing levels are counted as 'UNKNOWN'.
         """
+        if isinstance(logs, LogColumns):
+            return self._count_column_levels(logs)
+
         counts = defaultdict(int)
 
         for log in logs:
@@ -20,9 +212,37 @@ class LogSummarizer:
 
         return dict(counts)
 
+    def summarize_all(self, logs: Iterable[dict]) -> SummaryAccumulator:
+        """Compute every aggregation of `SummaryAccumulator` in a single pass over `logs`."""
+        return SummaryAccumulator().update(logs)
+
+    def sketch(
+        self,
+        logs: Iterable[dict],
+        distinct: Sequence[str] = ("ip",),
+        top: Sequence[str] = ("path",),
+        quantiles: Sequence[str] = ("size",),
+        error: float = DEFAULT_ERROR,
+        k: int = DEFAULT_TOP_K,
+        top_error: float = DEFAULT_TOP_ERROR,
+    ) -> SketchSummary:
+        """
+        Approximate distinct counts, top-k values and quantiles of the given
+        fields in bounded memory. See `SketchSummary` for the error bounds.
+        """
+        return SketchSummary(distinct, top, quantiles, error, k, top_error).update(logs)
+
+    @staticmethod
+    def _count_column_levels(logs: LogColumns, indices=None) -> Dict[str, int]:
+        """`count_levels` over the level column's dictionary codes."""
+        counts = defaultdict(int)
+        for level, n in logs.value_counts("level", indices).items():
+            counts[(level or "").upper() or "UNKNOWN"] += n
+        return dict(counts)
+
     def count_logs_in_a_day(
         self,
-        logs: List[dict],
+        logs: Iterable[dict],
         day: str,
         day_fmt: str = "%Y-%m-%d",
         log_fmt: str = "%Y-%m-%d %H:%M:%S,%f",
@@ -31,16 +251,30 @@ class LogSummarizer:
         Count logs grouped by level for a specific day.
 
         Args:
-            logs: List of parsed log dicts
+            logs: Parsed log dicts (any iterable, e.g. `LogParser.iter_file`)
             day: Day string (YYYY-MM-DD by default)
             day_fmt: Format of the input day string
-            log_fmt: Format of the datetime in log entries
+            log_fmt: Format of the datetime in log entries. With the default, the
+                epoch timestamps normalized by the parser are compared instead,
+                which covers every built-in format without re-parsing dates.
         """
         day_dt = parse_date(day, day_fmt)
         if not day_dt:
             raise ValueError(f"Invalid day: {day}")
 
         counts = defaultdict(int)
+        if log_fmt == DEFAULT_DATETIME_FORMAT:
+            day_start = to_epoch_ms(day_dt.replace(hour=0, minute=0, second=0, microsecond=0))
+            day_end = day_start + DAY_MS
+            if isinstance(logs, LogColumns):
+                return self._count_column_levels(logs, logs.between(day_start, day_end, upper_inclusive=False))
+            for log in logs:
+                ts = entry_epoch(log)
+                if ts is not None and day_start <= ts < day_end:
+                    level = log.get("level", "").upper() or "UNKNOWN"
+                    counts[level] += 1
+            return dict(counts)
+
         for log in logs:
             log_dt = parse_date(log.get("datetime"), log_fmt)
             if log_dt and log_dt.date() == day_dt.date():
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from .checkpoint import complete_lines_end, head_fingerprint
+from .parser import LogParser
+from .utils.date import entry_epoch
+
+INDEX_DIRNAME = "time_index"
+DEFAULT_EVERY = 1000
+# Bump when the epochs the parser stores change meaning so stale indexes are rebuilt
+INDEX_VERSION = 2
+
+_NEG_INF = float("-inf")
+_POS_INF = float("inf")
+
+
+class TimeIndex:
+    """
+    Sparse sidecar index mapping timestamps to byte offsets of a log file.
+
+    Every `every` parsed lines start a new block, stored as
+    [start offset, min epoch ms, max epoch ms]. A block spans the bytes up to
+    the next block's offset (or `covered` for the last one). Keeping the min
+    and max per block makes lookups correct even when a log is only *nearly*
+    sorted: the candidate blocks for a time window are located by binary
+    search over running maxima/minima, and only those byte ranges are read.
+
+    The index grows with the file: lines appended after `covered` are scanned
+    (and indexed) on the next lookup, while a rotated or truncated file
+    invalidates it.
+    """
+
+    def __init__(self, index_file: str, every: int = DEFAULT_EVERY) -> None:
+        self.index_file = index_file
+        self.every = every
+        self.reset()
+        self.load()
+
+    @classmethod
+    def for_file(
+        cls, cache_dir: str, path: str, format_name: str, custom_regex: Optional[str] = None, every: int = DEFAULT_EVERY
+    ) -> "TimeIndex":
+        """Return the index stored in `cache_dir` for `path` parsed with the given profile."""
+        profile = json.dumps([os.path.abspath(path), format_name, custom_regex])
+        name = hashlib.sha1(profile.encode("utf-8")).hexdigest() + ".json"
+        return cls(os.path.join(cache_dir, INDEX_DIRNAME, name), every=every)
+
+    def reset(self) -> None:
+        self.inode = None
+        self.head = None
+        self.covered = 0
+        self.blocks: List[list] = []
+        self._bounds = None
+
+    def load(self) -> None:
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("every") != self.every or data.get("version") != INDEX_VERSION:
+            return
+        self.inode = data.get("inode")
+        self.head = data.get("head")
+        self.covered = data.get("covered", 0)
+        self.blocks = data.get("blocks", [])
+        self._bounds = None
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        self.inode = os.stat(path).st_ino
+        self.head = head_fingerprint(path, self.covered)
+        data = {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "head": self.head,
+            "covered": self.covered,
+            "every": self.every,
+            "blocks": self.blocks,
+        }
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_file)
+
+    def validate(self, path: str) -> bool:
+        """Drop the index if `path` was rotated or truncated since it was built. Returns True if kept."""
+        st = os.stat(path)
+        if (
+            self.inode != st.st_ino
+            or st.st_size < self.covered
+            or head_fingerprint(path, self.covered) != self.head
+        ):
+            self.reset()
+            return False
+        return True
+
+    def _running_bounds(self) -> Tuple[List[float], List[float]]:
+        """Running max of block maxima and reverse running min of block minima (both non-decreasing)."""
+        if self._bounds is None:
+            prefix_max, current = [], _NEG_INF
+            for _, _, block_max in self.blocks:
+                if block_max is not None and block_max > current:
+                    current = block_max
+                prefix_max.append(current)
+
+            suffix_min, current = [], _POS_INF
+            for _, block_min, _ in reversed(self.blocks):
+                if block_min is not None and block_min < current:
+                    current = block_min
+                suffix_min.append(current)
+            suffix_min.reverse()
+            self._bounds = (prefix_max, suffix_min)
+        return self._bounds
+
+    def ranges(self, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """Return merged byte ranges (within `covered`) that may hold entries in [start_ms, end_ms]."""
+        if not self.blocks:
+            return []
+        prefix_max, suffix_min = self._running_bounds()
+        first = bisect_left(prefix_max, start_ms)
+        last = bisect_right(suffix_min, end_ms) - 1
+
+        result: List[Tuple[int, int]] = []
+        for i in range(first, last + 1):
+            offset, block_min, block_max = self.blocks[i]
+            if block_min is None or block_max < start_ms or block_min > end_ms:
+                continue
+            block_end = self.blocks[i + 1][0] if i + 1 < len(self.blocks) else self.covered
+            if result and result[-1][1] == offset:
+                result[-1] = (result[-1][0], block_end)
+            else:
+                result.append((offset, block_end))
+        return result
+
+    def extend(self, parser: LogParser, path: str) -> Iterator[dict]:
+        """
+        Scan and index complete lines appended after `covered`, yielding their
+        entries. A trailing partial line is yielded but not indexed. If the
+        consumer stops early, the blocks completed so far are still saved.
+        """
+        size = os.path.getsize(path)
+        end = complete_lines_end(path, self.covered, size)
+        count = 0
+        block = None
+        try:
+            for offset, entry in parser.iter_offsets(path, self.covered, end):
+                if count % self.every == 0:
+                    if block is not None:
+                        self.blocks.append(block)
+                        self.covered = offset
+                    block = [offset, None, None]
+                count += 1
+                ts = entry_epoch(entry)
+                if ts is not None:
+                    if block[1] is None or ts < block[1]:
+                        block[1] = ts
+                    if block[2] is None or ts > block[2]:
+                        block[2] = ts
+                yield entry
+            if block is not None:
+                self.blocks.append(block)
+            self.covered = end
+        finally:
+            self._bounds = None
+            self.save(path)
+
+        if end < size:
+            yield from parser.iter_range(path, end, size)
+
+    def iter_between(self, parser: LogParser, path: str, start_ms: int, end_ms: int) -> Iterator[dict]:
+        """
+        Yield candidate entries for [start_ms, end_ms]: entries in indexed blocks
+        that may overlap the window, then everything not yet indexed. Callers
+        still apply the exact date filter.
+        """
+        self.validate(path)
+        for start, end in self.ranges(start_ms, end_ms):
+            yield from parser.iter_range(path, start, end)
+        yield from self.extend(parser, path)
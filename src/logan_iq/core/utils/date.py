@@ -1,8 +1,20 @@
+import calendar
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 DEFAULT_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
 
+# Key under which LogParser stores the normalized timestamp: the entry's own
+# wall-clock time as epoch milliseconds, read as UTC with any UTC offset
+# dropped, so it compares with naive --start/--end/--day bounds as before
+EPOCH_FIELD = "_epoch"
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
 def parse_date(date_str: str, fmt: str = "%Y-%m-%d %H:%M:%S,%f") -> Optional[datetime]:
     if not date_str:
         return None
@@ -13,4 +25,111 @@ def parse_date(date_str: str, fmt: str = "%Y-%m-%d %H:%M:%S,%f") -> Optional[dat
         try:
             return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
         except ValueError:
-            return None
\ No newline at end of file
+            return None
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    """Milliseconds since the Unix epoch. Naive datetimes are taken as UTC."""
+    return calendar.timegm(dt.utctimetuple()) * 1000 + dt.microsecond // 1000
+
+
+def _tz_offset_seconds(tz: str) -> Optional[int]:
+    """Parse '', 'Z', '+hhmm', '+hh:mm' or '+hh' into seconds east of UTC."""
+    if not tz or tz == "Z":
+        return 0
+    sign = tz[0]
+    digits = tz[1:].replace(":", "")
+    if sign not in "+-" or len(digits) not in (2, 4) or not digits.isdigit():
+        return None
+    seconds = int(digits[:2]) * 3600 + int(digits[2:4] or 0) * 60
+    return -seconds if sign == "-" else seconds
+
+
+@lru_cache(maxsize=65536)
+def _iso_seconds(prefix: str) -> Optional[int]:
+    """Epoch seconds for 'YYYY-MM-DD HH:MM:SS' (or with 'T'), memoized per second."""
+    if prefix[4] != "-" or prefix[7] != "-" or prefix[10] not in " T" or prefix[13] != ":" or prefix[16] != ":":
+        return None
+    try:
+        fields = (
+            int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10]),
+            int(prefix[11:13]), int(prefix[14:16]), int(prefix[17:19]),
+        )
+    except ValueError:
+        return None
+    if not (1 <= fields[1] <= 12 and 1 <= fields[2] <= 31 and fields[3] < 24 and fields[4] < 60 and fields[5] < 61):
+        return None
+    return calendar.timegm(fields)
+
+
+def decode_iso(value: str) -> Optional[int]:
+    """
+    Wall-clock epoch milliseconds for ISO-like timestamps such as
+    '2025-08-28 12:34:56,789', '2025-08-28T12:34:56.789Z' or
+    '2025-08-28 12:34:56+02:00' (the offset is checked, not applied). Returns
+    None if the value is not in that shape.
+    """
+    if not isinstance(value, str) or len(value) < 19:
+        return None
+    seconds = _iso_seconds(value[:19])
+    if seconds is None:
+        return _decode_fromisoformat(value)
+
+    rest = value[19:]
+    millis = 0
+    if rest and rest[0] in ",.":
+        digits = len(rest) - len(rest[1:].lstrip("0123456789"))
+        fraction = rest[1:digits]
+        if not fraction:
+            return None
+        millis = int(fraction[:3].ljust(3, "0"))
+        rest = rest[digits:]
+    if _tz_offset_seconds(rest.strip()) is None:
+        return None
+    return seconds * 1000 + millis
+
+
+def _decode_fromisoformat(value: str) -> Optional[int]:
+    try:
+        return to_epoch_ms(datetime.fromisoformat(value).replace(tzinfo=None))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def decode_clf(value: str) -> Optional[int]:
+    """Wall-clock epoch milliseconds for Apache/Nginx timestamps such as '28/Aug/2025:12:34:56 +0200'."""
+    if not isinstance(value, str) or len(value) < 20 or value[2] != "/" or value[6] != "/" or value[11] != ":":
+        return None
+    month = _MONTHS.get(value[3:6])
+    if month is None:
+        return None
+    try:
+        fields = (
+            int(value[7:11]), month, int(value[0:2]),
+            int(value[12:14]), int(value[15:17]), int(value[18:20]),
+        )
+    except ValueError:
+        return None
+    if _tz_offset_seconds(value[20:].strip()) is None:
+        return None
+    return calendar.timegm(fields) * 1000
+
+
+def decode_any(value: str) -> Optional[int]:
+    """Try every known timestamp shape; used for custom regexes and unparsed entries."""
+    if not isinstance(value, str):
+        return None
+    result = decode_iso(value)
+    return result if result is not None else decode_clf(value)
+
+
+def entry_epoch(entry: dict) -> Optional[int]:
+    """
+    Epoch milliseconds of a parsed entry: the value LogParser stored at parse
+    time, or the decoded `datetime` field for entries built elsewhere.
+    """
+    try:
+        return entry[EPOCH_FIELD]
+    except KeyError:
+        return decode_any(entry.get("datetime"))
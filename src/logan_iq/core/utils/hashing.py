@@ -0,0 +1,6 @@
+import hashlib
+
+
+def stable_hash64(value: str) -> int:
+    """64-bit hash of `value` that is the same in every process and run (unlike `hash`)."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
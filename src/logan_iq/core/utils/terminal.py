@@ -1,5 +1,9 @@
 import os
+import shlex
+import shutil
+import subprocess
 import sys
+from typing import Iterable
 
 def supports_hyperlinks() -> bool:
     """Detect if the terminal supports ANSI hyperlinks."""
@@ -27,3 +31,41 @@ def hyperlink(text: str, url: str) -> str:
     if supports_hyperlinks():
         return f"\033]8;;{url}\033\\{text}\033]8;;\033\\"
     return f"{text} ({url})"
+
+
+DEFAULT_PAGER = "less -RS"
+
+
+def terminal_rows() -> int:
+    """Table rows that fit on one screen (grid rows take two lines, plus header and prompt)."""
+    return max(1, (shutil.get_terminal_size().lines - 6) // 2)
+
+
+def write_lines(lines: Iterable[str], pager: bool = False) -> None:
+    """
+    Write `lines` to stdout, or through `$PAGER` (default `less -RS`). Lines
+    are produced only as fast as the pager reads them, and quitting the
+    pager stops producing them.
+    """
+    process = None
+    if pager:
+        try:
+            process = subprocess.Popen(
+                shlex.split(os.environ.get("PAGER") or DEFAULT_PAGER),
+                stdin=subprocess.PIPE, encoding="utf-8", errors="replace",
+            )
+        except OSError:
+            process = None
+    out = process.stdin if process is not None else sys.stdout
+    try:
+        for line in lines:
+            out.write(line + "\n")
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            out.close() if process is not None else out.flush()
+        except BrokenPipeError:
+            pass
+        if process is not None:
+            process.wait()
@@ -0,0 +1,108 @@
+import pytest
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.bloom_index import BloomFilter, BloomIndex, ngrams
+from ..logan_iq.core.search import KeywordMatcher
+from ..logan_iq.core.utils.hashing import stable_hash64
+
+
+def nginx_line(i: int, ip: str = None) -> str:
+    ip = ip or f"10.0.{i % 50}.{i % 7}"
+    return (
+        f'{ip} - - [28/Aug/2025:12:00:{i % 60:02d} +0000] "GET /items/{i} HTTP/1.1" 200 512 "-" "curl/8.0"\n'
+    )
+
+
+@pytest.fixture
+def nginx_file(tmp_path):
+    path = tmp_path / "access.log"
+    lines = [nginx_line(i, "192.0.2.99" if i == 1500 else None) for i in range(2000)]
+    path.write_text("".join(lines), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def simple_file(tmp_path):
+    path = tmp_path / "app.log"
+    lines = [
+        f"2025-07-01 00:00:00,000 [INFO] app: {'Checksum MISMATCH on disk 3' if i == 1200 else f'served request {i}'}\n"
+        for i in range(2000)
+    ]
+    path.write_text("".join(lines), encoding="utf-8")
+    return str(path)
+
+
+def test_stable_hash64_is_deterministic():
+    assert stable_hash64("abc") == stable_hash64("abc")
+    assert stable_hash64("abc") != stable_hash64("abd")
+    assert 0 <= stable_hash64("abc") < 2 ** 64
+
+
+def test_bloom_filter_has_no_false_negatives():
+    items = [f"item-{i}" for i in range(500)]
+    bloom = BloomFilter.for_items(items, 8 * 1024)
+    assert all(bloom.might_contain(item) for item in items)
+    assert sum(bloom.might_contain(f"other-{i}") for i in range(500)) < 50
+
+
+def test_ngrams():
+    assert ngrams("AbCd") == {"abc", "bcd"}
+    assert ngrams("ab") == set()
+
+
+def test_ip_lookup_skips_blocks(tmp_path, nginx_file):
+    parser = LogParser("nginx")
+    index = BloomIndex(str(tmp_path / "idx.blm"), block_bytes=8 * 1024)
+    assert index.build(parser, nginx_file) > 10
+    ranges = index.ranges(ip="192.0.2.99")
+    assert sum(end - start for start, end in ranges) < index.covered / 4
+
+    candidates = index.iter_candidates(parser, nginx_file, ip="192.0.2.99")
+    result = LogFilter().filter(candidates, ip="192.0.2.99")
+    assert [entry["path"] for entry in result] == ["/items/1500"]
+
+
+@pytest.mark.parametrize("keywords,options", [
+    (["checksum mismatch"], {}),
+    (["request 1999", "disk 3"], {}),
+    (["mismatch", "disk"], {"match_all": True}),
+    (["no such text"], {}),
+])
+def test_keyword_lookup_matches_linear_scan(tmp_path, simple_file, keywords, options):
+    parser = LogParser("simple")
+    index = BloomIndex(str(tmp_path / "idx.blm"), block_bytes=4 * 1024)
+    index.build(parser, simple_file)
+    matcher = KeywordMatcher(keywords, **options)
+    candidates = index.iter_candidates(parser, simple_file, matcher)
+    expected = LogFilter().filter(parser.parse_file(simple_file), search=matcher)
+    assert LogFilter().filter(candidates, search=matcher) == expected
+
+
+def test_short_or_regex_keywords_are_not_narrowed(tmp_path, simple_file):
+    index = BloomIndex(str(tmp_path / "idx.blm"), block_bytes=4 * 1024)
+    index.build(LogParser("simple"), simple_file)
+    assert index.ranges(KeywordMatcher("3")) is None
+    assert index.ranges(KeywordMatcher("disk \\d", regex=True)) is None
+
+
+def test_incremental_build(tmp_path, nginx_file):
+    parser = LogParser("nginx")
+    index = BloomIndex(str(tmp_path / "idx.blm"), block_bytes=8 * 1024)
+    index.build(parser, nginx_file)
+    blocks = len(index.blocks)
+    with open(nginx_file, "a", encoding="utf-8") as f:
+        f.write(nginx_line(5000, "198.51.100.1"))
+    reloaded = BloomIndex(index.index_file, block_bytes=8 * 1024)
+    assert reloaded.build(parser, nginx_file) == 1
+    assert len(reloaded.blocks) == blocks + 1
+    assert reloaded.ranges(ip="198.51.100.1")
+
+
+def test_analyzer_uses_bloom_index(tmp_path, nginx_file):
+    analyzer = LogAnalyzer("nginx", cache=ParseCache(cache_dir=str(tmp_path / "cache")))
+    expected = analyzer.filter_logs(nginx_file, ip="192.0.2.99")
+    analyzer.build_bloom_index(nginx_file)
+    assert analyzer.filter_logs(nginx_file, ip="192.0.2.99") == expected
+    assert len(expected) == 1
@@ -0,0 +1,97 @@
+import os
+import re
+import pytest
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.analyzer import LogAnalyzer
+from .sample_data.log_entries import PARSED_SAMPLE_LOGS
+
+
+@pytest.fixture
+def cache(tmp_path) -> ParseCache:
+    return ParseCache(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(
+        "2025-07-05 14:06:09,890 [INFO] app: One\n"
+        "2025-07-05 14:07:09,890 [ERROR] app: Two\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_miss_then_hit(cache, log_file):
+    key = ParseCache.key(log_file, "simple")
+    assert cache.load(key) is None
+    assert list(cache.iter_through(key, iter(PARSED_SAMPLE_LOGS))) == PARSED_SAMPLE_LOGS
+    assert list(cache.load(key)) == PARSED_SAMPLE_LOGS
+
+
+def test_key_changes_with_file_and_profile(log_file):
+    key = ParseCache.key(log_file, "simple")
+    assert key != ParseCache.key(log_file, "custom", r"^(?P<message>.*)$")
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("2025-07-05 14:08:09,890 [DEBUG] app: Three\n")
+    assert key != ParseCache.key(log_file, "simple")
+
+
+def test_partial_consumption_is_not_committed(cache, log_file):
+    key = ParseCache.key(log_file, "simple")
+    entries = cache.iter_through(key, iter(PARSED_SAMPLE_LOGS))
+    next(entries)
+    entries.close()
+    assert cache.load(key) is None
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_lru_eviction_removes_oldest(tmp_path, log_file):
+    cache = ParseCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 ** 9)
+    for i in range(3):
+        list(cache.iter_through(f"key{i}", iter(PARSED_SAMPLE_LOGS)))
+        path = os.path.join(cache.cache_dir, f"key{i}.lqc")
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.load("key0")  # key0 becomes the most recently used
+
+    one_entry = cache.entries()[0][1]
+    cache.max_bytes = one_entry * 2
+    assert cache.evict() == 1
+    assert cache.load("key1") is None
+    assert cache.load("key0") is not None
+
+
+def test_entry_larger_than_the_cache_is_not_written(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 ** 9)
+    for i in range(2):
+        list(cache.iter_through(f"small{i}", iter(PARSED_SAMPLE_LOGS)))
+    cache.max_bytes = cache.size() + 1000
+    big = [{"level": "INFO", "message": f"Message {i}"} for i in range(25_000)]
+
+    assert list(cache.iter_through("big", iter(big))) == big
+    assert cache.load("big") is None
+    # Nothing was evicted to make room, and no temporary file is left behind
+    assert sorted(os.listdir(cache.cache_dir)) == ["small0.lqc", "small1.lqc"]
+
+    # The same when only the last, partial batch passes the limit
+    cache.max_bytes = 10
+    assert list(cache.iter_through("small2", iter(PARSED_SAMPLE_LOGS))) == PARSED_SAMPLE_LOGS
+    assert cache.load("small2") is None
+
+
+def test_clear(cache):
+    list(cache.iter_through("a", iter(PARSED_SAMPLE_LOGS)))
+    assert cache.size() > 0
+    assert cache.clear() == 1
+    assert cache.entries() == []
+
+
+def test_analyzer_reads_from_cache(cache, log_file):
+    analyzer = LogAnalyzer("simple", cache=cache)
+    first = analyzer.analyze(log_file)
+    assert len(first) == 2
+
+    # A cached result is served even though the parser would now reject every line
+    analyzer.parser.pattern = re.compile(r"^$never")
+    assert analyzer.analyze(log_file) == first
+    assert analyzer.summarize(log_file) == {"INFO": 1, "ERROR": 1}
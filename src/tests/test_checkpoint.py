@@ -0,0 +1,76 @@
+import os
+import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.checkpoint import CheckpointStore, complete_lines_end
+
+
+def line(level: str, n: int) -> str:
+    return f"2025-07-05 14:06:{n:02d},000 [{level}] app: Message {n}\n"
+
+
+@pytest.fixture
+def store(tmp_path) -> CheckpointStore:
+    return CheckpointStore(checkpoint_file=str(tmp_path / "checkpoints.json"))
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(line("INFO", 1) + line("ERROR", 2), encoding="utf-8")
+    return str(path)
+
+
+def test_complete_lines_end_skips_partial_line(log_file):
+    size = os.path.getsize(log_file)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("2025-07-05 14:06:03,000 [DEB")
+    assert complete_lines_end(log_file, 0, os.path.getsize(log_file)) == size
+    assert complete_lines_end(log_file, size, os.path.getsize(log_file)) == size
+
+
+def test_incremental_counts_only_appended_lines(store, log_file):
+    analyzer = LogAnalyzer("simple")
+    assert analyzer.summarize_incremental(log_file, store) == {"INFO": 1, "ERROR": 1}
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(line("INFO", 3) + "2025-07-05 14:06:04,000 [DEB")
+    assert analyzer.summarize_incremental(log_file, store) == {"INFO": 2, "ERROR": 1}
+
+    # Finishing the partial line makes it count exactly once
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("UG] app: Message 4\n")
+    assert analyzer.summarize_incremental(log_file, store) == {"INFO": 2, "ERROR": 1, "DEBUG": 1}
+    assert analyzer.summarize_incremental(log_file, store) == {"INFO": 2, "ERROR": 1, "DEBUG": 1}
+
+
+def test_checkpoint_persists_across_store_instances(store, log_file):
+    LogAnalyzer("simple").summarize_incremental(log_file, store)
+    reloaded = CheckpointStore(checkpoint_file=store.checkpoint_file)
+    key = reloaded.key(log_file, "simple")
+    assert reloaded.resume(key, log_file)["offset"] == os.path.getsize(log_file)
+
+
+def test_truncation_resets_counts(store, log_file):
+    analyzer = LogAnalyzer("simple")
+    analyzer.summarize_incremental(log_file, store)
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line("DEBUG", 5))
+    assert analyzer.summarize_incremental(log_file, store) == {"DEBUG": 1}
+
+
+def test_copy_truncate_rotation_detected_by_head(store, log_file):
+    analyzer = LogAnalyzer("simple")
+    analyzer.summarize_incremental(log_file, store)
+    # Same inode, grown past the old offset, but different content at the head
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line("DEBUG", 7) * 4)
+    assert analyzer.summarize_incremental(log_file, store) == {"DEBUG": 4}
+
+
+def test_rotation_by_new_inode_resets_counts(store, log_file, tmp_path):
+    analyzer = LogAnalyzer("simple")
+    analyzer.summarize_incremental(log_file, store)
+    os.rename(log_file, str(tmp_path / "app.log.1"))
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line("WARNING", 6))
+    assert analyzer.summarize_incremental(log_file, store) == {"WARNING": 1}
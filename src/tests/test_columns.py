@@ -0,0 +1,74 @@
+import pytest
+
+from ..logan_iq.core.columns import LogColumns
+from ..logan_iq.core.exporter import Exporter
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.summarizer import LogSummarizer
+from .sample_data.log_entries import PARSED_SAMPLE_LOGS, RAW_SAMPLE_LOGS
+
+
+@pytest.fixture
+def parsed():
+    parser = LogParser("simple")
+    return [parser.parse_line(line) for line in RAW_SAMPLE_LOGS if parser.parse_line(line)]
+
+
+@pytest.fixture
+def columns(parsed) -> LogColumns:
+    return LogColumns.from_entries(parsed)
+
+
+def test_rows_round_trip(parsed, columns):
+    """Iterating a LogColumns yields the original dicts, in order."""
+    assert len(columns) == len(parsed)
+    assert list(columns) == parsed
+    assert columns[-1] == parsed[-1]
+
+
+def test_missing_fields_are_left_out():
+    """Fields a row never had don't reappear as None; present None values are kept."""
+    logs = [{"level": "INFO", "message": "a"}, {"level": None, "extra": 1}, {"message": "c"}]
+    columns = LogColumns.from_entries(logs)
+    assert list(columns) == logs
+    assert columns.values("level") == ["INFO", None, None]
+
+
+def test_categorical_values_are_shared():
+    """Repeated categorical values are stored once."""
+    columns = LogColumns.from_entries({"level": "INFO", "message": str(i)} for i in range(1000))
+    assert columns.value_counts("level") == {"INFO": 1000}
+    assert columns._columns["level"].values.count("INFO") == 1
+
+
+def test_filter_on_columns(parsed, columns):
+    log_filter = LogFilter()
+    result = log_filter.filter(columns, level="info", start="2025-07-05", end="2025-07-05", limit=2)
+    assert isinstance(result, LogColumns)
+    assert list(result) == log_filter.filter(parsed, level="info", start="2025-07-05", end="2025-07-05", limit=2)
+    assert list(log_filter.filter_by_level(columns, "ERROR")) == log_filter.filter_by_level(parsed, "ERROR")
+
+
+def test_summarize_on_columns(parsed, columns):
+    summarizer = LogSummarizer()
+    assert summarizer.count_levels(columns) == summarizer.count_levels(parsed)
+    assert summarizer.count_logs_in_a_day(columns, "2025-07-05") == summarizer.count_logs_in_a_day(parsed, "2025-07-05")
+
+
+def test_columns_without_epoch():
+    """Entries built elsewhere (no parser timestamp) are filtered by their datetime strings."""
+    columns = LogColumns.from_entries(PARSED_SAMPLE_LOGS)
+    expected = LogFilter().filter_by_date_range(PARSED_SAMPLE_LOGS, "2025-07-05", "2025-07-05")
+    assert list(LogFilter().filter_by_date_range(columns, "2025-07-05", "2025-07-05")) == expected
+
+
+def test_columns_to_table(columns):
+    table = Exporter().to_table(columns)
+    assert "level" in table and "_epoch" not in table
+
+
+def test_parse_columns(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(RAW_SAMPLE_LOGS) + "\n")
+    parser = LogParser("simple")
+    assert list(parser.parse_columns(str(path))) == parser.parse_file(str(path))
@@ -0,0 +1,121 @@
+import bz2
+import gzip
+import lzma
+import struct
+import zlib
+import pytest
+from ..logan_iq.core.compression import (
+    bgzf_blocks, decompress_range, detect_compression, iter_decompressed_chunks, iter_decompressed_lines,
+    split_members,
+)
+from ..logan_iq.core.parallel import aggregate_parallel, iter_file_parallel
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.summarizer import LogSummarizer
+
+LEVELS = ("INFO", "ERROR", "DEBUG")
+
+
+def make_text(count: int = 3000) -> bytes:
+    return "".join(
+        f"2025-07-01 00:00:{i % 60:02d},000 [{LEVELS[i % 3]}] app: Message {i}\n" for i in range(count)
+    ).encode("utf-8")
+
+
+def write_bgzf(path, data: bytes, block: int = 4096) -> None:
+    """Write `data` as BGZF: gzip members that record their own size in a 'BC' extra field."""
+    with open(path, "wb") as f:
+        for i in range(0, len(data), block):
+            chunk = data[i:i + block]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            cdata = compressor.compress(chunk) + compressor.flush()
+            size = 18 + len(cdata) + 8
+            f.write(struct.pack("<4BI2BH", 0x1F, 0x8B, 8, 4, 0, 0, 0xFF, 6))
+            f.write(b"BC" + struct.pack("<HH", 2, size - 1))
+            f.write(cdata + struct.pack("<II", zlib.crc32(chunk), len(chunk)))
+
+
+@pytest.fixture
+def text():
+    return make_text()
+
+
+@pytest.mark.parametrize("suffix,compress", [
+    (".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress), (".log", lambda data: data),
+])
+def test_parse_compressed_matches_plain(tmp_path, text, suffix, compress):
+    plain = tmp_path / "app.log.plain"
+    plain.write_bytes(text)
+    path = tmp_path / f"app{suffix}"
+    path.write_bytes(compress(text))
+    parser = LogParser()
+    assert list(parser.iter_file(str(path))) == parser.parse_file(str(plain))
+
+
+def test_detect_compression_by_magic_bytes(tmp_path, text):
+    path = tmp_path / "access.log.2"  # no telling suffix
+    path.write_bytes(gzip.compress(text))
+    assert detect_compression(str(path)) == "gzip"
+    path.write_bytes(text)
+    assert detect_compression(str(path)) is None
+
+
+def test_multi_member_gzip(tmp_path, text):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(text[:1000]) + gzip.compress(text[1000:]))
+    assert b"\n".join(iter_decompressed_lines(str(path))) + b"\n" == text
+
+
+def test_consumer_can_stop_early(tmp_path, text):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(text * 20))
+    chunks = iter_decompressed_chunks(str(path), chunk_size=1024, max_chunks=2)
+    assert next(chunks)
+    chunks.close()  # must not hang on the blocked producer thread
+
+
+def test_corrupt_archive_raises(tmp_path, text):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(text)[:-100])
+    with pytest.raises(EOFError):
+        list(iter_decompressed_lines(str(path)))
+
+
+def test_bgzf_members(tmp_path, text):
+    path = tmp_path / "app.log.gz"
+    write_bgzf(path, text)
+    offsets = bgzf_blocks(str(path))
+    assert len(offsets) - 1 == -(-len(text) // 4096)
+    ranges = split_members(str(path), 4)
+    assert len(ranges) == 4
+    assert b"".join(decompress_range(str(path), s, e) for s, e in ranges) == text
+
+    plain_gzip = tmp_path / "plain.gz"
+    plain_gzip.write_bytes(gzip.compress(text))
+    assert bgzf_blocks(str(plain_gzip)) is None
+
+
+def test_parallel_bgzf_parsing(tmp_path, text):
+    path = tmp_path / "app.log.gz"
+    write_bgzf(path, text, block=1000)  # members cut lines in half
+    parser = LogParser()
+    expected = list(parser.iter_file(str(path)))
+    assert len(expected) == 3000
+    assert list(iter_file_parallel(parser, str(path), workers=2)) == expected
+    counts = aggregate_parallel(parser, str(path), 2, LogSummarizer().count_levels)
+    assert counts == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+
+
+def test_analyzer_skips_offset_features_for_archives(tmp_path, text):
+    from ..logan_iq.core.analyzer import LogAnalyzer
+    from ..logan_iq.core.cache import ParseCache
+    from ..logan_iq.core.checkpoint import CheckpointStore
+
+    path = tmp_path / "app.log.1.gz"
+    path.write_bytes(gzip.compress(text))
+    analyzer = LogAnalyzer("simple", cache=ParseCache(cache_dir=str(tmp_path / "cache")))
+    result = analyzer.filter_logs(str(path), level="error", start="2025-07-01", end="2025-07-01", search="Message 1")
+    assert len(result) == len([i for i in range(3000) if i % 3 == 1 and str(i).startswith("1")])
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"))
+    assert analyzer.summarize_incremental(str(path), store) == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+    with pytest.raises(ValueError):
+        analyzer.build_keyword_index(str(path))
@@ -1,4 +1,7 @@
 import pytest
+from typer.testing import CliRunner
+
+from ..logan_iq.cli import commands
 from ..logan_iq.core.config import ConfigManager
 
 
@@ -68,10 +71,29 @@ def test_load_invalid_json(config_manager):
     assert config_manager.all() == {}
 
 
-def test_file_creation_on_init(tmp_path):
-    """The config file should be created if it doesn't exist."""
+def test_no_file_created_until_set(tmp_path):
+    """Loading is read-only; the config file is only written when a value changes."""
     file_path = tmp_path / "new_config.json"
-    assert not file_path.exists()
     manager = ConfigManager(config_file=str(file_path))
-    assert file_path.exists()
     assert manager.all() == {}
+    assert manager.get("default_file") is None
+    assert not file_path.exists()
+    manager.set("format", "nginx")
+    assert file_path.exists()
+
+
+def test_config_set_size_limits(tmp_path, monkeypatch):
+    """The cache and session budgets are set from the command line, in MB."""
+    config = ConfigManager(config_file=str(tmp_path / "config.json"))
+    monkeypatch.setattr(commands, "_config", config)
+    runner = CliRunner()
+    result = runner.invoke(commands.app, ["config", "set", "--cache-max-mb", "256", "--session-max-mb", "2048"])
+    assert result.exit_code == 0
+    assert config.get("cache_max_mb") == 256
+    assert config.get("session_max_mb") == 2048
+    assert commands.session_bytes() == 2048 * 1024 * 1024
+
+    for option in ("--cache-max-mb", "--session-max-mb"):
+        result = runner.invoke(commands.app, ["config", "set", option, "0"])
+        assert result.exit_code != 0
+    assert config.get("session_max_mb") == 2048
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from ..logan_iq.core.utils.date import decode_iso, decode_clf, decode_any, entry_epoch, to_epoch_ms
+
+NOON = 1756384496000  # 2025-08-28 12:34:56 as UTC
+
+
+def test_decode_iso_variants():
+    assert decode_iso("2025-08-28 12:34:56") == NOON
+    assert decode_iso("2025-08-28 12:34:56,5") == NOON + 500
+    assert decode_iso("2025-08-28 12:34:56.123456") == NOON + 123
+    assert decode_iso("2025-08-28T12:34:56Z") == NOON
+    # UTC offsets are checked, but the wall-clock time is kept
+    assert decode_iso("2025-08-28T12:34:56+02:00") == NOON
+    assert decode_iso("2025-08-28 12:34:56 -0200") == NOON
+    assert decode_iso("2025-08-28T12:34:56.123456+05:30") == NOON + 123
+
+
+def test_decode_iso_rejects_other_shapes():
+    assert decode_iso("28/Aug/2025:12:34:56 +0000") is None
+    assert decode_iso("2025-08-28 12:34:56,") is None
+    assert decode_iso("2025-08-28 12:34:56 +2") is None
+    assert decode_iso("2025-13-28 12:34:56") is None
+    assert decode_iso(None) is None
+
+
+def test_decode_clf():
+    assert decode_clf("28/Aug/2025:12:34:56 +0000") == NOON
+    assert decode_clf("28/Aug/2025:12:34:56 -0500") == NOON
+    assert decode_clf("28/Aug/2025:12:34:56 +02") == NOON
+    assert decode_clf("28/Aug/2025:12:34:56 UTC") is None
+    assert decode_clf("28/Foo/2025:12:34:56 +0000") is None
+    assert decode_any("28/Aug/2025:12:34:56 +0000") == NOON
+    assert decode_any(["not", "a", "string"]) is None
+
+
+def test_to_epoch_ms_handles_naive_and_aware():
+    naive = datetime(2025, 8, 28, 12, 34, 56, 789000)
+    assert to_epoch_ms(naive) == NOON + 789
+    assert to_epoch_ms(naive.replace(tzinfo=timezone.utc)) == NOON + 789
+
+
+def test_entry_epoch_prefers_stored_value():
+    assert entry_epoch({"_epoch": 5, "datetime": "2025-08-28 12:34:56"}) == 5
+    assert entry_epoch({"datetime": "2025-08-28 12:34:56"}) == NOON
+    assert entry_epoch({}) is None
@@ -75,3 +75,128 @@ def test_to_json_creates_file(tmp_path):
     assert file_path.exists()
     loaded = json.loads(file_path.read_text())
     assert loaded == data
+
+
+def test_to_csv_and_json_accept_generators(tmp_path):
+    exporter = Exporter()
+    data = [{"x": 1, "y": 2}, {"x": 3, "y": 4}]
+
+    csv_path = tmp_path / "gen.csv"
+    assert exporter.to_csv((row for row in data), str(csv_path)) == 2
+    assert csv_path.read_text().splitlines() == ["x,y", "1,2", "3,4"]
+
+    json_path = tmp_path / "gen.json"
+    assert exporter.to_json((row for row in data), str(json_path)) == 2
+    assert json.loads(json_path.read_text()) == data
+
+
+def test_to_json_empty_iterable(tmp_path):
+    exporter = Exporter()
+    file_path = tmp_path / "empty.json"
+    assert exporter.to_json(iter([]), str(file_path)) == 0
+    assert json.loads(file_path.read_text()) == []
+
+
+def test_exports_omit_internal_epoch_field(tmp_path):
+    exporter = Exporter()
+    data = [{"level": "INFO", "message": "ok", "_epoch": 1756384496000}]
+    assert "_epoch" not in exporter.to_table(data)
+
+    csv_path = tmp_path / "out.csv"
+    exporter.to_csv(data, str(csv_path))
+    assert csv_path.read_text().splitlines()[0] == "level,message"
+
+    json_path = tmp_path / "out.json"
+    exporter.to_json(data, str(json_path))
+    assert json.loads(json_path.read_text()) == [{"level": "INFO", "message": "ok"}]
+
+
+MIXED = [
+    {"datetime": "2025-07-01", "level": "INFO", "message": "a", "_epoch": 1},
+    {"datetime": "2025-07-01", "level": "ERROR", "message": "b", "code": 5},
+    {"level": "DEBUG", "user": {"id": 1}},
+]
+
+
+def test_to_csv_union_of_keys(tmp_path):
+    """Without a schema the columns are every key seen, in first-seen order."""
+    csv_path = tmp_path / "mixed.csv"
+    assert Exporter().to_csv(iter(MIXED), str(csv_path)) == 3
+    lines = csv_path.read_text().splitlines()
+    assert lines[0] == "datetime,level,message,code,user"
+    assert lines[1:] == ["2025-07-01,INFO,a,,", "2025-07-01,ERROR,b,5,", ",DEBUG,,,{'id': 1}"]
+    # The spool file is removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mixed.csv"]
+
+
+def test_to_csv_with_fields(tmp_path):
+    csv_path = tmp_path / "fields.csv"
+    assert Exporter().to_csv(MIXED, str(csv_path), fields=["level", "code", "_epoch"]) == 3
+    assert csv_path.read_text().splitlines() == ["level,code", "INFO,", "ERROR,5", "DEBUG,"]
+
+
+def test_to_json_compact_and_batches(tmp_path, monkeypatch):
+    from ..logan_iq.core import exporter
+    monkeypatch.setattr(exporter, "BATCH_ROWS", 2)
+    data = [{"n": i, "text": "é"} for i in range(5)]
+
+    compact = tmp_path / "compact.json"
+    assert Exporter().to_json(iter(data), str(compact), compact=True) == 5
+    assert compact.read_text(encoding="utf-8") == "[" + ",".join(f'{{"n":{i},"text":"é"}}' for i in range(5)) + "]\n"
+
+    pretty = tmp_path / "pretty.json"
+    assert Exporter().to_json(iter(data), str(pretty)) == 5
+    assert json.loads(pretty.read_text(encoding="utf-8")) == data
+    assert Exporter().to_json([], str(compact), compact=True) == 0
+    assert json.loads(compact.read_text()) == []
+
+
+
+def test_to_json_default_matches_json_dump(tmp_path, monkeypatch):
+    from ..logan_iq.core import exporter
+    monkeypatch.setattr(exporter, "BATCH_ROWS", 2)
+    data = [{"n": i, "text": "é\nx", "tags": ["a", {"b": []}], "extra": {}} for i in range(5)]
+    path = tmp_path / "pretty.json"
+    for rows in (data, data[:1], []):
+        Exporter().to_json(iter(rows), str(path))
+        assert path.read_text(encoding="utf-8") == json.dumps(rows, indent=4, ensure_ascii=False)
+
+
+def test_to_ndjson(tmp_path):
+    path = tmp_path / "sub" / "out.ndjson"
+    assert Exporter().to_ndjson((row for row in MIXED), str(path)) == 3
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{k: v for k, v in r.items() if k != "_epoch"} for r in MIXED]
+
+
+def test_iter_table_reads_only_shown_rows():
+    pulled = []
+
+    def rows():
+        for i in range(1_000_000):
+            pulled.append(i)
+            yield {"level": "INFO", "n": i, "_epoch": i}
+
+    lines = list(Exporter().iter_table(rows(), max_rows=3, sample_rows=50))
+    assert len(pulled) == 4  # one past the budget, to know more rows exist
+    assert lines[-1] == "... more rows not shown"
+    assert "_epoch" not in lines[1]
+    assert len(lines) == 3 + 3 * 2 + 1
+
+
+def test_iter_table_widths_from_sample():
+    data = [{"a": "x", "b": 1}, {"a": "y" * 10, "b": 22}, {"a": "z" * 100, "b": 3, "c": "late"}]
+    lines = list(Exporter().iter_table(data, sample_rows=2))
+    assert lines[0] == "+------------+----+"
+    assert lines[1] == "| a          | b  |"
+    assert lines[3] == "| x          |  1 |"
+    assert lines[7] == "| zzzzzzz... |  3 |"
+    assert all(len(line) == len(lines[0]) for line in lines)
+
+
+def test_iter_table_tail_and_empty():
+    data = ({"n": i} for i in range(10))
+    lines = list(Exporter().iter_table(data, tail=2))
+    assert [line for line in lines if line.startswith("| ") and "n" not in line] == ["| 8 |", "| 9 |"]
+    assert lines[-1] == "... 8 earlier rows not shown"
+    assert list(Exporter().iter_table([])) == ["No data to display."]
@@ -1,4 +1,6 @@
 import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
 from ..logan_iq.core.filter import LogFilter
 from .sample_data.log_entries import PARSED_SAMPLE_LOGS
 
@@ -59,3 +61,69 @@ def test_filter_invalid_date_range_raises(log_filter):
 def test_filter_empty_logs(log_filter):
     result = log_filter.filter([], level="INFO", start="2025-07-06", end="2025-07-06")
     assert result == []
+
+
+def test_iter_filter_consumes_generator_lazily(log_filter):
+    consumed = []
+
+    def source():
+        for log in PARSED_SAMPLE_LOGS:
+            consumed.append(log)
+            yield log
+
+    result = log_filter.iter_filter(source(), level="INFO", limit=1)
+    assert [log["message"] for log in result] == ["Message A"]
+    # Only the entries needed to satisfy the limit are pulled from the source
+    assert len(consumed) == 1
+
+
+def test_filter_by_date_range_covers_access_log_timestamps(log_filter):
+    logs = [
+        {"datetime": "28/Aug/2025:12:34:56 +0000", "method": "GET"},
+        {"datetime": "29/Aug/2025:00:00:01 +0000", "method": "POST"},
+    ]
+    result = log_filter.filter_by_date_range(logs, "2025-08-28", "2025-08-28")
+    assert [log["method"] for log in result] == ["GET"]
+
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_dates_compare_on_the_entries_wall_clock(tmp_path, cached):
+    """A +0200 entry logged at 00:30 belongs to its local day, not the UTC one."""
+    log = tmp_path / "access.log"
+    log.write_text("".join(
+        f'10.0.0.1 - - [{stamp} +0200] "GET /{i} HTTP/1.1" 200 1 "-" "curl"\n'
+        for i, stamp in enumerate(["27/Aug/2025:23:30:00", "28/Aug/2025:00:30:00", "28/Aug/2025:23:30:00", "29/Aug/2025:00:30:00"])
+    ))
+    cache = ParseCache(cache_dir=str(tmp_path / "cache")) if cached else None
+    analyzer = LogAnalyzer("nginx", cache=cache)
+    for _ in range(2):  # the second run reads the cache and the time index
+        result = analyzer.filter_logs(str(log), start="2025-08-28", end="2025-08-28")
+        assert [entry["path"] for entry in result] == ["/1", "/2"]
+        assert analyzer.summarize_by_day(str(log), "2025-08-28") == {"UNKNOWN": 2}
+
+
+def test_limit_counts_keyword_matches(log_filter):
+    """The limit applies after the keyword search, not before it."""
+    logs = [{"level": "INFO", "message": "noise"}] * 5 + [{"level": "INFO", "message": "foo bar"}] * 3
+    result = log_filter.filter(logs, level="info", limit=2, search="FOO")
+    assert result == [{"level": "INFO", "message": "foo bar"}] * 2
+
+
+def test_iter_filter_stops_reading_at_limit(log_filter):
+    consumed = []
+
+    def source():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"level": "ERROR" if i % 10 == 0 else "INFO", "message": f"line {i}"}
+
+    result = list(log_filter.iter_filter(source(), level="error", limit=3))
+    assert [r["message"] for r in result] == ["line 0", "line 10", "line 20"]
+    assert len(consumed) == 21
+
+
+def test_compile_without_filters(log_filter):
+    assert log_filter.compile() is None
+    predicate = log_filter.compile(level="INFO", start="2025-07-05", end="2025-07-05", search="message")
+    assert [log["message"] for log in PARSED_SAMPLE_LOGS if predicate(log)] == ["Message A"]
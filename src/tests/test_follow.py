@@ -0,0 +1,85 @@
+import os
+import pytest
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.follow import LogFollower, RollingLevelCounts
+
+
+def line(level: str, n: int) -> str:
+    return f"2025-07-05 14:06:{n:02d},000 [{level}] app: Message {n}\n"
+
+
+def append(path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(line("INFO", 1), encoding="utf-8")
+    return str(path)
+
+
+def levels(entries):
+    return [e["level"] for e in entries]
+
+
+def test_follow_starts_at_end_and_reads_appended_lines(log_file):
+    follower = LogFollower(log_file, LogParser())
+    assert follower.poll() == []
+    append(log_file, line("ERROR", 2) + line("DEBUG", 3))
+    assert levels(follower.poll()) == ["ERROR", "DEBUG"]
+    assert follower.poll() == []
+    follower.close()
+
+
+def test_from_start_and_partial_lines(log_file):
+    follower = LogFollower(log_file, LogParser(), from_start=True)
+    append(log_file, "2025-07-05 14:06:02,000 [WARN")
+    assert levels(follower.poll()) == ["INFO"]
+    append(log_file, "ING] app: Message 2\n")
+    assert levels(follower.poll()) == ["WARNING"]
+    follower.close()
+
+
+def test_rotation_drains_old_file_then_reads_new(log_file, tmp_path):
+    follower = LogFollower(log_file, LogParser())
+    append(log_file, line("ERROR", 2))
+    os.rename(log_file, str(tmp_path / "app.log.1"))
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line("DEBUG", 3))
+    assert levels(follower.poll()) == ["ERROR", "DEBUG"]
+    append(log_file, line("INFO", 4))
+    assert levels(follower.poll()) == ["INFO"]
+    follower.close()
+
+
+def test_truncation_restarts_from_beginning(log_file):
+    append(log_file, line("DEBUG", 2))
+    follower = LogFollower(log_file, LogParser())
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line("ERROR", 5))
+    assert levels(follower.poll()) == ["ERROR"]
+    follower.close()
+
+
+def test_follow_generator_stops(log_file):
+    follower = LogFollower(log_file, LogParser(), from_start=True)
+    polls = []
+    entries = list(follower.follow(poll_interval=0, stop=lambda: polls.append(1) or len(polls) > 2))
+    assert levels(entries) == ["INFO"]
+    follower.close()
+
+
+def test_rolling_level_counts_windows():
+    now = [1000.0]
+    rolling = RollingLevelCounts(windows=(60, 300), clock=lambda: now[0])
+    rolling.add("info")
+    rolling.add("ERROR")
+    now[0] += 120
+    rolling.add("INFO")
+    assert rolling.counts() == {60: {"INFO": 1}, 300: {"INFO": 2, "ERROR": 1}}
+
+    now[0] += 300
+    assert rolling.counts() == {60: {}, 300: {}}
+    assert len(rolling._buckets) == 0
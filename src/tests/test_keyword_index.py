@@ -0,0 +1,96 @@
+import os
+import pytest
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.keyword_index import KeywordIndex, _put_varint, decode_postings
+from ..logan_iq.core.search import KeywordMatcher
+
+MESSAGES = ["Connection timeout to db-01", "User 42 logged in", "Disk quota exceeded", "Cache miss for key=abc"]
+
+
+def make_lines(count: int, first: int = 0):
+    return [
+        f"2025-07-01 00:00:{i % 60:02d},000 [INFO] app: {MESSAGES[i % len(MESSAGES)]} #{i}\n"
+        for i in range(first, first + count)
+    ]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(make_lines(400)), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def index(tmp_path, log_file):
+    index = KeywordIndex(str(tmp_path / "idx" / "app.idx"))
+    index.build(LogParser(), log_file)
+    return index
+
+
+def search(index, log_file, keywords, **options):
+    matcher = KeywordMatcher(keywords, **options)
+    candidates = index.iter_candidates(LogParser(), log_file, matcher)
+    return LogFilter().filter_by_keyword(candidates, matcher, "simple")
+
+
+def scan(log_file, keywords, **options):
+    return LogFilter().filter_by_keyword(LogParser().parse_file(log_file), KeywordMatcher(keywords, **options), "simple")
+
+
+def test_varint_round_trip():
+    buf = bytearray()
+    offsets = [0, 5, 127, 128, 300, 70000, 2 ** 40]
+    last = 0
+    for offset in offsets:
+        _put_varint(buf, offset - last)
+        last = offset
+    assert decode_postings(bytes(buf)) == offsets
+
+
+@pytest.mark.parametrize("keywords,options", [
+    (["timeout"], {}),
+    (["TIME"], {}),                              # substring of a token
+    (["out to db"], {}),                         # spans tokens
+    (["key=abc", "quota"], {}),
+    (["user 42", "#7"], {"match_all": True}),
+    (["nothing-like-this"], {}),
+])
+def test_index_matches_linear_scan(index, log_file, keywords, options):
+    assert search(index, log_file, keywords, **options) == scan(log_file, keywords, **options)
+
+
+def test_candidates_are_narrowed(index):
+    assert len(index.candidates(KeywordMatcher("quota"))) == 100
+    assert index.candidates(KeywordMatcher("#12", match_all=True)) is not None
+    assert index.candidates(KeywordMatcher("q.*", regex=True)) is None
+
+
+def test_incremental_build(tmp_path, log_file, index):
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.writelines(make_lines(100, first=400))
+        f.write("2025-07-01 00:00:00,000 [INFO] app: partial line timeout")
+    reloaded = KeywordIndex(index.index_file)
+    assert reloaded.build(LogParser(), log_file) == 100
+    assert reloaded.lines == 500
+    # The partial line is not indexed but is still searched
+    assert search(reloaded, log_file, ["timeout"]) == scan(log_file, ["timeout"])
+
+
+def test_rotated_file_is_reindexed(tmp_path, log_file, index):
+    os.remove(log_file)
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.writelines(make_lines(10, first=1000))
+    assert index.iter_candidates(LogParser(), log_file, KeywordMatcher("timeout")) is None
+    assert index.build(LogParser(), log_file) == 10
+
+
+def test_analyzer_uses_index(tmp_path, log_file):
+    analyzer = LogAnalyzer("simple", cache=ParseCache(cache_dir=str(tmp_path / "cache")))
+    expected = analyzer.filter_logs(log_file, search="disk", limit=5)
+    assert analyzer.build_keyword_index(log_file) == 400
+    assert analyzer.filter_logs(log_file, search="disk", limit=5) == expected
+    assert len(expected) == 5
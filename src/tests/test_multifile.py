@@ -0,0 +1,87 @@
+import gzip
+import os
+import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.multifile import expand_inputs, merge_by_time
+
+LEVELS = ("INFO", "ERROR", "DEBUG")
+
+
+def make_lines(seconds):
+    return "".join(
+        f"2025-07-01 00:{s // 60:02d}:{s % 60:02d},000 [{LEVELS[s % 3]}] app: Message {s}\n" for s in seconds
+    )
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Three interleaved rotations: every third second in each file; one compressed."""
+    directory = tmp_path / "logs"
+    directory.mkdir()
+    (directory / "app.log").write_text(make_lines(range(0, 3000, 3)))
+    (directory / "app.log.1").write_text(make_lines(range(1, 3000, 3)))
+    (directory / "app.log.2.gz").write_bytes(gzip.compress(make_lines(range(2, 3000, 3)).encode()))
+    (directory / ".hidden").write_text("ignored")
+    return directory
+
+
+def messages(entries):
+    return [int(entry["message"].split()[-1]) for entry in entries]
+
+
+def test_expand_inputs(log_dir):
+    names = [os.path.basename(p) for p in expand_inputs(str(log_dir))]
+    assert names == ["app.log", "app.log.1", "app.log.2.gz"]
+    assert [os.path.basename(p) for p in expand_inputs(str(log_dir / "app.log.*"))] == ["app.log.1", "app.log.2.gz"]
+    assert expand_inputs(str(log_dir / "app.log")) == [str(log_dir / "app.log")]
+    assert expand_inputs(str(log_dir / "nothing*")) == []
+
+
+def test_merge_by_time_keeps_untimed_entries_in_place():
+    a = [{"_epoch": 1, "id": "a1"}, {"_epoch": None, "id": "a2"}, {"_epoch": 5, "id": "a3"}]
+    b = [{"_epoch": 2, "id": "b1"}, {"_epoch": 3, "id": "b2"}]
+    assert [e["id"] for e in merge_by_time([a, b])] == ["a1", "a2", "b1", "b2", "a3"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_directory_in_time_order(log_dir, workers):
+    analyzer = LogAnalyzer("simple", workers=workers)
+    assert messages(analyzer.analyze(str(log_dir))) == list(range(3000))
+
+
+def test_glob_filter_with_limit(log_dir):
+    analyzer = LogAnalyzer("simple", workers=2)
+    result = analyzer.filter_logs(str(log_dir / "app.log*"), level="ERROR", limit=5)
+    assert messages(result) == [1, 4, 7, 10, 13]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_summarize_merges_partials(tmp_path, log_dir, workers):
+    analyzer = LogAnalyzer("simple", workers=workers, cache=ParseCache(cache_dir=str(tmp_path / "cache")))
+    assert analyzer.summarize(str(log_dir)) == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+    # Second run reads the per-file cache entries
+    assert analyzer.summarize(str(log_dir)) == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+    assert analyzer.summarize_by_day(str(log_dir), "2025-07-01") == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_merged_stream_can_stop_early(log_dir, workers):
+    analyzer = LogAnalyzer("simple", workers=workers)
+    stream = analyzer.iter_logs(str(log_dir))
+    assert messages([next(stream), next(stream)]) == [0, 1]
+    stream.close()
+
+
+def test_no_matching_files_exits(tmp_path):
+    with pytest.raises(SystemExit):
+        LogAnalyzer("simple").analyze(str(tmp_path / "missing-*.log"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_summarize_all_across_files(log_dir, workers):
+    summary = LogAnalyzer("simple", workers=workers).summarize_all(str(log_dir))
+    assert summary.total == 3000
+    assert summary.levels == {"INFO": 1000, "ERROR": 1000, "DEBUG": 1000}
+    assert summary.histogram("minute")["2025-07-01 00:00"] == 60
+    assert summary.first_last_seen()["INFO"] == ("2025-07-01 00:00:00", "2025-07-01 00:49:57")
@@ -0,0 +1,49 @@
+import pytest
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.summarizer import LogSummarizer
+from ..logan_iq.core.parallel import split_file, iter_file_parallel, aggregate_parallel
+
+LEVELS = ("INFO", "ERROR", "DEBUG", "WARNING")
+
+
+@pytest.fixture
+def simple_log(tmp_path):
+    lines = [
+        f"2025-07-05 14:{i // 60 % 60:02d}:{i % 60:02d},000 [{LEVELS[i % 4]}] app.module: Message {i}"
+        for i in range(500)
+    ]
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_split_file_ranges_are_line_aligned(simple_log):
+    ranges = split_file(simple_log, 7)
+    data = open(simple_log, "rb").read()
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1:start] == b"\n"
+
+
+def test_split_empty_file(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_text("")
+    assert split_file(str(path), 4) == []
+
+
+def test_parallel_parse_preserves_file_order(simple_log):
+    parser = LogParser()
+    serial = parser.parse_file(simple_log)
+    parallel = list(iter_file_parallel(parser, simple_log, workers=3))
+    assert parallel == serial
+
+
+def test_parallel_count_levels_matches_serial(simple_log):
+    parser = LogParser()
+    summarizer = LogSummarizer()
+    expected = summarizer.count_levels(parser.iter_file(simple_log))
+    result = aggregate_parallel(parser, simple_log, 3, summarizer.count_levels)
+    assert result == expected
+    assert sum(result.values()) == 500
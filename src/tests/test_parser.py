@@ -117,3 +117,63 @@ def test_parse_json_with_extra_fields(json_parser):
     })
     parsed = json_parser.parse_line(log_line)
     assert parsed.get("extra") == "field"
+
+
+def test_iter_file_is_lazy(log_parser):
+    file_path = os.path.join(os.path.dirname(__file__), "sample_data", "raw_log_file.log")
+    entries = log_parser.iter_file(file_path)
+    assert not isinstance(entries, list)
+    first = next(entries)
+    assert first["level"] == "DEBUG"
+    assert len(list(entries)) == 3
+
+
+def test_parse_file_replaces_invalid_bytes_instead_of_aborting(tmp_path, log_parser):
+    file_path = tmp_path / "bad_bytes.log"
+    file_path.write_bytes(
+        b"2025-07-05 14:06:09,890 [INFO] app: before\n"
+        b"2025-07-05 14:06:10,890 [ERROR] app: bad \xff\xfe byte\n"
+        b"2025-07-05 14:06:11,890 [DEBUG] app: after\n"
+    )
+    results = log_parser.parse_file(str(file_path))
+    assert [r["level"] for r in results] == ["INFO", "ERROR", "DEBUG"]
+    assert results[1]["message"] == "bad �� byte"
+
+
+def test_parse_bytes_matches_text_parsing():
+    parser = LogParser("nginx")
+    line = '192.100.1.1 - - [28/Aug/2025:12:34:56 +0000] "GET /index.html HTTP/1.1" 200 1024 "http://example.com" "Mozilla/5.0"'
+    assert parser.parse_bytes(line.encode() + b"\r\n") == parser.parse_line(line)
+
+
+def test_parser_stores_normalized_epoch_for_every_format():
+    # 2025-08-28 12:34:56 as UTC: the wall-clock time, whatever the offset
+    expected = 1756384496000
+    simple = LogParser().parse_line("2025-08-28 12:34:56,789 [INFO] app: ok")
+    assert simple["_epoch"] == expected + 789
+
+    apache = LogParser("apache").parse_line(
+        '192.200.2.2 - - [28/Aug/2025:12:34:56 +0200] "GET /index.html HTTP/1.1" 200 512'
+    )
+    assert apache["_epoch"] == expected
+
+    nginx = LogParser("nginx").parse_line(
+        '192.100.1.1 - - [28/Aug/2025:12:34:56 +0000] "GET /index.html HTTP/1.1" 200 1024 "http://example.com" "Mozilla/5.0"'
+    )
+    assert nginx["_epoch"] == expected
+
+    parsed_json = LogParser("json").parse_line(json.dumps({"datetime": "2025-08-28T12:34:56Z", "level": "INFO"}))
+    assert parsed_json["_epoch"] == expected
+
+    custom = LogParser("custom", custom_regex=r"^(?P<datetime>\S+ \S+) (?P<message>.*)$").parse_line(
+        "28/Aug/2025:12:34:56 +0000 hello"
+    )
+    assert custom["_epoch"] == expected
+
+    assert LogParser().parse_line("not-a-date [INFO] app: ok")["_epoch"] is None
+
+
+def test_fields_lists_format_schema():
+    assert LogParser("simple").fields == ["datetime", "level", "message"]
+    assert LogParser("nginx").fields[:3] == ["ip", "user", "datetime"]
+    assert LogParser("json").fields is None
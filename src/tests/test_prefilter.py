@@ -0,0 +1,120 @@
+import json
+import pickle
+
+import pytest
+
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.prefilter import RawPrefilter
+from ..logan_iq.core.search import KeywordMatcher
+
+SIMPLE_LINES = [
+    "2025-07-01 10:00:00,000 [INFO] app: User 7 logged in",
+    "2025-07-01 11:00:00,000 [ERROR] app: Payment 9 failed: card declined",
+    "2025-07-02 09:30:00,000 [error] app: Timeout after 30 ms",
+    "2025-07-03 08:00:00,000 [WARNING] app: Retrying job 4 (TIMEOUT)",
+    "2025-07-04 00:30:00+05:00 [ERROR] app: Late timeout",
+    "2025-07-05 12:00:00,000 [ERROR] app: DB Timeout here",
+    "   2025-07-09 10:00:00,000 [ERROR] app: Indented timeout",
+    "2025-07-10 10:00:00,000 [ERROR] app: Kelvin timeout",  # Kelvin sign, lowercased to an ASCII "k"
+    "not a log line",
+]
+
+JSON_LINES = [
+    {"datetime": "2025-07-01T10:00:00Z", "level": "INFO", "message": "User 7 logged in", "status": 200},
+    {"datetime": "2025-07-01T11:00:00Z", "level": "ERROR", "message": "card declined", "status": 402},
+    {"datetime": "2025-07-01T12:00:00Z", "level": "ERROR", "message": "Timeouté", "status": 504},
+    {"datetime": "2025-07-01T12:30:00Z", "level": "ERROR", "message": "DB Timeout here", "status": 504},
+    {"datetime": "2025-07-01T13:00:00Z", "level": "ERROR", "message": ["time", "out"], "status": 500},
+    {"datetime": "2025-07-01T14:00:00Z", "level": "ERROR", "message": "done", "status": True},
+    {"datetime": "2025-07-01T15:00:00Z", "level": "ERROR", "message": "ok", "status": 1e3},
+]
+
+QUERIES = [
+    {"level": "error"},
+    {"level": "ERROR", "search": "timeout"},
+    {"search": ["declined", "logged"]},
+    {"search": KeywordMatcher(["timeout", "late"], match_all=True)},
+    {"search": KeywordMatcher(["Timeout"], case_sensitive=True)},
+    {"level": "ERROR", "search": KeywordMatcher(["Timeout", "Late"], case_sensitive=True)},
+    {"search": KeywordMatcher(["k"], match_all=True)},
+    {"search": KeywordMatcher([r"time\w+"], regex=True)},
+    {"search": "'time', 'out'"},
+    {"search": "True"},
+    {"search": KeywordMatcher(["True"], case_sensitive=True)},
+    {"search": "1000.0"},
+    {"search": "402"},
+    {"start": "2025-07-02", "end": "2025-07-03"},
+    {"start": "2025-07-03 20:00:00,000", "end": "2025-07-09"},
+]
+
+
+def write_lines(path, lines):
+    path.write_bytes("".join(line + "\n" for line in lines).encode())
+    return str(path)
+
+
+def expected(parse_format, path, query):
+    logs = LogParser(parse_format).parse_file(path)
+    return LogFilter().filter(logs, parse_fmt=parse_format, **query)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_simple_results_unchanged(tmp_path, query):
+    path = write_lines(tmp_path / "app.log", SIMPLE_LINES)
+    assert LogAnalyzer("simple").filter_logs(path, **query) == expected("simple", path, query)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_json_results_unchanged(tmp_path, query):
+    lines = [json.dumps(entry) for entry in JSON_LINES]
+    # Escaped text only reads as "timeout" once decoded
+    lines.append('{"datetime": "2025-07-01T16:00:00Z", "level": "ERROR", "message": "\\u0074imeout"}')
+    path = write_lines(tmp_path / "app.jsonl", lines)
+    assert LogAnalyzer("json").filter_logs(path, **query) == expected("json", path, query)
+
+
+def test_lines_are_skipped_before_decoding():
+    prefilter = RawPrefilter("simple", level="error", search=KeywordMatcher("declined"))
+    assert prefilter(b"2025-07-01 11:00:00,000 [ERROR] app: card DECLINED\n")
+    assert not prefilter(b"2025-07-01 11:00:00,000 [INFO] app: card declined\n")
+    assert not prefilter(b"2025-07-01 11:00:00,000 [ERROR] app: accepted\n")
+    # The level is matched as the bracketed token, not anywhere in the line
+    assert not prefilter(b"2025-07-01 11:00:00,000 [INFO] app: error declined\n")
+
+
+def test_date_prefix_keeps_a_day_of_margin():
+    prefilter = RawPrefilter("simple", date_range=LogFilter().parse_range("2025-07-05", "2025-07-06"))
+    assert prefilter(b"2025-07-04 23:00:00 [INFO] app: x\n")
+    assert prefilter(b"2025-07-07 01:00:00 [INFO] app: x\n")
+    assert not prefilter(b"2025-07-03 23:00:00 [INFO] app: x\n")
+    assert not prefilter(b"2025-07-08 00:00:00 [INFO] app: x\n")
+    assert prefilter(b"Jul 3 2025 [INFO] app: x\n")
+
+
+def test_nothing_to_check():
+    assert not RawPrefilter("nginx")
+    assert not RawPrefilter("simple", search=KeywordMatcher([r"\d+"], regex=True))
+    # One keyword that can't be checked on bytes makes an any-mode search unverifiable
+    assert not RawPrefilter("simple", search=KeywordMatcher(["timeout", "échec"]))
+    assert not RawPrefilter("nginx", date_range=LogFilter().parse_range("2025-07-05", "2025-07-06"))
+    assert LogAnalyzer("nginx")._prefiltered_parser(None, None, None, None, None).prefilter is None
+
+
+def test_pickles_for_workers(tmp_path):
+    path = write_lines(tmp_path / "app.log", SIMPLE_LINES * 50)
+    prefilter = RawPrefilter("simple", level="ERROR", search=KeywordMatcher("timeout"))
+    assert pickle.loads(pickle.dumps(prefilter))(SIMPLE_LINES[2].encode())
+    query = {"level": "ERROR", "search": "timeout"}
+    assert LogAnalyzer("simple", workers=2).filter_logs(path, **query) == expected("simple", path, query)
+
+
+def test_cache_is_filled_with_every_entry(tmp_path):
+    from ..logan_iq.core.cache import ParseCache
+
+    path = write_lines(tmp_path / "app.log", SIMPLE_LINES)
+    cache = ParseCache(cache_dir=str(tmp_path / "cache"))
+    analyzer = LogAnalyzer("simple", cache=cache)
+    assert len(analyzer.filter_logs(path, level="INFO")) == 1
+    assert len(analyzer.filter_logs(path, level="ERROR")) == 6
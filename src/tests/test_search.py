@@ -0,0 +1,65 @@
+import pytest
+
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.search import KeywordMatcher, _trie_pattern
+
+
+def test_trie_pattern_factors_prefixes():
+    assert _trie_pattern(["error", "errno"]) == "err(?:no|or)"
+    # A shorter keyword makes longer ones with the same prefix redundant
+    assert _trie_pattern(["err", "error"]) == "err"
+
+
+def test_any_keyword_matches():
+    matcher = KeywordMatcher(["timeout", "refused", "503"])
+    assert matcher.matches("Connection REFUSED by peer")
+    assert matcher.matches("upstream returned 503")
+    assert not matcher.matches("all good")
+
+
+def test_all_keywords_must_match():
+    matcher = KeywordMatcher(["db", "timeout"], match_all=True)
+    assert matcher.matches("DB query Timeout after 30s")
+    assert not matcher.matches("db connection refused")
+
+
+def test_case_sensitive():
+    matcher = KeywordMatcher(["Error"], case_sensitive=True)
+    assert matcher.matches("Error: boom")
+    assert not matcher.matches("error: boom")
+
+
+def test_regex_keywords():
+    assert KeywordMatcher([r"user \d+", "x{3}"], regex=True).matches("login by USER 42")
+    assert not KeywordMatcher([r"user \d+", "x{3}"], regex=True, match_all=True).matches("login by user 42")
+    with pytest.raises(ValueError):
+        KeywordMatcher(["("], regex=True)
+
+
+def test_literal_keywords_are_escaped():
+    assert KeywordMatcher(["a.b"]).matches("a.b")
+    assert not KeywordMatcher(["a.b"]).matches("axb")
+
+
+def test_empty_keywords_disable_search():
+    assert KeywordMatcher.coerce(["", None]) is None
+    assert KeywordMatcher.coerce(None) is None
+
+
+def test_filter_with_many_keywords():
+    logs = [
+        {"level": "ERROR", "message": "disk full"},
+        {"level": "ERROR", "message": "socket timeout"},
+        {"level": "INFO", "message": "started"},
+    ]
+    result = LogFilter().filter(logs, search=["TIMEOUT", "disk"])
+    assert [log["message"] for log in result] == ["disk full", "socket timeout"]
+
+
+def test_json_all_keywords_across_fields():
+    logs = [
+        {"method": "POST", "path": "/login", "message": "ok"},
+        {"method": "GET", "path": "/login", "message": "ok"},
+    ]
+    matcher = KeywordMatcher(["post", "login"], match_all=True)
+    assert LogFilter().filter_by_keyword(logs, matcher, "json") == logs[:1]
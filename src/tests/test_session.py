@@ -0,0 +1,122 @@
+import os
+import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.columns import LogColumns
+from ..logan_iq.core.session import SessionCache, get_session, set_session
+
+LEVELS = ("INFO", "ERROR", "DEBUG")
+
+
+def write_log(path, count, offset=0):
+    path.write_text("".join(
+        f"2025-07-01 00:{i // 60 % 60:02d}:{i % 60:02d},000 [{LEVELS[i % 3]}] app: Message {i + offset}\n"
+        for i in range(count)
+    ))
+    return str(path)
+
+
+def columns(n):
+    return LogColumns.from_entries({"level": "INFO", "message": f"m{i}"} for i in range(n))
+
+
+def test_lru_eviction_under_budget():
+    small = columns(10)
+    cache = SessionCache(max_bytes=small.nbytes() * 2 + 1)
+    cache.put(("a",), small)
+    cache.put(("b",), columns(10))
+    assert cache.get(("a",)) is small  # "a" is now the most recently used
+    cache.put(("c",), columns(10))
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is small and len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+    assert not cache.put(("huge",), columns(1000))
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_key_follows_file_identity(tmp_path):
+    path = write_log(tmp_path / "app.log", 3)
+    key = SessionCache.key(path, "simple")
+    assert key == SessionCache.key(path, "simple")
+    assert key != SessionCache.key(path, "json")
+    with open(path, "a") as f:
+        f.write("2025-07-01 01:00:00,000 [INFO] app: more\n")
+    assert SessionCache.key(path, "simple") != key
+    assert SessionCache.key(str(tmp_path / "missing.log"), "simple") is None
+
+
+def test_follow_up_commands_use_warm_data(tmp_path, monkeypatch):
+    path = write_log(tmp_path / "app.log", 300)
+    session = SessionCache()
+    analyzer = LogAnalyzer("simple", session=session)
+    cold = LogAnalyzer("simple")
+
+    assert analyzer.summarize(path) == cold.summarize(path)
+    assert session.misses == 1 and len(session) == 1
+
+    # Later commands must not parse the file again
+    monkeypatch.setattr(analyzer.parser, "iter_file", lambda *a, **k: pytest.fail("file re-parsed"))
+    monkeypatch.setattr(analyzer.parser, "iter_range", lambda *a, **k: pytest.fail("file re-parsed"))
+    assert analyzer.filter_logs(path, level="ERROR", limit=5) == cold.filter_logs(path, level="ERROR", limit=5)
+    assert analyzer.filter_logs(path, search="Message 29") == cold.filter_logs(path, search="Message 29")
+    start, end = "2025-07-01 00:01:00", "2025-07-01 00:01:09"
+    assert analyzer.filter_logs(path, start=start, end=end) == cold.filter_logs(path, start=start, end=end)
+    assert vars(analyzer.summarize_all(path)) == vars(cold.summarize_all(path))
+    assert list(analyzer.iter_logs(path)) == list(cold.iter_logs(path))
+    assert session.hits >= 5 and session.misses == 1
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = write_log(tmp_path / "app.log", 30)
+    session = SessionCache()
+    analyzer = LogAnalyzer("simple", session=session)
+    assert sum(analyzer.summarize(path).values()) == 30
+    write_log(tmp_path / "app.log", 45)
+    assert sum(analyzer.summarize(path).values()) == 45
+    assert len(session) == 1  # the stale version was replaced
+
+
+def test_files_over_budget_bypass_session(tmp_path):
+    path = write_log(tmp_path / "app.log", 100)
+    session = SessionCache(max_bytes=os.path.getsize(path) - 1)
+    assert sum(LogAnalyzer("simple", session=session).summarize(path).values()) == 100
+    assert len(session) == 0
+
+
+def test_columns_outgrowing_the_budget_are_given_up(tmp_path):
+    path = write_log(tmp_path / "app.log", 20_000)
+    # Small enough on disk, but the parsed columns take several times more
+    session = SessionCache(max_bytes=os.path.getsize(path))
+    analyzer = LogAnalyzer("simple", session=session)
+    assert analyzer.summarize(path) == LogAnalyzer("simple").summarize(path)
+    assert len(session) == 0 and session.nbytes == 0
+    assert not session.admits(SessionCache.key(path, "simple"))
+
+
+def test_limited_query_does_not_load_the_file(tmp_path):
+    path = write_log(tmp_path / "app.log", 300)
+    session = SessionCache()
+    analyzer = LogAnalyzer("simple", session=session)
+    assert analyzer.filter_logs(path, level="ERROR", limit=5) == LogAnalyzer("simple").filter_logs(path, level="ERROR", limit=5)
+    assert len(session) == 0
+    analyzer.summarize(path)
+    assert len(session) == 1
+
+
+def test_bounded_extend():
+    entries = [{"level": "INFO", "message": f"message {i}"} for i in range(10_000)]
+    full = LogColumns.from_entries(entries)
+    assert LogColumns().extend(entries, max_bytes=full.nbytes() * 2)
+    bounded = LogColumns()
+    assert not bounded.extend(iter(entries), max_bytes=full.nbytes() // 2)
+    assert len(bounded) < len(entries)
+
+
+def test_set_and_get_session():
+    assert get_session() is None
+    session = SessionCache()
+    set_session(session)
+    try:
+        assert get_session() is session
+    finally:
+        set_session(None)
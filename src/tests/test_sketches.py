@@ -0,0 +1,155 @@
+import json
+import random
+import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.sketches import CountMinSketch, HyperLogLog, QuantileSketch, SketchSummary, TopK
+from ..logan_iq.core.summarizer import LogSummarizer
+
+
+def test_hyperloglog_within_error():
+    hll = HyperLogLog(error=0.01)
+    for i in range(50000):
+        hll.add(f"10.0.{i // 256}.{i % 256}")
+        hll.add(f"10.0.{i // 256}.{i % 256}")  # duplicates don't count
+    assert abs(hll.count() - 50000) / 50000 < 0.03
+    assert HyperLogLog().count() == 0
+
+
+def test_hyperloglog_merge_is_union():
+    a, b = HyperLogLog(0.02), HyperLogLog(0.02)
+    for i in range(3000):
+        a.add(str(i))
+    for i in range(2000, 6000):
+        b.add(str(i))
+    assert abs(a.merge(b).count() - 6000) / 6000 < 0.06
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(0.1))
+
+
+def test_count_min_never_undercounts():
+    cms = CountMinSketch(error=0.01)
+    truth = {}
+    rng = random.Random(1)
+    for _ in range(20000):
+        item = str(rng.randint(0, 999))
+        truth[item] = truth.get(item, 0) + 1
+        cms.add(item)
+    for item, count in truth.items():
+        assert count <= cms.estimate(item) <= count + 0.01 * 20000 * 2
+
+
+def test_topk_finds_heavy_hitters():
+    rng = random.Random(2)
+    items = ["/hot"] * 3000 + ["/warm"] * 1500 + [f"/cold/{rng.randint(0, 5000)}" for _ in range(20000)]
+    rng.shuffle(items)
+    top = TopK(k=3)
+    for item in items:
+        top.add(item)
+    assert [item for item, _ in top.items(2)] == ["/hot", "/warm"]
+    assert top.items(1)[0][1] >= 3000
+
+
+def test_topk_merge():
+    a, b = TopK(k=2), TopK(k=2)
+    for item in ["x"] * 5 + ["y"] * 3:
+        a.add(item)
+    for item in ["y"] * 4 + ["z"] * 1:
+        b.add(item)
+    assert a.merge(b).items() == [("y", 7), ("x", 5)]
+
+
+def test_quantile_relative_error():
+    values = list(range(1, 10001))
+    sketch = QuantileSketch(error=0.01)
+    for v in values:
+        sketch.add(v)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        true = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - true) / true <= 0.011
+    assert sketch.quantile(0) == 1 and sketch.quantile(1) == 10000
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_quantile_zero_negative_and_merge():
+    a, b = QuantileSketch(), QuantileSketch()
+    for v in (-10, 0, 0):
+        a.add(v)
+    for v in (5, 10):
+        b.add(v)
+    merged = a.merge(b)
+    assert merged.count == 5
+    assert merged.quantile(0.5) == 0
+    assert merged.quantile(0) == -10
+    assert abs(merged.quantile(0.75) - 5) <= 0.05
+
+
+def test_quantile_bins_are_bounded():
+    sketch = QuantileSketch(error=0.01, max_bins=50)
+    for i in range(1, 100000, 7):
+        sketch.add(i)
+    assert len(sketch.bins) <= 50
+    assert abs(sketch.quantile(0.99) - 99000) / 99000 <= 0.011
+
+
+
+def test_non_finite_values_are_rejected_untouched():
+    sketch = QuantileSketch()
+    sketch.add(5)
+    for value in (float("inf"), float("-inf"), float("nan")):
+        with pytest.raises(ValueError):
+            sketch.add(value)
+    assert (sketch.count, sketch.min, sketch.max) == (1, 5, 5)
+    entries = [{"size": "inf"}, {"size": "NaN"}, {"size": 10 ** 400}, {"size": "7"}]
+    summary = LogSummarizer().sketch(entries, distinct=(), top=(), quantiles=("size",))
+    assert summary.quantiles["size"].count == 1
+
+
+def test_topk_needs_k():
+    with pytest.raises(ValueError):
+        TopK(0)
+
+
+NGINX = [
+    {"ip": f"10.0.0.{i % 7}", "path": "/hot" if i % 2 else f"/p/{i}", "size": str(i)} for i in range(1, 101)
+] + [{"ip": "10.0.0.9", "path": "/x", "size": "-"}]
+
+
+def test_sketch_summary_serialization_roundtrip(tmp_path):
+    summary = LogSummarizer().sketch(NGINX, distinct=("ip",), top=("path",), quantiles=("size",), k=3)
+    path = tmp_path / "s.json"
+    summary.save(str(path))
+    json.loads(path.read_text())
+    loaded = SketchSummary.load(str(path))
+    assert loaded.total == 101
+    assert loaded.distinct["ip"].count() == summary.distinct["ip"].count() == 8
+    assert loaded.top["path"].items() == summary.top["path"].items()
+    assert loaded.top["path"].items(1) == [("/hot", 50)]
+    assert loaded.quantiles["size"].quantile(0.5) == summary.quantiles["size"].quantile(0.5)
+
+
+def test_sketch_summaries_merge_without_rescan():
+    summarizer = LogSummarizer()
+    whole = summarizer.sketch(NGINX)
+    merged = SketchSummary.merge_all(
+        SketchSummary.from_dict(json.loads(json.dumps(summarizer.sketch(part).to_dict())))
+        for part in (NGINX[:40], NGINX[40:])
+    )
+    assert merged.total == whole.total
+    assert merged.distinct["ip"].count() == whole.distinct["ip"].count()
+    assert merged.top["path"].items(1) == whole.top["path"].items(1)
+    assert merged.quantiles["size"].quantile(0.9) == whole.quantiles["size"].quantile(0.9)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyzer_sketch_summary(tmp_path, workers):
+    lines = [
+        f'10.0.{i % 3}.1 - - [01/Jul/2025:10:00:{i % 60:02d} +0000] "GET /item/{i % 4} HTTP/1.1" 200 {i} "-" "curl"\n'
+        for i in range(1, 2001)
+    ]
+    log = tmp_path / "access.log"
+    log.write_text("".join(lines))
+    summary = LogAnalyzer("nginx", workers=workers).sketch_summary(str(log), distinct=("ip",), top=("path",))
+    assert summary.total == 2000
+    assert summary.distinct["ip"].count() == 3
+    assert sorted(item for item, _ in summary.top["path"].items()) == [f"/item/{i}" for i in range(4)]
+    assert abs(summary.quantiles["size"].quantile(0.5) - 1000) / 1000 <= 0.011
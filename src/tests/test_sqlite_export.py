@@ -0,0 +1,137 @@
+import gzip
+import sqlite3
+import pytest
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.sqlite_export import SqliteExporter
+from ..logan_iq.core.stats import RunStats
+
+
+def nginx_lines(start, stop):
+    return "".join(
+        f'10.0.0.{i % 4} - - [01/Jul/2025:10:{i // 60 % 60:02d}:{i % 60:02d} +0000] '
+        f'"GET /item/{i} HTTP/1.1" {500 if i % 10 == 0 else 200} {i} "-" "curl"\n'
+        for i in range(start, stop)
+    )
+
+
+def query(db, sql):
+    with sqlite3.connect(str(db)) as conn:
+        return conn.execute(sql).fetchall()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_export_typed_table_and_indexes(tmp_path, workers):
+    log, db = tmp_path / "access.log", tmp_path / "out" / "logs.sqlite"
+    log.write_text(nginx_lines(0, 500))
+    assert LogAnalyzer("nginx", workers=workers).export_sqlite(str(log), str(db)) == 500
+
+    columns = [(c[1], c[2]) for c in query(db, "PRAGMA table_info(nginx)")]
+    assert columns[0] == ("ip", "TEXT")
+    assert columns[-5:] == [("status", "INTEGER"), ("size", "INTEGER"), ("referer", "TEXT"), ("agent", "TEXT"), ("epoch_ms", "INTEGER")]
+    assert query(db, "SELECT typeof(status), typeof(size), typeof(epoch_ms) FROM nginx LIMIT 1") == [
+        ("integer", "integer", "integer")
+    ]
+    assert query(db, "SELECT count(*) FROM nginx WHERE status = 500") == [(50,)]
+    assert query(db, "SELECT sum(size) FROM nginx") == [(sum(range(500)),)]
+    indexes = {row[0] for row in query(db, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_nginx_datetime", "idx_nginx_status", "idx_nginx_epoch_ms"} <= indexes
+    assert query(db, "PRAGMA journal_mode") == [("wal",)]
+
+
+def test_export_applies_filters_and_replaces_table(tmp_path):
+    log, db = tmp_path / "access.log", tmp_path / "logs.sqlite"
+    log.write_text(nginx_lines(0, 100))
+    analyzer = LogAnalyzer("nginx")
+    assert analyzer.export_sqlite(str(log), str(db), start="2025-07-01 10:00:10", end="2025-07-01 10:00:19") == 10
+    assert analyzer.export_sqlite(str(log), str(db), ip="10.0.0.1", limit=5) == 5
+    assert query(db, "SELECT count(*) FROM nginx") == [(5,)]
+
+
+def test_append_loads_only_new_lines(tmp_path):
+    log, db = tmp_path / "access.log", tmp_path / "logs.sqlite"
+    log.write_text(nginx_lines(0, 100) + "10.0.0.9 - - [01/Jul")  # partial last line is left for later
+    analyzer = LogAnalyzer("nginx")
+    assert analyzer.export_sqlite(str(log), str(db)) == 100
+    assert analyzer.export_sqlite(str(log), str(db), append=True) == 0
+
+    with open(log, "r+") as f:
+        f.truncate(len(nginx_lines(0, 100)))
+        f.seek(0, 2)
+        f.write(nginx_lines(100, 150))
+    assert analyzer.export_sqlite(str(log), str(db), append=True) == 50
+    assert query(db, "SELECT count(*), count(DISTINCT path) FROM nginx") == [(150, 150)]
+
+    # A rotated (rewritten) file is loaded from the start
+    log.unlink()
+    log.write_text(nginx_lines(200, 210))
+    assert analyzer.export_sqlite(str(log), str(db), append=True) == 10
+
+    with pytest.raises(ValueError):
+        analyzer.export_sqlite(str(log), str(db), append=True, limit=1)
+
+
+def test_append_skips_loaded_archives(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "access.log.1.gz").write_bytes(gzip.compress(nginx_lines(0, 20).encode()))
+    (tmp_path / "logs" / "access.log").write_text(nginx_lines(20, 30))
+    db = tmp_path / "logs.sqlite"
+    analyzer = LogAnalyzer("nginx")
+    assert analyzer.export_sqlite(str(tmp_path / "logs"), str(db), append=True) == 30
+    assert analyzer.export_sqlite(str(tmp_path / "logs"), str(db), append=True) == 0
+
+
+def test_append_after_limit_resumes_past_the_loaded_rows(tmp_path):
+    log, db = tmp_path / "access.log", tmp_path / "logs.sqlite"
+    log.write_text(nginx_lines(0, 20))
+    analyzer = LogAnalyzer("nginx")
+    assert analyzer.export_sqlite(str(log), str(db), limit=2, ip="10.0.0.1") == 2
+    # Lines 1 and 5 were loaded; the next export starts on the line after 5
+    assert analyzer.export_sqlite(str(log), str(db), append=True, ip="10.0.0.1") == 3
+    assert query(db, "SELECT count(*), count(DISTINCT path) FROM nginx") == [(5, 5)]
+
+
+def test_append_after_limit_with_stats_resumes_past_the_loaded_rows(tmp_path):
+    # The timed parse reads entries ahead in batches, past the last inserted one
+    log, db = tmp_path / "access.log", tmp_path / "logs.sqlite"
+    log.write_text(nginx_lines(0, 1000))
+    stats = RunStats()
+    analyzer = LogAnalyzer("nginx", stats=stats)
+    with stats.run():
+        assert analyzer.export_sqlite(str(log), str(db), limit=10) == 10
+        assert analyzer.export_sqlite(str(log), str(db), append=True) == 990
+    assert query(db, "SELECT count(*), count(DISTINCT path) FROM nginx") == [(1000, 1000)]
+
+
+def test_append_after_limit_refuses_a_partly_loaded_archive(tmp_path):
+    archive, db = tmp_path / "access.log.1.gz", tmp_path / "logs.sqlite"
+    archive.write_bytes(gzip.compress(nginx_lines(0, 20).encode()))
+    analyzer = LogAnalyzer("nginx")
+    assert analyzer.export_sqlite(str(archive), str(db), limit=5) == 5
+    with pytest.raises(ValueError, match="partly loaded"):
+        analyzer.export_sqlite(str(archive), str(db), append=True)
+    # A fresh export replaces the table and its offsets
+    assert analyzer.export_sqlite(str(archive), str(db)) == 20
+
+
+def test_json_logs_keep_extra_keys(tmp_path):
+    log, db = tmp_path / "app.json", tmp_path / "logs.sqlite"
+    log.write_text(
+        '{"datetime": "2025-07-01 10:00:00", "level": "INFO", "message": "ok"}\n'
+        '{"datetime": "2025-07-01 10:00:01", "level": "ERROR", "message": "bad", "code": 5}\n'
+    )
+    assert LogAnalyzer("json").export_sqlite(str(log), str(db), table="app") == 2
+    assert query(db, "SELECT level, message, extra FROM app ORDER BY epoch_ms") == [
+        ("INFO", "ok", None), ("ERROR", "bad", '{"code":5}')
+    ]
+    assert "idx_app_level" in {row[0] for row in query(db, "SELECT name FROM sqlite_master")}
+
+
+def test_append_to_table_with_other_columns_fails(tmp_path):
+    db = tmp_path / "logs.sqlite"
+    with SqliteExporter(str(db), "logs", ["a"]) as exporter:
+        exporter.prepare()
+        exporter.finish()
+    with SqliteExporter(str(db), "logs", ["b"]) as exporter, pytest.raises(ValueError):
+        exporter.prepare(append=True)
+    with pytest.raises(ValueError):
+        SqliteExporter(str(db), "bad name", None)
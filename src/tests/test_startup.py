@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only some commands need; none of them may load just to start the CLI
+DEFERRED = (
+    "pyfiglet",
+    "tabulate",
+    "sqlite3",
+    "logan_iq.core.analyzer",
+    "logan_iq.core.parser",
+    "logan_iq.cli.interactive",
+)
+# Self time of our own modules while starting the CLI, in microseconds
+# (generous: it includes compiling them when no bytecode is cached)
+OWN_IMPORT_BUDGET_US = 100_000
+
+
+def run(home, *args):
+    env = dict(os.environ, PYTHONPATH=SRC, HOME=str(home))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def import_times(home):
+    result = run(home, "-X", "importtime", "-c", "import logan_iq.__main__")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def test_startup_defers_command_modules(tmp_path):
+    times = import_times(tmp_path)
+    assert "logan_iq.cli.commands" in times
+    assert [name for name in DEFERRED if name in times] == []
+
+
+def test_startup_import_budget(tmp_path):
+    times = import_times(tmp_path)
+    own = sum(us for name, us in times.items() if name.startswith("logan_iq"))
+    assert own < OWN_IMPORT_BUDGET_US
+
+
+def test_reading_config_does_not_write_it(tmp_path):
+    result = run(tmp_path, "-m", "logan_iq", "config", "show")
+    assert "No configuration set yet" in result.stdout
+    assert not (tmp_path / ".logan-iq_config.json").exists()
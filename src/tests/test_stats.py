@@ -0,0 +1,145 @@
+import pstats
+import time
+from types import SimpleNamespace
+
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.search import KeywordMatcher
+from ..logan_iq.core import stats as stats_module
+from ..logan_iq.core.stats import RunStats, profiled
+
+LEVELS = ("INFO", "ERROR", "DEBUG")
+
+
+def write_log(path, count, junk=0):
+    lines = [
+        f"2025-07-01 00:{i // 60 % 60:02d}:{i % 60:02d},000 [{LEVELS[i % 3]}] app: Message {i}\n"
+        for i in range(count)
+    ]
+    lines += ["not a log line\n"] * junk
+    path.write_text("".join(lines))
+    return str(path)
+
+
+def test_no_hooks_without_stats():
+    analyzer = LogAnalyzer("simple")
+    assert analyzer.stats is None
+    assert "parse_bytes" not in vars(analyzer.parser)
+    assert analyzer.parser.decode_timestamp is LogParser.TIMESTAMP_DECODERS["simple"]
+
+
+def test_counts_lines_read_and_rejected(tmp_path):
+    path = write_log(tmp_path / "app.log", 300, junk=7)
+    stats = RunStats()
+    analyzer = LogAnalyzer("simple", stats=stats)
+    with stats.run():
+        # Regex keywords can't be checked on raw lines, so every line is parsed
+        errors = analyzer.filter_logs(path, search=KeywordMatcher([r"Message \d+"], regex=True))
+
+    data = stats.to_dict()
+    assert len(errors) == 300
+    assert data["lines_read"] == 307
+    assert data["lines_parsed"] == 300
+    assert data["lines_rejected"] == 7
+    assert data["lines_prefiltered"] == 0
+    assert data["bytes_read"] == (tmp_path / "app.log").stat().st_size
+    assert data["stages"]["filter"]["items"] == 300
+    assert data["stages"]["read"]["items"] == 300
+    assert {"read", "regex match (simple)", "timestamps", "filter", "other"} <= set(data["stages"])
+
+
+def test_counts_prefiltered_lines(tmp_path):
+    path = write_log(tmp_path / "app.log", 300, junk=7)
+    stats = RunStats()
+    analyzer = LogAnalyzer("simple", stats=stats)
+    with stats.run():
+        errors = analyzer.filter_logs(path, level="ERROR")
+
+    data = stats.to_dict()
+    assert len(errors) == 100
+    assert data["lines_read"] == 307
+    # Other levels and the junk lines never reach the regex
+    assert data["lines_prefiltered"] == 207
+    assert data["lines_rejected"] == 0
+    assert data["lines_parsed"] == 100
+    assert data["stages"]["read"]["items"] == 100
+
+
+def test_stages_add_up_to_the_total(tmp_path):
+    path = write_log(tmp_path / "app.log", 2000)
+    stats = RunStats()
+    analyzer = LogAnalyzer("simple", stats=stats)
+    with stats.run():
+        analyzer.summarize_all(path)
+
+    stages = stats.breakdown()
+    assert "aggregate" in stages
+    assert sum(wall for wall, _, _ in stages.values()) >= stats.wall * 0.99
+    assert all(wall >= 0 and cpu >= 0 for wall, cpu, _ in stages.values())
+
+
+def test_nested_stages_are_exclusive():
+    stats = RunStats()
+    with stats.run():
+        with stats.stage("outer"):
+            time.sleep(0.02)
+            with stats.stage("inner"):
+                time.sleep(0.05)
+    assert 0.05 <= stats.stages["inner"][0] < 0.1
+    assert 0.02 <= stats.stages["outer"][0] < 0.05
+
+
+def test_timed_keeps_entries_and_laziness():
+    stats = RunStats()
+    source = iter([{"i": i} for i in range(1000)])
+    timed = stats.timed("parse", source)
+    assert next(timed) == {"i": 0}
+    assert [e["i"] for e in timed] == list(range(1, 1000))
+    assert stats.stages["parse"][2] == 1000
+    # Lists and already timed iterators are passed through
+    assert stats.timed("parse", [1, 2]) == [1, 2]
+    assert stats.timed("filter", timed) is timed
+
+
+def test_cached_entries_are_not_counted_as_lines_read(tmp_path):
+    path = write_log(tmp_path / "app.log", 100)
+    cache = ParseCache(cache_dir=str(tmp_path / "cache"))
+    LogAnalyzer("simple", cache=cache).summarize(path)
+
+    stats = RunStats()
+    with stats.run():
+        counts = LogAnalyzer("simple", cache=cache, stats=stats).summarize(path)
+    assert sum(counts.values()) == 100
+    assert stats.lines_read == 0
+    assert stats.stages["cache read"][2] == 100
+
+
+def test_trace_memory(tmp_path):
+    path = write_log(tmp_path / "app.log", 500)
+    stats = RunStats(trace_memory=True)
+    with stats.run():
+        LogAnalyzer("simple", stats=stats).analyze(path)
+    assert stats.peak_memory > 0
+
+
+def test_peak_rss_is_in_kib_on_macos(monkeypatch):
+    usage = SimpleNamespace(ru_maxrss=300 * 1024 * 1024)
+    fake = SimpleNamespace(RUSAGE_SELF=0, getrusage=lambda who: usage)
+    monkeypatch.setattr(stats_module, "resource", fake)
+    monkeypatch.setattr(stats_module.sys, "platform", "darwin")
+    stats = RunStats()
+    with stats.run():
+        pass
+    assert stats.peak_rss_kb == 300 * 1024
+    monkeypatch.setattr(stats_module.sys, "platform", "linux")
+    assert stats_module.peak_rss_kb() == 300 * 1024 * 1024
+
+
+def test_profile_dump(tmp_path):
+    path = write_log(tmp_path / "app.log", 100)
+    dump = tmp_path / "run.prof"
+    with profiled(str(dump)):
+        LogAnalyzer("simple").summarize(path)
+    functions = {name for _, _, name in pstats.Stats(str(dump)).stats}
+    assert "summarize" in functions
@@ -78,3 +78,76 @@ def test_count_logs_in_a_day_custom_formats(summarizer):
     log_fmt = "%m/%d/%Y %H:%M:%S"
     result = summarizer.count_logs_in_a_day(logs, "07/06/2025", day_fmt=day_fmt, log_fmt=log_fmt)
     assert result == {"INFO": 1, "ERROR": 1}
+
+
+def test_count_logs_in_a_day_uses_normalized_epoch(summarizer):
+    """Access-log timestamps are counted on their own wall-clock day."""
+    logs = [
+        {"datetime": "28/Aug/2025:23:30:00 -0200", "level": "INFO"},  # 29 Aug 01:30 UTC
+        {"datetime": "29/Aug/2025:00:30:00 +0200", "level": "WARNING"},  # 28 Aug 22:30 UTC
+        {"datetime": "29/Aug/2025:10:00:00 +0000", "level": "ERROR"},
+        {"_epoch": None, "datetime": "29/Aug/2025:10:00:00 +0000", "level": "DEBUG"},
+    ]
+    assert summarizer.count_logs_in_a_day(logs, "2025-08-29") == {"WARNING": 1, "ERROR": 1}
+
+
+NGINX_ENTRIES = [
+    {"ip": "10.0.0.1", "datetime": "01/Jul/2025:10:00:05 +0000", "method": "GET", "path": "/a", "status": "200", "size": "100"},
+    {"ip": "10.0.0.2", "datetime": "01/Jul/2025:10:30:00 +0000", "method": "POST", "path": "/b", "status": "500", "size": "-"},
+    {"ip": "10.0.0.1", "datetime": "01/Jul/2025:11:00:00 +0000", "method": "GET", "path": "/a", "status": "200", "size": "50"},
+    {"ip": "10.0.0.3", "datetime": "02/Jul/2025:00:00:00 +0000", "method": "GET", "path": "/c", "status": "404", "size": "0"},
+]
+
+
+def test_summarize_all_single_pass(summarizer):
+    """Every aggregation comes out of one accumulator."""
+    summary = summarizer.summarize_all(iter(NGINX_ENTRIES))
+    assert summary.total == 4
+    assert summary.levels == {"UNKNOWN": 4}
+    assert summary.status_counts() == {"200": 2, "404": 1, "500": 1}
+    assert summary.top_methods(1) == [("GET", 3)]
+    assert summary.top_paths() == [("/a", 2), ("/b", 1), ("/c", 1)]
+    assert summary.top_ips(2) == [("10.0.0.1", 2), ("10.0.0.2", 1)]
+    assert summary.bytes == 150
+    assert summary.histogram("hour") == {"2025-07-01 10:00": 2, "2025-07-01 11:00": 1, "2025-07-02 00:00": 1}
+    assert summary.histogram("day") == {"2025-07-01": 3, "2025-07-02": 1}
+    assert summary.first_last_seen() == {"UNKNOWN": ("2025-07-01 10:00:05", "2025-07-02 00:00:00")}
+
+
+def test_summarize_all_levels_match_count_levels(summarizer):
+    summary = summarizer.summarize_all(PARSED_SAMPLE_LOGS)
+    assert summary.levels == summarizer.count_levels(PARSED_SAMPLE_LOGS)
+    assert sum(summary.histogram("minute").values()) == len(PARSED_SAMPLE_LOGS)
+
+
+def test_summary_merge_equals_single_pass(summarizer):
+    """Accumulators over separate chunks merge into the single-pass result."""
+    whole = summarizer.summarize_all(NGINX_ENTRIES)
+    merged = summarizer.summarize_all(NGINX_ENTRIES[:1]).merge(summarizer.summarize_all(NGINX_ENTRIES[1:]))
+    assert vars(merged) == vars(whole)
+
+
+def test_summarize_all_columns_fast_path(summarizer):
+    """LogColumns are summarized from column value counts with the same result."""
+    from ..logan_iq.core.columns import LogColumns
+    from ..logan_iq.core.parser import LogParser
+    from .sample_data.log_entries import RAW_SAMPLE_LOGS
+
+    parser = LogParser("simple")
+    entries = [e for e in map(parser.parse_line, RAW_SAMPLE_LOGS) if e] + [{"level": "warn", "status": 404, "size": "-"}]
+    assert vars(summarizer.summarize_all(LogColumns.from_entries(entries))) == vars(summarizer.summarize_all(iter(entries)))
+
+
+def test_summarize_all_columns_count_status_code_only_without_status(summarizer):
+    from ..logan_iq.core.columns import LogColumns
+    from ..logan_iq.core.utils.date import EPOCH_FIELD
+
+    # Parsed entries carry epochs, which the columns fast path needs
+    entries = [
+        {"level": "INFO", "status": 200, "status_code": 200, EPOCH_FIELD: 1_750_000_000_000},
+        {"level": "INFO", "status_code": 503, EPOCH_FIELD: 1_750_000_060_000},
+        {"level": "INFO", "status": 404, EPOCH_FIELD: 1_750_000_120_000},
+    ]
+    rows = summarizer.summarize_all(iter(entries))
+    assert rows.statuses == {"200": 1, "503": 1, "404": 1}
+    assert vars(summarizer.summarize_all(LogColumns.from_entries(entries))) == vars(rows)
@@ -0,0 +1,109 @@
+import os
+import random
+import pytest
+from datetime import datetime, timedelta
+from ..logan_iq.core.parser import LogParser
+from ..logan_iq.core.filter import LogFilter
+from ..logan_iq.core.analyzer import LogAnalyzer
+from ..logan_iq.core.cache import ParseCache
+from ..logan_iq.core.time_index import TimeIndex
+from ..logan_iq.core.utils.date import to_epoch_ms
+
+BASE = datetime(2025, 7, 1)
+
+
+def make_lines(count: int, first: int = 0, jitter: bool = False):
+    rng = random.Random(42)
+    lines = []
+    for i in range(first, first + count):
+        minutes = i + (rng.randint(-30, 30) if jitter else 0)
+        ts = (BASE + timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S,000")
+        lines.append(f"{ts} [INFO] app: Message {i}\n")
+    return lines
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(make_lines(3000)), encoding="utf-8")
+    return str(path)
+
+
+def window(hours_from: int, hours_to: int):
+    return to_epoch_ms(BASE + timedelta(hours=hours_from)), to_epoch_ms(BASE + timedelta(hours=hours_to))
+
+
+def test_ranges_cover_only_the_window(tmp_path, log_file):
+    parser = LogParser()
+    index = TimeIndex(str(tmp_path / "idx.json"), every=100)
+    list(index.extend(parser, log_file))
+    assert len(index.blocks) == 30
+    assert index.covered == os.path.getsize(log_file)
+
+    start_ms, end_ms = window(10, 11)
+    ranges = index.ranges(start_ms, end_ms)
+    read = sum(e - s for s, e in ranges)
+    assert 0 < read < os.path.getsize(log_file) / 10
+
+
+def test_iter_between_matches_full_scan(tmp_path, log_file):
+    parser = LogParser()
+    log_filter = LogFilter()
+    start, end = "2025-07-01 10:00:00,000", "2025-07-01 11:00:00,000"
+    expected = log_filter.filter_by_date_range(parser.iter_file(log_file), start, end)
+
+    index = TimeIndex(str(tmp_path / "idx.json"), every=100)
+    start_ms, end_ms = window(10, 11)
+    first = log_filter.filter_by_date_range(index.iter_between(parser, log_file, start_ms, end_ms), start, end)
+    reloaded = TimeIndex(str(tmp_path / "idx.json"), every=100)
+    second = log_filter.filter_by_date_range(reloaded.iter_between(parser, log_file, start_ms, end_ms), start, end)
+    assert first == second == expected
+    assert len(expected) == 61
+
+
+def test_nearly_sorted_logs_stay_correct(tmp_path):
+    path = tmp_path / "jitter.log"
+    path.write_text("".join(make_lines(3000, jitter=True)), encoding="utf-8")
+    parser, log_filter = LogParser(), LogFilter()
+    start, end = "2025-07-01 20:00:00,000", "2025-07-01 21:00:00,000"
+    expected = log_filter.filter_by_date_range(parser.iter_file(str(path)), start, end)
+
+    index = TimeIndex(str(tmp_path / "idx.json"), every=50)
+    list(index.extend(parser, str(path)))
+    start_ms, end_ms = window(20, 21)
+    result = log_filter.filter_by_date_range(index.iter_between(parser, str(path), start_ms, end_ms), start, end)
+    assert result == expected
+
+
+def test_index_extends_when_file_grows(tmp_path, log_file):
+    parser = LogParser()
+    index = TimeIndex(str(tmp_path / "idx.json"), every=100)
+    list(index.extend(parser, log_file))
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.writelines(make_lines(500, first=3000))
+
+    start_ms, end_ms = window(51, 52)
+    candidates = index.iter_between(parser, log_file, start_ms, end_ms)
+    result = LogFilter().filter_by_date_range(candidates, "2025-07-03 03:00:00,000", "2025-07-03 04:00:00,000")
+    assert len(result) == 61
+    assert index.covered == os.path.getsize(log_file)
+    assert len(index.blocks) == 35
+
+
+def test_rewritten_file_invalidates_index(tmp_path, log_file):
+    parser = LogParser()
+    index = TimeIndex(str(tmp_path / "idx.json"), every=100)
+    list(index.extend(parser, log_file))
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.writelines(make_lines(200, first=5000))
+    assert not index.validate(log_file)
+    assert index.blocks == []
+
+
+def test_analyzer_uses_index_for_date_range(tmp_path, log_file):
+    analyzer = LogAnalyzer("simple", cache=ParseCache(cache_dir=str(tmp_path / "cache")))
+    start, end = "2025-07-01 10:00:00,000", "2025-07-01 11:00:00,000"
+    first = analyzer.filter_logs(log_file, start=start, end=end)
+    assert os.listdir(str(tmp_path / "cache" / "time_index"))
+    assert analyzer.filter_logs(log_file, start=start, end=end) == first
+    assert first == LogAnalyzer("simple").filter_logs(log_file, start=start, end=end)